@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# 여러 강의가 함께 쓰는 변환 결과 폴더 (manifest 기준 상대 경로, manifest 의 "cache_dir" 로 바꿀 수 있음)
+SHARED_CACHE_DIR_NAME = '.asset_cache'
+
+# 동시에 빌드하는 강의 수 기본값 - 대부분 파일 읽기/쓰기라 CPU 수보다 조금 많게
+DEFAULT_COURSE_JOBS = 4
+
+class SharedAssetCache:
+    """이름이 곧 내용 해시인 변환 결과(이미지 변환본, 서브셋 폰트, 압축본)를 강의끼리 나눠 쓰는 폴더
+
+    같은 키를 여러 강의가 동시에 만들지 않도록 lock(키) 안에서 fetch() 로 확인하고,
+    없을 때만 만들어서 store() 한다.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.guard = threading.Lock()
+        self.locks = {}
+        self.hits = 0
+        self.stored = 0
+
+    def lock(self, key):
+        with self.guard:
+            return self.locks.setdefault(key, threading.Lock())
+
+    def fetch(self, name, dest_path):
+        """캐시에 name 이 있으면 dest_path 로 복사하고 True"""
+        cached = self.cache_dir / name
+        if not cached.is_file():
+            return False
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest_path.with_name(dest_path.name + '.tmp')
+        shutil.copyfile(cached, tmp_path)
+        os.replace(tmp_path, dest_path)
+        with self.guard:
+            self.hits += 1
+        return True
+
+    def store(self, src_path, name):
+        cached = self.cache_dir / name
+        if cached.is_file():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached.with_name(f'{name}.{threading.get_ident()}.tmp')
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, cached)
+        with self.guard:
+            self.stored += 1
+
+class ThreadOutput:
+    """스레드별로 print 출력을 모아 두는 stdout 대용 (동시에 빌드하는 강의의 로그가 섞이지 않게)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}
+
+    def write(self, text):
+        buffer = self.buffers.get(threading.get_ident())
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    @contextmanager
+    def capture(self):
+        buffer = self.buffers[threading.get_ident()] = []
+        try:
+            yield buffer
+        finally:
+            del self.buffers[threading.get_ident()]
+
+def load_manifest(manifest_path):
+    """강의 목록 파일을 읽어 (강의 목록, 공용 캐시 폴더) 를 돌려줌
+
+    {
+        "cache_dir": ".asset_cache",            (선택)
+        "options": {"optimize_images": true},   (선택, 모든 강의 공통 build() 옵션)
+        "courses": [
+            {"name": "godot", "base_dir": "godot-course", "lecture_files": ["Lecture1.html", ...],
+             "options": {...}}                  (name, options 는 선택)
+        ]
+    }
+    경로는 manifest 파일이 있는 폴더 기준이다.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    root = manifest_path.parent
+    common_options = manifest.get('options', {})
+    courses = []
+    for index, course in enumerate(manifest['courses']):
+        if 'base_dir' not in course or not course.get('lecture_files'):
+            raise SystemExit(f"{manifest_path}: courses[{index}] 에 base_dir 와 lecture_files 가 필요합니다")
+        base_dir = (root / course['base_dir']).resolve()
+        courses.append({
+            'name': course.get('name', base_dir.name),
+            'base_dir': base_dir,
+            'lecture_files': course['lecture_files'],
+            'options': {**common_options, **course.get('options', {})},
+        })
+
+    base_dirs = [course['base_dir'] for course in courses]
+    if len(set(base_dirs)) != len(base_dirs):
+        raise SystemExit(f"{manifest_path}: 같은 base_dir 를 쓰는 강의가 있습니다 (결과 파일이 겹침)")
+
+    cache_dir = root / manifest.get('cache_dir', SHARED_CACHE_DIR_NAME)
+    return courses, cache_dir
+
+def build_courses(manifest_path, build_options, course_jobs=DEFAULT_COURSE_JOBS, profile_name=None, budget_name=None):
+    """manifest 의 강의들을 스레드 course_jobs 개로 동시에 빌드하고 실패한 강의 수를 돌려줌
+
+    build_options 는 명령줄 옵션으로, manifest 의 options 가 덮어쓴다.
+    profile_name 을 주면 강의마다 base_dir 에 단계별 시간 trace 를 쓴다.
+    budget_name 을 주면 강의마다 base_dir 의 예산 파일과 비교하고, 예산을 넘은 강의도 실패로 센다.
+    """
+    from create_pdf_html import build, check_budget
+
+    courses, cache_dir = load_manifest(manifest_path)
+    shared_cache = SharedAssetCache(cache_dir)
+    print(f"강의 {len(courses)}개 빌드 (동시에 {course_jobs}개, 공용 캐시: {cache_dir})")
+
+    output = ThreadOutput(sys.stdout)
+
+    def build_course(course):
+        with output.capture() as log:
+            start = time.perf_counter()
+            try:
+                options = {**build_options, **course['options'], 'shared_cache': shared_cache}
+                if profile_name:
+                    options['profile_path'] = course['base_dir'] / profile_name
+                output_path, page_count = build(course['base_dir'], course['lecture_files'], **options)
+                error = None
+                if budget_name:
+                    over_count = check_budget(course['base_dir'], course['lecture_files'], output_path, options,
+                                              course['base_dir'] / budget_name)
+                    if over_count:
+                        error = RuntimeError(f"성능 예산을 넘은 항목 {over_count}개")
+            except (Exception, SystemExit) as e:
+                # 선택 의존성이 없을 때의 SystemExit 도 그 강의만 실패로 기록 (나머지 강의는 계속 빌드)
+                page_count, error = 0, e
+            elapsed = time.perf_counter() - start
+        return course, ''.join(log), page_count, elapsed, error
+
+    sys.stdout = output
+    wall_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, course_jobs)) as executor:
+            results = []
+            for course, log, page_count, elapsed, error in executor.map(build_course, courses):
+                # 강의 순서대로, 끝난 강의의 로그를 한 번에 출력
+                output.stream.write(f"\n===== {course['name']} ({course['base_dir']}) =====\n{log}")
+                if error is not None:
+                    output.stream.write(f"❌ 빌드 실패: {error}\n")
+                results.append((course, page_count, elapsed, error))
+    finally:
+        sys.stdout = output.stream
+    wall_time = time.perf_counter() - wall_start
+
+    report(results, wall_time, shared_cache)
+    return sum(error is not None for *_, error in results)
+
+def report(results, wall_time, shared_cache):
+    print(f"\n{'강의':<20} {'슬라이드':>8} {'시간(s)':>8}")
+    for course, page_count, elapsed, error in results:
+        status = f'{page_count:>8}' if error is None else f"{'실패':>8}"
+        print(f"{course['name']:<20} {status} {elapsed:>8.2f}")
+    total = sum(elapsed for _, _, elapsed, _ in results)
+    print(f"전체 {wall_time:.2f}s (강의별 시간 합 {total:.2f}s)")
+    print(f"공용 캐시: 가져옴 {shared_cache.hits}개, 새로 저장 {shared_cache.stored}개")
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""슬라이드 추출 벤치마크
+
+Lecture1.html 과 같은 구조(grid-2/card/pre 가 중첩된 슬라이드)의 가상 강의를 만들어
+추출 방식별로 걸린 시간, 최대 메모리(RSS), 결과 파일 크기를 잰다.
+
+    python bench_extract.py                                  # 기본 시나리오 전체
+    python bench_extract.py --scenarios 10x1,1000x20         # 슬라이드 수 x 파일 수
+    python bench_extract.py --save-baseline bench_baseline.json
+    python bench_extract.py --baseline bench_baseline.json   # 기준보다 느려지면 종료 코드 1
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from create_pdf_html import (PDF_STYLESHEET, build, extract_slides_from_file, iter_slide_spans,
+                             number_slides)
+
+# 슬라이드 수 x 파일 수 (10 ~ 10,000 슬라이드, 1 ~ 200 파일)
+DEFAULT_SCENARIOS = ['10x1', '100x5', '1000x20', '10000x200']
+
+# 추출 방식
+#   stream          extract_slides.py 처럼 슬라이드를 찾는 대로 바로 파일에 씀
+#   extract         extract_slides_from_file 로 덱을 통째로 추출한 뒤 번호를 매겨 씀
+#   extract-mmap    extract 와 같지만 파일을 메모리 매핑해서 바이트 단위로 추출
+#   build           create_pdf_html.build (캐시가 빈 상태)
+#   build-cached    create_pdf_html.build (캐시가 채워진 상태)
+#   build-parallel  create_pdf_html.build (CPU 수만큼, 최소 2개 프로세스, 캐시가 빈 상태)
+#   build-mmap      create_pdf_html.build --mmap (캐시가 빈 상태)
+STRATEGIES = ['stream', 'extract', 'extract-mmap', 'build', 'build-cached', 'build-parallel', 'build-mmap']
+
+# 기준 대비 허용하는 증가율과, 잡음으로 보고 무시하는 시간 차이(초)
+DEFAULT_TOLERANCE = 0.25
+MIN_TIME_DELTA = 0.05
+
+# 가상 강의에 넣을 이미지 (크기 주입 단계도 거치도록 저장소의 이미지를 복사해서 씀)
+SAMPLE_IMAGE = 'Img_lecture3-1.png'
+
+DECK_HEAD = '''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <title>벤치마크 강의 {deck}</title>
+    <style>
+        .slide {{ position: absolute; opacity: 0; }}
+        .slide.active {{ opacity: 1; }}
+        .grid-2 {{ display: grid; grid-template-columns: 1fr 1fr; }}
+    </style>
+</head>
+<body>
+
+'''
+
+DECK_TAIL = '''
+<script>
+    document.addEventListener('DOMContentLoaded', () => {
+        const slides = document.querySelectorAll('.slide');
+        let currentSlideIndex = 0;
+        // '<div class="slide">' 문자열이 스크립트 안에 있어도 슬라이드로 세지 않아야 함
+        if (slides.length > 0) {
+            slides[currentSlideIndex].classList.add('active');
+        }
+    });
+</script>
+
+</body>
+</html>
+'''
+
+def make_slide(rng, deck, number):
+    """Lecture1.html 에 나오는 슬라이드 모양 중 하나를 골라 만듦"""
+    kind = rng.randrange(5)
+    title = f'{deck}-{number} 게임 루프와 상태 갱신'
+    if number == 1:
+        return f'''<div class="slide slide--intro">
+    <div class="content">
+        <h1>{title}</h1>
+        <p class="subtitle">벤치마크용 가상 강의</p>
+    </div>
+</div>'''
+    if kind == 0:
+        return f'''<div class="slide">
+    <div class="content">
+        <h2>{title}</h2>
+        <div class="grid-2">
+            <div class="card">
+                <h3>일반 프로그램 (App)</h3>
+                <p><i class="fa-solid fa-mouse-pointer"></i> <strong>이벤트 기반</strong></p>
+                <ul>
+                    <li>클릭할 때만 동작합니다.</li>
+                    <li>가만히 있으면 CPU 사용량이 거의 없습니다.</li>
+                </ul>
+            </div>
+            <div class="card" style="border-color: #7ee787;">
+                <h3>게임 프로그램</h3>
+                <p><i class="fa-solid fa-rotate"></i> <strong>무한 루프</strong></p>
+                <ul>
+                    <li>초당 30~60번 이상 상태를 갱신합니다.</li>
+                    <li>입력이 없어도 몬스터는 움직여야 합니다.</li>
+                </ul>
+            </div>
+        </div>
+    </div>
+</div>'''
+    if kind == 1:
+        return f'''<div class="slide">
+    <div class="content">
+        <h2>{title}</h2>
+        <pre><code>func _process(delta):
+    <span class="comment"># 1. 입력 받기 - "&lt;div&gt;" 는 코드 안의 글자일 뿐</span>
+    var direction = Input.get_vector("left", "right", "up", "down")
+
+    <span class="comment"># 2. 상태 업데이트</span>
+    velocity = direction * speed
+    move_and_slide()</code></pre>
+    </div>
+</div>'''
+    if kind == 2:
+        return f'''<div class="slide">
+    <div class="content">
+        <h2>{title}</h2>
+        <div class="highlight-box" style="display: flex; justify-content: space-around;">
+            <div>
+                <i class="fa-solid fa-keyboard big-icon"></i><br><strong>1. 입력 (Input)</strong>
+            </div>
+            <div style="font-size: 2rem;"><i class="fa-solid fa-arrow-right"></i></div>
+            <div>
+                <i class="fa-solid fa-desktop big-icon"></i><br><strong>2. 출력 (Render)</strong>
+            </div>
+        </div>
+        <!-- <div class="slide"> 주석 안의 div 는 무시됨 -->
+    </div>
+</div>'''
+    if kind == 3:
+        return f'''<div class="slide">
+    <div class="content">
+        <h2>{title}</h2>
+        <div class="grid-2">
+            <div class="image-container">
+                <img src="{SAMPLE_IMAGE}" alt="예시 화면">
+            </div>
+            <div class="card">
+                <pre><code>public override void _Ready()
+{{
+    GD.Print("준비 완료");
+}}</code></pre>
+            </div>
+        </div>
+    </div>
+</div>'''
+    return f'''<div class="slide">
+    <div class="content">
+        <h2>{title}</h2>
+        <ul>
+            <li>플레이어 (Player)</li>
+            <li>적 몬스터 (Enemy)</li>
+            <li>아이템 (Item)</li>
+        </ul>
+    </div>
+    <div class="page-number">{number}</div>
+</div>'''
+
+def generate_course(course_dir, slide_count, file_count, seed=0):
+    """course_dir 에 가상 강의 파일들을 만들고 파일 이름 목록을 돌려줌"""
+    rng = random.Random(seed)
+    repo_dir = Path(__file__).resolve().parent
+    (course_dir / PDF_STYLESHEET).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(repo_dir / PDF_STYLESHEET, course_dir / PDF_STYLESHEET)
+    shutil.copyfile(repo_dir / SAMPLE_IMAGE, course_dir / SAMPLE_IMAGE)
+
+    lecture_files = []
+    per_file, extra = divmod(slide_count, file_count)
+    for deck in range(1, file_count + 1):
+        count = per_file + (1 if deck <= extra else 0)
+        filename = f'Lecture{deck}.html'
+        with open(course_dir / filename, 'w', encoding='utf-8') as f:
+            f.write(DECK_HEAD.format(deck=deck))
+            for number in range(1, count + 1):
+                f.write(f'<!-- Slide {number} -->\n')
+                f.write(make_slide(rng, deck, number))
+                f.write('\n\n')
+            f.write(DECK_TAIL)
+        lecture_files.append(filename)
+    return lecture_files
+
+def parse_scenario(text):
+    slides, _, files = text.partition('x')
+    return int(slides), int(files or 1)
+
+def peak_rss_kb():
+    """이 프로세스와 자식 프로세스의 최대 RSS (KB). resource 모듈이 없는 환경(Windows)에서는 None"""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1024 if sys.platform == 'darwin' else 1  # macOS 는 바이트 단위
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    return own, children
+
+def run_stream(course_dir, lecture_files, output_path):
+    """extract_slides.py 와 같은 방식: 슬라이드를 찾는 대로 번호를 붙여 바로 씀"""
+    page_number = 1
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for filename in lecture_files:
+            with open(course_dir / filename, 'r', encoding='utf-8') as f:
+                content = f.read()
+            for start_pos, end_pos, missing_closes in iter_slide_spans(content):
+                slide_html = content[start_pos:end_pos] + '</div>' * missing_closes
+                if '<div class="page-number">' not in slide_html:
+                    slide_html = slide_html.rstrip().removesuffix('</div>').rstrip() + f'\n    <div class="page-number">{page_number}</div>\n</div>'
+                out.write(slide_html)
+                out.write('\n\n')
+                page_number += 1
+
+def run_extract(course_dir, lecture_files, output_path, use_mmap=False):
+    """덱마다 슬라이드 목록을 만든 뒤 번호를 매겨 씀"""
+    page_count = 0
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for filename in lecture_files:
+            slides = extract_slides_from_file(course_dir / filename, use_mmap)
+            for slide in number_slides(slides, page_count + 1):
+                out.write(slide)
+                out.write('\n\n')
+            page_count += len(slides)
+
+def run_strategy(strategy, course_dir, lecture_files):
+    """방식 하나를 한 번 실행하고 결과 파일 경로를 돌려줌"""
+    output_path = course_dir / 'LectureForPdf.html'
+    cache_dir = course_dir / '.slide_cache'
+    if strategy in ('build', 'build-parallel', 'build-mmap'):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if strategy == 'stream':
+        run_stream(course_dir, lecture_files, output_path)
+    elif strategy in ('extract', 'extract-mmap'):
+        run_extract(course_dir, lecture_files, output_path, use_mmap=strategy == 'extract-mmap')
+    else:
+        jobs = max(2, os.cpu_count() or 1) if strategy == 'build-parallel' else 1
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            build(course_dir, lecture_files, jobs=jobs, use_mmap=strategy == 'build-mmap')
+    return output_path
+
+def child_main(strategy, course_dir, repeat):
+    """측정용 자식 프로세스: 최대 RSS 가 다른 방식과 섞이지 않도록 방식마다 새 프로세스에서 잰다"""
+    course_dir = Path(course_dir)
+    with open(course_dir / 'files.json', 'r', encoding='utf-8') as f:
+        lecture_files = json.load(f)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output_path = run_strategy(strategy, course_dir, lecture_files)
+        times.append(time.perf_counter() - start)
+
+    own, children = peak_rss_kb()
+    json.dump({
+        'wall_s': round(min(times), 4),
+        'peak_rss_kb': own,
+        'children_rss_kb': children or None,
+        'output_bytes': output_path.stat().st_size,
+    }, sys.stdout)
+
+def measure(strategy, course_dir, repeat):
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--child', strategy, str(course_dir), '--repeat', str(repeat)],
+        capture_output=True, text=True, encoding='utf-8'
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"{strategy} 실행 실패:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+def format_kb(kb):
+    return '-' if kb is None else f'{kb / 1024:.1f} MB'
+
+def compare(results, baseline, tolerance):
+    """기준보다 tolerance 이상 나빠진 항목을 문자열 목록으로 돌려줌"""
+    regressions = []
+    for scenario, strategies in results.items():
+        for strategy, current in strategies.items():
+            base = baseline.get(scenario, {}).get(strategy)
+            if base is None:
+                continue
+            label = f'{scenario} {strategy}'
+            if current['wall_s'] > base['wall_s'] * (1 + tolerance) and current['wall_s'] - base['wall_s'] > MIN_TIME_DELTA:
+                regressions.append(f"{label}: 시간 {base['wall_s']:.3f}s → {current['wall_s']:.3f}s")
+            if current['peak_rss_kb'] and base['peak_rss_kb'] and current['peak_rss_kb'] > base['peak_rss_kb'] * (1 + tolerance):
+                regressions.append(f"{label}: 메모리 {format_kb(base['peak_rss_kb'])} → {format_kb(current['peak_rss_kb'])}")
+            if current['output_bytes'] > base['output_bytes'] * (1 + tolerance):
+                regressions.append(f"{label}: 결과 크기 {base['output_bytes']} → {current['output_bytes']} bytes")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='슬라이드 추출 방식별 시간/메모리/결과 크기 측정')
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help='슬라이드 수x파일 수 목록 (기본: %(default)s)')
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help='측정할 방식 목록 (기본: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='방식마다 반복 횟수, 가장 빠른 시간을 기록 (기본: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='가상 강의 생성용 시드')
+    parser.add_argument('--save-baseline', metavar='PATH', help='결과를 기준 파일로 저장')
+    parser.add_argument('--baseline', metavar='PATH', help='기준 파일과 비교해서 나빠지면 종료 코드 1')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='기준 대비 허용하는 증가율 (기본: %(default)s)')
+    parser.add_argument('--child', nargs=2, metavar=('STRATEGY', 'COURSE_DIR'), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.child:
+        child_main(args.child[0], args.child[1], args.repeat)
+        return
+
+    strategies = args.strategies.split(',')
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 방식: {', '.join(unknown)} (가능: {', '.join(STRATEGIES)})")
+
+    results = {}
+    print(f"{'시나리오':<12} {'방식':<16} {'시간':>9} {'최대 RSS':>10} {'자식 RSS':>10} {'결과 크기':>10}")
+    for scenario in args.scenarios.split(','):
+        slide_count, file_count = parse_scenario(scenario)
+        results[scenario] = {}
+        with tempfile.TemporaryDirectory(prefix='slide_bench_') as tmp:
+            course_dir = Path(tmp)
+            lecture_files = generate_course(course_dir, slide_count, file_count, args.seed)
+            with open(course_dir / 'files.json', 'w', encoding='utf-8') as f:
+                json.dump(lecture_files, f)
+
+            for strategy in strategies:
+                if strategy == 'build-cached':
+                    measure('build', course_dir, 1)  # 캐시 채우기 (기록하지 않음)
+                result = measure(strategy, course_dir, args.repeat)
+                results[scenario][strategy] = result
+                print(f"{scenario:<12} {strategy:<16} {result['wall_s']:>8.3f}s "
+                      f"{format_kb(result['peak_rss_kb']):>10} {format_kb(result['children_rss_kb']):>10} "
+                      f"{result['output_bytes'] // 1024:>7} KB")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 저장: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 기준보다 나빠진 항목 ({args.tolerance:.0%} 초과):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n✅ 기준 대비 나빠진 항목 없음 (허용 {args.tolerance:.0%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# 요약 표에 나오는 단계 (순서대로)
+#   read      강의 파일(또는 캐시) 읽기, 캐시 바이트를 Slide 로 풀기
+#   detect    슬라이드 경계 찾기 (iter_slide_spans 토큰 스캔)
+#   balance   슬라이드 잘라내기와 닫히지 않은 div 채우기
+#   parse     Slide 만들기 (본문 텍스트와 제목, 코드 블록 위치, 자산 참조, 요소 목록)
+#   cache     추출 결과를 캐시에 쓰기
+#   renumber  페이지 번호 넣기
+#   emit      템플릿에 넣을 슬라이드 만들기 (이미지 속성, 최적화, 폰트/CSS 수집)
+#   pdf       --pdf 슬라이드 배치 넘기기와 PDF 쓰기
+#   write     결과 파일에 쓰기
+PHASES = ('read', 'detect', 'balance', 'parse', 'cache', 'renumber', 'emit', 'pdf', 'write')
+
+class BuildProfiler:
+    """빌드 단계별 시간을 Chrome trace-event 형식으로 모으는 객체
+
+    chrome://tracing 이나 https://ui.perfetto.dev 에서 결과 파일을 열어 볼 수 있다.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+
+    def add(self, name, start_ns, end_ns, **args):
+        self.events.append({
+            'name': name,
+            'cat': 'phase' if name in PHASES else 'deck',
+            'ph': 'X',
+            'ts': start_ns / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    @contextmanager
+    def phase(self, name, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter_ns(), **args)
+
+    def iter_timed(self, name, iterable, **args):
+        """iterable 에서 항목 하나를 꺼낼 때마다 걸린 시간을 name 단계로 기록 (args 에 순번 slide 추가)"""
+        iterator = iter(iterable)
+        index = 0
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add(name, start, time.perf_counter_ns(), slide=index, **args)
+            index += 1
+            yield item
+
+    def write_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+    def summary(self):
+        """단계별 합계 표와 덱별 단계 시간 표를 문자열로"""
+        totals = {name: [0, 0.0, 0.0] for name in PHASES}  # 횟수, 합계, 최대 (µs)
+        decks = {}
+        for event in self.events:
+            if event['name'] not in totals:
+                continue
+            total = totals[event['name']]
+            total[0] += 1
+            total[1] += event['dur']
+            total[2] = max(total[2], event['dur'])
+            deck = event['args'].get('deck')
+            if deck is not None:
+                per_deck = decks.setdefault(deck, dict.fromkeys(PHASES, 0.0))
+                per_deck[event['name']] += event['dur']
+
+        lines = [f"{'단계':<10} {'횟수':>8} {'합계(ms)':>10} {'평균(µs)':>10} {'최대(µs)':>10}"]
+        for name, (count, total, longest) in totals.items():
+            if count:
+                lines.append(f"{name:<10} {count:>8} {total / 1000:>10.2f} {total / count:>10.1f} {longest:>10.1f}")
+
+        lines.append('')
+        lines.append(f"{'덱':<20}" + ''.join(f'{name:>10}' for name in PHASES) + f"{'합계':>10}")
+        for deck, per_phase in decks.items():
+            lines.append(f'{deck:<20}' + ''.join(f'{per_phase[name] / 1000:>10.2f}' for name in PHASES)
+                         + f'{sum(per_phase.values()) / 1000:>10.2f}')
+        lines.append('(덱별 표 단위: ms)')
+        return '\n'.join(lines)
+
+class NullProfiler:
+    """--profile 을 끈 평소 빌드용 - 아무것도 기록하지 않음"""
+    enabled = False
+
+    def phase(self, name, **args):
+        return nullcontext()
+
+    def iter_timed(self, name, iterable, **args):
+        return iterable
+
+NULL_PROFILER = NullProfiler()
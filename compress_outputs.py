@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from purge_css import parse_css, serialize
+from subset_fonts import has_brotli
+
+# 최소화/압축 결과 형식이 바뀌면 올려서 모든 압축본을 다시 만듦
+COMPRESSOR_VERSION = 1
+
+# 캐시 파일 이름 (슬라이드 캐시 폴더 안에 둠) - 파일별로 마지막에 압축한 내용 해시
+COMPRESS_CACHE_NAME = 'compress.json'
+
+# 최소화하는 파일과 압축본(.gz/.br)을 만드는 파일
+MINIFY_SUFFIXES = ('.html', '.css')
+COMPRESS_SUFFIXES = ('.html', '.css', '.js', '.json', '.svg')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# 내용을 건드리면 안 되는 블록 (<pre> 의 공백은 화면에 그대로 나옴), <style> 은 CSS 로 최소화
+RAW_BLOCK_RE = re.compile(r'<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+STYLE_BLOCK_RE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.DOTALL | re.IGNORECASE)
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+SPACE_RE = re.compile(r'\s+')
+
+# 앞뒤 공백이 화면에 영향을 주지 않는 블록 태그 (인라인 태그 사이의 공백은 한 칸으로만 줄임)
+BLOCK_TAGS = (
+    'html|head|body|meta|link|title|style|script|template|div|section|header|footer|nav|main|article|aside|'
+    'h[1-6]|p|ul|ol|li|dl|dt|dd|table|thead|tbody|tr|th|td|pre|blockquote|figure|figcaption|br|hr'
+)
+SPACE_BEFORE_BLOCK_RE = re.compile(rf'\s+(?=</?(?:{BLOCK_TAGS})\b)', re.IGNORECASE)
+SPACE_AFTER_BLOCK_RE = re.compile(rf'(</?(?:{BLOCK_TAGS})\b[^>]*>)\s+', re.IGNORECASE)
+
+def minify_css(css):
+    return serialize(parse_css(css))
+
+def minify_markup(html):
+    """태그 바깥의 주석과 공백을 줄임 (<pre>/<script> 등은 호출하는 쪽에서 빼 둠)"""
+    html = SPACE_RE.sub(' ', HTML_COMMENT_RE.sub('', html))
+    html = SPACE_BEFORE_BLOCK_RE.sub('', html)
+    return SPACE_AFTER_BLOCK_RE.sub(r'\1', html)
+
+def minify_html(html):
+    """주석과 공백을 줄인 HTML - <pre>/<textarea>/<script> 는 그대로, <style> 은 CSS 최소화"""
+    parts = []
+    last_pos = 0
+    for match in RAW_BLOCK_RE.finditer(html):
+        parts.append(minify_markup(html[last_pos:match.start()]))
+        block = match.group(0)
+        if match.group(1).lower() == 'style':
+            block = STYLE_BLOCK_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), block)
+        parts.append(block)
+        last_pos = match.end()
+    parts.append(minify_markup(html[last_pos:]))
+    return ''.join(parts).strip()
+
+def minify_file(src_path, dst_path):
+    """src_path 를 최소화해서 dst_path 에 씀 (내용이 같으면 쓰지 않음) - (원래 크기, 최소화 크기)"""
+    text = src_path.read_text(encoding='utf-8')
+    minify = minify_css if src_path.suffix == '.css' else minify_html
+    minified = minify(text)
+    data = minified.encode('utf-8')
+    if src_path != dst_path or minified != text:
+        if not dst_path.is_file() or dst_path.read_bytes() != data:
+            dst_path.write_bytes(data)
+    return len(text.encode('utf-8')), len(data)
+
+class OutputCompressor:
+    """생성된 파일 옆에 .gz/.br 압축본을 써 두는 객체 (정적 서버가 그대로 내보낼 수 있게)
+
+    파일 내용 해시를 캐시해서, 지난 빌드와 내용이 같고 압축본도 남아 있으면 다시 압축하지 않는다.
+    brotli 가 없으면 .gz 만 만든다. shared_cache 를 주면 다른 강의에서 같은 내용을 압축한 결과를 가져다 쓴다.
+    """
+
+    def __init__(self, cache_path, shared_cache=None):
+        self.cache_path = cache_path
+        self.shared_cache = shared_cache
+        self.cache = {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == COMPRESSOR_VERSION:
+                self.cache = data['files']
+        except (OSError, ValueError):
+            pass
+        self.used = {}
+        self.brotli = None
+        if has_brotli():
+            import brotli
+            self.brotli = brotli
+        self.compressed = 0
+        self.reused = 0
+        self.original_bytes = 0
+        self.minified_bytes = 0
+        self.gzip_bytes = 0
+        self.brotli_bytes = 0
+
+    def suffixes(self):
+        return COMPRESSED_SUFFIXES if self.brotli is not None else COMPRESSED_SUFFIXES[:1]
+
+    def add(self, path, minified_path=None):
+        """path 를 (HTML/CSS 면 최소화해서 minified_path 에) 쓰고 압축본을 만듦
+
+        minified_path 를 주지 않으면 제자리에서 최소화한다.
+        """
+        self.compress_file(self.minify(path, minified_path))
+
+    def minify(self, path, minified_path=None):
+        """path 를 (HTML/CSS 면) 최소화해서 minified_path 에 쓰고 쓴 경로를 돌려줌 (주지 않으면 제자리)"""
+        out_path = minified_path or path
+        if path.suffix in MINIFY_SUFFIXES:
+            original, minified = minify_file(path, out_path)
+        else:
+            original = minified = path.stat().st_size
+        self.original_bytes += original
+        self.minified_bytes += minified
+        return out_path
+
+    def compress_file(self, path):
+        """path 옆에 압축본을 씀 (지난 빌드와 내용이 같고 압축본이 남아 있으면 건너뜀)"""
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        key = str(path)
+        self.used[key] = digest
+        siblings = [path.with_name(path.name + suffix) for suffix in self.suffixes()]
+        if self.cache.get(key) == digest and all(sibling.is_file() for sibling in siblings):
+            self.reused += 1
+        else:
+            self.compressed += 1
+            self.compress(data, digest, siblings)
+        self.gzip_bytes += siblings[0].stat().st_size
+        if self.brotli is not None:
+            self.brotli_bytes += siblings[1].stat().st_size
+
+    def compress(self, data, digest, siblings):
+        compressors = [lambda: gzip.compress(data, GZIP_LEVEL, mtime=0)]
+        if self.brotli is not None:
+            compressors.append(lambda: self.brotli.compress(data, quality=BROTLI_QUALITY))
+        for sibling, compress in zip(siblings, compressors):
+            if self.shared_cache is None:
+                write_atomic(sibling, compress())
+                continue
+            name = f'{digest}{sibling.suffix}'
+            with self.shared_cache.lock(name):
+                if not self.shared_cache.fetch(name, sibling):
+                    write_atomic(sibling, compress())
+                    self.shared_cache.store(sibling, name)
+
+    def minify_tree(self, directory, exclude=()):
+        """directory 아래의 HTML/CSS 를 제자리에서 최소화 (exclude 폴더 아래는 건너뜀)"""
+        for path in sorted(directory.rglob('*')):
+            if path.is_file() and path.suffix in MINIFY_SUFFIXES and not any(d in path.parents for d in exclude):
+                self.minify(path)
+
+    def add_tree(self, directory, minified=False):
+        """directory 아래의 압축 대상 파일을 모두 처리하고, 원본이 없어진 압축본은 지움
+
+        minified 면 HTML/CSS 는 이미 minify_tree() 로 최소화한 것으로 보고 압축만 한다.
+        """
+        for path in sorted(directory.rglob('*')):
+            if not path.is_file():
+                continue
+            if path.suffix in COMPRESSED_SUFFIXES:
+                if not path.with_suffix('').is_file():
+                    path.unlink()
+            elif minified and path.suffix in MINIFY_SUFFIXES:
+                self.compress_file(path)
+            elif path.suffix in COMPRESS_SUFFIXES:
+                self.add(path)
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': COMPRESSOR_VERSION, 'files': self.used}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+def write_atomic(path, data):
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+def report(compressor):
+    print(f"  파일 {len(compressor.used)}개 (새로 압축 {compressor.compressed}개, 그대로 {compressor.reused}개)")
+    print(f"  최소화: {compressor.original_bytes // 1024} KB → {compressor.minified_bytes // 1024} KB")
+    print(f"  gzip: {compressor.gzip_bytes // 1024} KB")
+    if compressor.brotli is not None:
+        print(f"  brotli: {compressor.brotli_bytes // 1024} KB")
+    else:
+        print("  (brotli 가 없어 .br 은 건너뜀: pip install brotli)")
@@ -1,85 +1,335 @@
 # -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import marshal
+import mmap
+import os
 import re
+import shutil
 import sys
+import textwrap
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-def extract_slides_from_file(file_path):
-    """파일에서 모든 슬라이드 추출"""
+from batch_build import DEFAULT_COURSE_JOBS, build_courses
+from build_profiler import NULL_PROFILER, BuildProfiler
+from compress_outputs import COMPRESS_CACHE_NAME, COMPRESSED_SUFFIXES, OutputCompressor
+from compress_outputs import report as report_compress
+from fingerprint_assets import ASSET_DIR_NAME, AssetFingerprinter
+from fingerprint_assets import report as report_assets
+from highlight_code import HIGHLIGHT_CACHE_NAME, CodeHighlighter
+from highlight_code import report as report_highlight
+from hoist_styles import HOISTED_STYLESHEET_NAME, StyleHoister, link_stylesheet
+from hoist_styles import report as report_hoist
+from offline_cache import SERVICE_WORKER_NAME, SERVICE_WORKER_TEMPLATE, PrecacheManifest, register_service_worker
+from offline_cache import report as report_offline
+from optimize_images import IMAGE_DIR_NAME, ImageOptimizer, annotate_images
+from optimize_images import report as report_images
+from pdf_export import PDF_NAME, PdfExporter
+from pdf_export import report as report_pdf
+from perf_budget import BUDGET_FILE_NAME, check_pages
+from perf_budget import report as report_budget
+from purge_css import UsedSelectors, purge_page_styles, purge_stylesheet
+from search_index import SEARCH_DIR_NAME, SearchIndexer
+from search_index import report as report_search
+from slide_fragments import FRAGMENT_DIR_NAME, FRAGMENT_MANIFEST_NAME, FRAGMENT_VIEWER_NAME, FragmentWriter, viewer_html
+from slide_fragments import report as report_fragments
+from slide_fragments import serve as serve_fragments
+from slide_model import SLIDE_FORMAT_VERSION, Slide, StringTable, dump_slides, load_slides, page_number_html
+from subset_fonts import FONT_CSS_NAME, FONT_DIR_NAME, FontSubsetter, rewrite_font_links
+from subset_fonts import report as report_fonts
+
+BASE_DIR = Path(r'c:\gitprac\Lecture')
+LECTURE_FILES = [
+    'Lecture1.html',
+    'Lecture2.html',
+    'Lecture3-1.html',
+    'Lecture3-2.html',
+    'Lecture3-3.html',
+    'Lecture4.html'
+]
+
+# 강의별 페이지, 최적화한 이미지, 서브셋 폰트 등 배포용 결과물 폴더
+BUILD_DIR_NAME = 'dist'
+
+# LectureForPdf.html 스타일 원본 (extract_slides.py 와 공용)
+PDF_STYLESHEET = Path('styles') / 'lecture-pdf.css'
+PDF_STYLESHEET_MIN_NAME = 'LectureForPdf.min.css'
+
+# 강의 페이지 공용 슬라이드 뷰어 (--virtual-slides)
+VIEWER_SCRIPT = Path('js') / 'slide-viewer.js'
+
+# --profile 의 기본 trace 파일 이름 (base_dir 기준)
+PROFILE_NAME = 'build_profile.json'
+
+# 추출 로직(토크나이저, 정리 규칙)이 바뀌면 올려서 기존 캐시를 무효화
+EXTRACTOR_VERSION = 2
+CACHE_DIR_NAME = '.slide_cache'
+CACHE_SUFFIX = '.slides'
+
+# 캐시는 marshal 로 쓰므로 파이썬의 marshal 형식 버전도 함께 비교
+CACHE_VERSION = (EXTRACTOR_VERSION, SLIDE_FORMAT_VERSION, marshal.version)
+
+# 슬라이드 경계 탐색용 토큰
+# 주석과 script/style 본문은 통째로 건너뛰고, div 여닫기와 </body> 만 본다
+SLIDE_TOKEN_RE = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    r'|(?P<raw><(?P<rawtag>script|style)\b[^>]*>.*?</(?P=rawtag)\s*>)'
+    r'|(?P<open><div\b(?P<attrs>[^>]*)>)'
+    r'|(?P<close></div\s*>)'
+    r'|(?P<body></body\s*>)',
+    re.DOTALL | re.IGNORECASE
+)
+CLASS_ATTR_RE = re.compile(r'''\bclass\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+
+# --mmap 용: 같은 토큰을 UTF-8 바이트에서 직접 찾음 (태그와 속성 이름은 모두 ASCII)
+SLIDE_TOKEN_BYTES_RE = re.compile(SLIDE_TOKEN_RE.pattern.encode('ascii'), re.DOTALL | re.IGNORECASE)
+
+# 로컬 이미지 참조 (watch 모드에서 감시 대상 수집용)
+IMAGE_REF_RE = re.compile(r'''<img\b[^>]*\bsrc\s*=\s*["'](?:\./)?([^"':?#]+)["']''', re.IGNORECASE)
+
+# watch 모드 자동 새로고침
+RELOAD_PATH = '/__reload'
+RELOAD_SCRIPT = f"<script>new EventSource('{RELOAD_PATH}').onmessage = function () {{ location.reload(); }};</script>\n"
+
+# 강의 페이지에 들어 있는 슬라이드 이동 스크립트 (querySelectorAll('.slide') 로 슬라이드를 찾는 것)
+SLIDE_NAV_SCRIPT_RE = re.compile(
+    r'''[ \t]*<script>(?:(?!</script>).)*?querySelectorAll\(\s*['"]\.slide['"]\s*\)(?:(?!</script>).)*</script>[ \t]*\n?''',
+    re.DOTALL
+)
+
+# 하나라도 켜져 있으면 build() 가 강의별 페이지를 dist/ 에 쓰는 옵션 (--budget 이 잴 페이지를 고를 때 씀)
+DECK_STAGES = ('optimize_images', 'subset_fonts', 'purge_css', 'virtual_slides', 'highlight_code', 'fingerprint',
+               'hoist_styles')
+
+# 처음부터 보이는 슬라이드 수 - 그 뒤 슬라이드의 이미지는 지연 로딩
+EAGER_SLIDES = 1
+
+def is_slide_tag(attrs):
+    """div 속성 문자열의 class 목록에 'slide' 가 있는지 확인 (slide-title, slider-container 제외)"""
+    if not isinstance(attrs, str):
+        # 바이트 스캔: 'slide' 가 들어 있는 짧은 속성 문자열만 디코딩
+        if b'slide' not in attrs:
+            return False
+        attrs = attrs.decode('utf-8', 'replace')
+    match = CLASS_ATTR_RE.search(attrs)
+    return match is not None and 'slide' in match.group(1).split()
+
+def iter_slide_spans(content):
+    """content 를 한 번만 훑으면서 슬라이드마다 (시작, 끝, 부족한 </div> 수) 를 돌려줌
+
+    content 가 bytes/mmap 이면 UTF-8 바이트 그대로 훑고 바이트 위치를 돌려준다.
+    """
+    # 문자열을 자르지 않고 위치만 넘긴다 - 복사는 호출하는 쪽에서 슬라이드당 한 번
+    if isinstance(content, str):
+        token_re, script_tag = SLIDE_TOKEN_RE, 'script'
+    else:
+        token_re, script_tag = SLIDE_TOKEN_BYTES_RE, b'script'
+    
+    depth = 0
+    slide_start = None
+    slide_depth = 0
+    script_pos = None  # 닫히지 않은 슬라이드를 자를 위치 (뒤따르는 <script>)
+
+    for m in token_re.finditer(content):
+        kind = m.lastgroup
+        if kind == 'open':
+            depth += 1
+            script_pos = None
+            if is_slide_tag(m.group('attrs')):
+                if slide_start is not None:
+                    # 앞 슬라이드가 닫히지 않은 채 다음 슬라이드가 시작됨: 여기서 자르고 모자란 </div> 를 채움
+                    yield slide_start, m.start(), depth - slide_depth
+                slide_start = m.start()
+                slide_depth = depth
+        elif kind == 'close':
+            script_pos = None
+            if depth == 0:
+                continue
+            if slide_start is not None and depth == slide_depth:
+                yield slide_start, m.end(), 0
+                slide_start = None
+            depth -= 1
+        elif kind == 'raw':
+            if slide_start is not None and script_pos is None and m.group('rawtag').lower() == script_tag:
+                script_pos = m.start()
+        elif kind == 'body':
+            break
+
+    # 파일 끝까지 닫히지 않은 슬라이드: <script> 또는 </body> 앞에서 자르고 div 를 채워 넣는다
+    if slide_start is not None:
+        if script_pos is not None:
+            end_pos = script_pos
+        elif kind == 'body':
+            end_pos = m.start()
+        else:
+            end_pos = len(content)
+        yield slide_start, end_pos, depth - slide_depth + 1
+
+def extract_slides_from_file(file_path, use_mmap=False):
+    """파일에서 모든 슬라이드 추출 (use_mmap 이면 파일을 메모리 매핑해서 바이트 단위로 훑음)"""
+    if use_mmap:
+        with open(file_path, 'rb') as f, map_file(f) as data:
+            return extract_slides_from_buffer(data, deck=file_path.name)
+    
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
+    return extract_slides_from_content(content, deck=file_path.name)
+
+def map_file(f):
+    """읽기 전용 mmap 을 with 문에 쓸 수 있게 돌려줌 (빈 파일은 매핑할 수 없으므로 빈 bytes)"""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b'')
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def extract_slides_from_content(content, profiler=NULL_PROFILER, deck=None):
+    """HTML 문자열에서 모든 슬라이드를 Slide 목록으로 추출"""
     slides = []
-    # <div class="slide"> 로 시작하는 부분 찾기
-    slide_pattern = r'(<div class="slide[^>]*>)'
-    slide_starts = [m.start() for m in re.finditer(slide_pattern, content)]
-    
-    for i, start_pos in enumerate(slide_starts):
-        # 다음 슬라이드 시작 위치 또는 파일 끝까지
-        if i < len(slide_starts) - 1:
-            end_pos = slide_starts[i + 1]
-        else:
-            # 마지막 슬라이드: </div> 이후 <script> 또는 </body> 찾기
-            script_match = re.search(r'<script[^>]*>', content[start_pos:])
-            body_match = re.search(r'</body>', content[start_pos:])
+    strings = StringTable()
+    for start_pos, end_pos, missing_closes in profiler.iter_timed('detect', iter_slide_spans(content), deck=deck):
+        with profiler.phase('balance', deck=deck, slide=len(slides)):
+            # 슬라이드 하나당 한 번만 잘라낸다
+            slide_html = content[start_pos:end_pos].strip()
             
-            if script_match:
-                end_pos = start_pos + script_match.start()
-            elif body_match:
-                end_pos = start_pos + body_match.start()
-            else:
-                end_pos = len(content)
+            # 닫히지 않은 div 채우기
+            if missing_closes > 0:
+                slide_html += '</div>' * missing_closes
         
-        slide_html = content[start_pos:end_pos].strip()
-        
-        # div 태그 균형 맞추기
-        open_count = slide_html.count('<div')
-        close_count = slide_html.count('</div>')
-        
-        if open_count > close_count:
-            slide_html += '</div>' * (open_count - close_count)
-        
-        slides.append(slide_html)
+        with profiler.phase('parse', deck=deck, slide=len(slides)):
+            slides.append(Slide.parse(deck, len(slides), slide_html, strings))
     
     return slides
 
-def main():
-    base_dir = Path(r'c:\gitprac\Lecture')
-    lecture_files = [
-        'Lecture1.html',
-        'Lecture2.html',
-        'Lecture3-1.html',
-        'Lecture3-2.html',
-        'Lecture3-3.html',
-        'Lecture4.html'
-    ]
-    
-    all_slides = []
-    page_number = 1
+def extract_slides_from_buffer(data, profiler=NULL_PROFILER, deck=None):
+    """UTF-8 바이트(bytes/mmap)에서 모든 슬라이드 추출
+
+    파일 전체를 str 로 디코딩하지 않고, 경계는 바이트에서 찾은 뒤 슬라이드 부분만 디코딩한다.
+    """
+    slides = []
+    strings = StringTable()
+    for start_pos, end_pos, missing_closes in profiler.iter_timed('detect', iter_slide_spans(data), deck=deck):
+        with profiler.phase('balance', deck=deck, slide=len(slides)):
+            # 텍스트 모드로 읽을 때와 같도록 줄바꿈을 \n 으로 맞춤
+            slide_html = data[start_pos:end_pos].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n').strip()
+            
+            if missing_closes > 0:
+                slide_html += '</div>' * missing_closes
+        
+        with profiler.phase('parse', deck=deck, slide=len(slides)):
+            slides.append(Slide.parse(deck, len(slides), slide_html, strings))
     
-    print("슬라이드 추출 시작...")
+    return slides
+
+def load_slides_cached(file_path, cache_dir, profiler=NULL_PROFILER, use_mmap=False):
+    """내용 해시가 같으면 캐시에서 슬라이드를 읽고, 아니면 새로 추출해서 캐시에 저장
+
+    (Slide 목록, 캐시 사용 여부) 를 돌려줌
+    use_mmap 이면 파일을 메모리 매핑해서 해시와 경계 탐색을 바이트에서 바로 하고 슬라이드 부분만 디코딩한다.
+    """
+    packed, hit = load_packed_slides(file_path, cache_dir, profiler, use_mmap)
+    with profiler.phase('read', deck=file_path.name):
+        return load_slides(packed), hit
+
+def load_packed_slides(file_path, cache_dir, profiler=NULL_PROFILER, use_mmap=False):
+    """load_slides_cached() 와 같지만 dump_slides() 바이트를 돌려줌 (프로세스 사이로 넘기기 좋음)"""
+    deck = file_path.name
+    cache_path = cache_dir / f'{deck}{CACHE_SUFFIX}'
     
-    for filename in lecture_files:
-        file_path = base_dir / filename
-        print(f"처리 중: {filename}")
-        
-        slides = extract_slides_from_file(file_path)
-        print(f"  - {len(slides)}개 슬라이드 추출")
-        
-        # 페이지 번호 추가
-        for slide in slides:
-            # 기존 페이지 번호 제거
-            slide = re.sub(r'<div class="page-number">\d+</div>', '', slide)
+    with ExitStack() as stack:
+        with profiler.phase('read', deck=deck):
+            stat = file_path.stat()
+            
+            cached = None
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached = marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
             
-            # 마지막 </div> 바로 전에 페이지 번호 삽입
-            slide = re.sub(r'(</div>\s*)$', f'    <div class="page-number">{page_number}</div>\\n\\1', slide, count=1)
+            if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+                cached = None
             
-            all_slides.append(slide)
-            page_number += 1
+            # 크기와 수정 시각이 그대로면 파일을 다시 읽지도 않는다
+            if cached is not None and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                return cached['slides'], True
+            
+            if use_mmap:
+                data = stack.enter_context(map_file(stack.enter_context(open(file_path, 'rb'))))
+            else:
+                data = file_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+        
+        if cached is not None and cached['hash'] == digest:
+            packed = cached['slides']
+            hit = True
+        else:
+            if use_mmap:
+                slides = extract_slides_from_buffer(data, profiler, deck)
+            else:
+                # 텍스트 모드로 읽을 때와 같도록 줄바꿈을 \n 으로 맞춤
+                with profiler.phase('read', deck=deck):
+                    content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                slides = extract_slides_from_content(content, profiler, deck)
+            packed = dump_slides(slides)
+            hit = False
     
-    print(f"\n총 {len(all_slides)}개의 슬라이드를 추출했습니다.")
+    # 임시 파일에 쓰고 교체해서, 중간에 끊겨도 깨진 캐시가 남지 않게 함
+    with profiler.phase('cache', deck=deck):
+        cache_dir.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            marshal.dump({
+                'version': CACHE_VERSION,
+                'hash': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'slides': packed,
+            }, f)
+        os.replace(tmp_path, cache_path)
     
-    # HTML 템플릿
-    html_header = '''<!DOCTYPE html>
+    return packed, hit
+
+def iter_decks(file_paths, cache_dir, jobs=1, profiler=NULL_PROFILER, use_mmap=False):
+    """강의 파일 순서대로 (Slide 목록, 캐시 사용 여부) 를 하나씩 돌려줌
+
+    jobs 가 2 이상이면 프로세스 풀에서 덱별로 병렬 추출하되, 최대 jobs 개 덱만
+    미리 읽어 두므로 메모리 사용량은 전체 강의 수와 상관없다.
+    프로파일러는 직렬 추출에서만 단계를 기록한다 (다른 프로세스의 시간은 모을 수 없음).
+    """
+    if jobs <= 1 or len(file_paths) <= 1:
+        for path in file_paths:
+            with profiler.phase('load', deck=path.name):
+                result = load_slides_cached(path, cache_dir, profiler, use_mmap)
+            yield result
+        return
+    
+    # 제출한 순서대로 결과를 꺼내므로 직렬 빌드와 출력이 같다
+    # 작업 프로세스는 캐시 형식 바이트를 그대로 넘기고 여기서 Slide 로 푼다
+    with ProcessPoolExecutor(max_workers=min(jobs, len(file_paths))) as executor:
+        pending = deque()
+        for path in file_paths:
+            pending.append(executor.submit(load_packed_slides, path, cache_dir, use_mmap=use_mmap))
+            if len(pending) >= jobs:
+                packed, hit = pending.popleft().result()
+                yield load_slides(packed), hit
+        while pending:
+            packed, hit = pending.popleft().result()
+            yield load_slides(packed), hit
+
+def number_slides(slides, first_page):
+    """first_page 부터 새 번호를 붙인 슬라이드 HTML 을 하나씩 돌려줌 (원본 번호는 추출할 때 빠져 있음)"""
+    for page_number, slide in enumerate(slides, first_page):
+        yield slide.numbered(page_number)
+
+# HTML 템플릿
+HTML_HEADER = '''<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -89,242 +339,647 @@ def main():
     <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
     <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
-    <style>
-        /* CORE THEME & RESET */
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-        
-        body {
-            background-color: #0d1117;
-            color: #e6edf3;
-            font-family: 'Noto Sans KR', sans-serif;
-        }
-
-        /* PDF 출력용 설정 */
-        @media print {
-            @page {
-                size: A4 landscape;
-                margin: 0;
-            }
-            
-            body {
-                background-color: #0d1117;
-                print-color-adjust: exact;
-                -webkit-print-color-adjust: exact;
-            }
-            
-            .slide {
-                page-break-after: always;
-                page-break-inside: avoid;
-                display: flex !important;
-                opacity: 1 !important;
-                visibility: visible !important;
-                position: relative !important;
-                height: 100vh;
-                width: 100vw;
-                min-height: 100vh;
-            }
-            
-            .slide:last-child {
-                page-break-after: auto;
-            }
-            
-            .nav-bar, .nav-buttons, .nav-btn, .slider-container, .page-indicator {
-                display: none !important;
-            }
-            
-            .page-number {
-                display: block !important;
-            }
-        }
-
-        /* SLIDE CONTAINER */
-        .slide {
-            min-height: 100vh;
-            width: 100%;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            border-bottom: 1px solid #30363d;
-            overflow: hidden;
-            position: relative;
-            padding: 60px;
-        }
-
-        /* CONTENT WRAPPER */
-        .content {
-            width: 1200px;
-            max-width: 90%;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            z-index: 1;
-        }
-
-        /* BACKGROUND DECORATION */
-        .slide::before {
-            content: '';
-            position: absolute;
-            top: -10%;
-            right: -10%;
-            width: 40vw;
-            height: 40vw;
-            background: radial-gradient(circle, rgba(46, 160, 67, 0.05) 0%, rgba(0,0,0,0) 70%);
-            border-radius: 50%;
-            z-index: 0;
-        }
-
-        /* TYPOGRAPHY */
-        h1 { font-size: 3.5rem; font-weight: 700; margin-bottom: 1rem; line-height: 1.2; }
-        h2 { font-size: 2.5rem; font-weight: 700; margin-bottom: 2rem; color: #7ee787; border-left: 5px solid #7ee787; padding-left: 1rem; }
-        h3 { font-size: 1.8rem; margin-bottom: 1rem; color: #a5d6ff; }
-        p, li { font-size: 1.4rem; line-height: 1.6; color: #c9d1d9; margin-bottom: 0.8rem; }
-        strong { color: #fff; font-weight: 700; }
-        
-        /* CODE BLOCK STYLE */
-        pre {
-            background: #161b22;
-            padding: 1.5rem;
-            border-radius: 8px;
-            border: 1px solid #30363d;
-            font-family: 'JetBrains Mono', monospace;
-            font-size: 1.2rem;
-            overflow-x: auto;
-            margin: 1.5rem 0;
-            color: #e6edf3;
-        }
-        code { font-family: 'JetBrains Mono', monospace; color: #ff7b72; }
-        .comment { color: #8b949e; }
-
-        /* LISTS */
-        ul { list-style: none; padding-left: 1rem; }
-        ul li::before {
-            content: "\\f054";
-            font-family: "Font Awesome 6 Free";
-            font-weight: 900;
-            color: #7ee787;
-            display: inline-block;
-            width: 1.5em;
-            margin-left: -1.5em;
-        }
-
-        ol { padding-left: 2rem; }
-
-        /* LAYOUTS */
-        .grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 3rem; align-items: center; }
-        .card { background: #21262d; padding: 2rem; border-radius: 12px; border: 1px solid #30363d; height: 100%; }
-        .center-text { text-align: center; }
-        
-        /* VISUAL ELEMENTS */
-        .big-icon { font-size: 4rem; color: #7ee787; margin-bottom: 1rem; }
-        .highlight-box { border: 2px solid #7ee787; padding: 2rem; border-radius: 12px; text-align: center; margin-top: 2rem; }
-        .highlight { background-color: rgba(126, 231, 135, 0.2); color: #7ee787; padding: 2px 6px; border-radius: 4px; }
-
-        /* TREE DIAGRAM */
-        .tree-node { margin-left: 20px; border-left: 2px solid #30363d; padding-left: 20px; position: relative; }
-        .tree-node::before { content: ''; position: absolute; left: 0; top: 15px; width: 20px; height: 2px; background: #30363d; }
-        .tree-item { background: #161b22; padding: 10px; margin-bottom: 10px; border-radius: 6px; display: inline-block; border: 1px solid #30363d; font-family: 'JetBrains Mono'; }
-        .tree-node-item {
-            font-family: 'JetBrains Mono', monospace;
-            font-size: 1.3rem;
-            line-height: 1.8;
-            color: #c9d1d9;
-            margin-left: 0;
-        }
-        .tree-indent { margin-left: 30px; }
-        .tree-symbol { color: #79c0ff; margin-right: 10px; }
-
-        /* Lecture3 styles */
-        .main-title { font-size: 2.8rem; color: #fff; margin-bottom: 1.5rem; }
-        .slide-title { font-size: 2rem; color: #7ee787; margin-bottom: 1.5rem; border-left: 4px solid #7ee787; padding-left: 1rem; }
-        .instruction-col { display: flex; flex-direction: column; justify-content: flex-start; padding-top: 20px; }
-        .image-col { display: flex; align-items: center; justify-content: center; }
-        .image-container { 
-            background: rgba(255,255,255,0.02); 
-            border: 1px solid #30363d; 
-            border-radius: 8px; 
-            padding: 20px; 
-            display: flex; 
-            align-items: center; 
-            justify-content: center;
-            min-height: 300px;
-        }
-        .image-container img { max-width: 100%; max-height: 100%; object-fit: contain; border-radius: 4px; }
-        .placeholder-text { color: #8b949e; text-align: center; }
-        .path-text { font-family: 'JetBrains Mono', monospace; color: #79c0ff; font-weight: 600; }
-        .step-list { list-style: none; padding-left: 0; line-height: 1.8; }
-        .step-list li { margin-bottom: 12px; padding-left: 8px; }
-        .code-block { background: #161b22; padding: 1.5rem; border-radius: 8px; border: 1px solid #30363d; overflow-x: auto; }
-        .col-left, .col-right { display: flex; flex-direction: column; justify-content: center; }
-        .tree-view { background: #161b22; padding: 20px; border-radius: 8px; border: 1px solid #30363d; }
-        .tree-view .tree-item { display: block; margin-bottom: 8px; padding: 8px 12px; }
-        .indent-1 { margin-left: 0; }
-        .indent-2 { margin-left: 30px; }
-        .tree-icon { margin-right: 10px; color: #79c0ff; }
-        .page-indicator { color: #8b949e; font-family: 'JetBrains Mono'; }
-        .nav-buttons { display: flex; gap: 15px; }
-        .nav-btn { background-color: #21262d; border: 1px solid #30363d; color: #c9d1d9; padding: 10px 20px; border-radius: 6px; }
-
-        /* 페이지 번호 */
-        .page-number {
-            position: absolute;
-            bottom: 20px;
-            right: 30px;
-            font-size: 1rem;
-            color: #8b949e;
-            font-family: 'JetBrains Mono', monospace;
-            z-index: 100;
-        }
-
-        /* Slide-specific link styles */
-        .slide--intro a {
-            color: #58a6ff;
-            text-decoration: none;
-            border-bottom: 2px solid rgba(88,166,255,0.12);
-            padding-bottom: 2px;
-            transition: color 150ms ease, border-color 150ms ease;
-        }
-        .slide--intro a:hover { color: #9ad1ff; border-color: rgba(154,209,255,0.35); }
-        .slide--intro .card a { font-weight: 600; }
-        .slider-container { position: relative; }
-        .nav-bar { height: 80px; border-top: 1px solid #30363d; background-color: #161b22; display: flex; justify-content: space-between; align-items: center; padding: 0 40px; z-index: 10; }
-    </style>
+{STYLES}
 </head>
 <body>
 
 '''
-    
-    html_footer = '''
+
+# {SLIDE_COUNT} 는 슬라이드를 모두 쓴 뒤에 채워짐
+HTML_FOOTER = '''
 <script>
 console.log('PDF 출력용 강의 자료가 로드되었습니다.');
-console.log('총 슬라이드 수: ''' + str(len(all_slides)) + '''');
+console.log('총 슬라이드 수: {SLIDE_COUNT}');
 console.log('브라우저의 인쇄 기능(Ctrl+P 또는 Cmd+P)을 사용하여 PDF로 저장하세요.');
 console.log('인쇄 설정:');
 console.log('  - 용지: A4 가로(Landscape)');
 console.log('  - 여백: 없음');  
 console.log('  - 배경 그래픽: 포함');
 console.log('  - 페이지당 하나의 슬라이드가 출력됩니다.');
+
+// 지연 로딩 이미지가 인쇄에서 빠지지 않도록 인쇄 직전에 모두 불러옴
+window.addEventListener('beforeprint', function () {
+    document.querySelectorAll('img[loading="lazy"]').forEach(function (img) { img.loading = 'eager'; });
+});
 </script>
 
 </body>
 </html>
 '''
+
+def load_pdf_styles(base_dir):
+    """PDF 출력용 스타일시트를 <style> 블록으로 (템플릿의 {STYLES} 자리에 들어감)"""
+    css = (base_dir / PDF_STYLESHEET).read_text(encoding='utf-8')
+    return '    <style>\n' + textwrap.indent(css, ' ' * 8) + '    </style>'
+
+def build(base_dir, lecture_files, jobs=1, optimize_images=False, subset_fonts=False, purge_css=False,
+          virtual_slides=False, profile_path=None, use_mmap=False, highlight_code=False,
+          search_index=False, fragments=False, fingerprint=False, minify=False, pdf=False, offline=False,
+          hoist_styles=False, shared_cache=None):
+    """강의 파일들에서 슬라이드를 모아 LectureForPdf.html 을 생성하고 (출력 경로, 슬라이드 수) 를 돌려줌
+
+    profile_path 를 주면 단계별 시간을 Chrome trace 파일로 쓰고 요약 표를 출력한다.
+    pdf 를 켜면 브라우저 인쇄 없이 LectureForPdf.pdf 도 바로 쓴다 (reportlab 필요).
+    offline 을 켜면 index.html 과 강의 페이지를 미리 받아 두는 서비스 워커(sw.js)와 목록을 쓴다.
+    hoist_styles 를 켜면 인라인 style 속성을 생성한 클래스로 바꾸고 dist/styles/ 에 클래스 규칙을 모아 쓴다.
+    shared_cache 는 여러 강의를 함께 빌드할 때 이미지/폰트/압축 결과를 나눠 쓰는 캐시 (batch_build.py)
+    """
+    profiler = NULL_PROFILER
+    if profile_path is not None:
+        profiler = BuildProfiler()
+        if jobs > 1:
+            print("  (--profile: 단계별 시간을 재기 위해 직렬로 추출)")
+            jobs = 1
     
-    # 파일 저장
+    cache_dir = base_dir / CACHE_DIR_NAME
     output_path = base_dir / 'LectureForPdf.html'
     
-    print(f"\n파일 생성 중: {output_path}")
+    build_dir = base_dir / BUILD_DIR_NAME
+    
+    image_sizes = {}
+    indexer = SearchIndexer() if search_index else None
+    fragment_dir = build_dir / FRAGMENT_DIR_NAME
+    fragment_writer = FragmentWriter(fragment_dir) if fragments else None
+    highlighter = None
+    if highlight_code:
+        highlighter = CodeHighlighter(cache_dir / HIGHLIGHT_CACHE_NAME)
+    optimizer = None
+    if optimize_images:
+        optimizer = ImageOptimizer(base_dir, build_dir / IMAGE_DIR_NAME, shared_cache)
+    fingerprinter = None
+    if fingerprint:
+        fingerprinter = AssetFingerprinter(build_dir / ASSET_DIR_NAME)
+    
+    # PDF 배치 프로세스는 빌드가 중간에 실패해도 닫히도록 빌드가 끝날 때까지 with 로 가짐
+    with (PdfExporter(base_dir, base_dir / PDF_STYLESHEET, jobs) if pdf else nullcontext()) as exporter:
+        # 쓰이는 선택자는 슬라이드를 다 본 뒤에야 알 수 있으므로, 정리한 스타일은 별도 파일로 링크
+        used_selectors = None
+        if purge_css:
+            used_selectors = UsedSelectors()
+            styles_href = f'{BUILD_DIR_NAME}/styles/{PDF_STYLESHEET_MIN_NAME}'
+            html_header = HTML_HEADER.replace('{STYLES}', f'    <link rel="stylesheet" href="{styles_href}">')
+            used_selectors.collect(HTML_FOOTER)
+        else:
+            html_header = HTML_HEADER.replace('{STYLES}', load_pdf_styles(base_dir))
+        
+        # 옮긴 스타일의 규칙은 모든 페이지를 훑은 뒤에 쓰므로, 정리한 스타일시트처럼 별도 파일로 링크
+        hoister = None
+        if hoist_styles:
+            hoister = StyleHoister(css_path.read_text(encoding='utf-8') for css_path in sorted((base_dir / 'styles').glob('*.css')))
+            html_header = link_stylesheet(html_header, f'{BUILD_DIR_NAME}/styles/{HOISTED_STYLESHEET_NAME}')
+        
+        # 폰트는 모든 슬라이드의 글자를 모은 뒤 마지막에 한 번 서브셋함 (링크 주소는 미리 정해져 있음)
+        subsetter = None
+        if subset_fonts:
+            subsetter = FontSubsetter(base_dir / FONT_DIR_NAME, shared_cache)
+            html_header = rewrite_font_links(html_header, f'{BUILD_DIR_NAME}/{FONT_DIR_NAME}/{FONT_CSS_NAME}')
+            subsetter.collect(html_header)
+        
+        print("슬라이드 추출 시작...")
+        if jobs > 1:
+            print(f"  (프로세스 {jobs}개로 병렬 추출)")
+        print(f"파일 생성 중: {output_path}\n")
+        
+        file_paths = [base_dir / filename for filename in lecture_files]
+        page_count = 0
+        
+        # 덱 하나를 읽어 번호를 매기는 즉시 파일에 쓴다 - 전체 슬라이드를 모아 두지 않음
+        # 임시 파일에 쓰고 마지막에 교체해서, 중간에 실패해도 기존 결과물이 깨지지 않게 함
+        tmp_path = output_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            with profiler.phase('write'):
+                f.write(html_header)
+                f.write('\n\n')
+            
+            for filename, (slides, from_cache) in zip(lecture_files, iter_decks(file_paths, cache_dir, jobs, profiler, use_mmap)):
+                output_start = time.perf_counter_ns()
+                print(f"처리 중: {filename}")
+                
+                if from_cache:
+                    print(f"  - {len(slides)}개 슬라이드 (캐시)")
+                else:
+                    print(f"  - {len(slides)}개 슬라이드 추출")
+                
+                if indexer is not None:
+                    indexer.add_deck(filename, slides)
+                
+                # 페이지 번호는 캐시와 상관없이 매번 전체 순서대로 다시 매김
+                numbered = profiler.iter_timed('renumber', number_slides(slides, page_count + 1), deck=filename)
+                for page_number, (model, slide) in enumerate(zip(slides, numbered), page_count + 1):
+                    with profiler.phase('emit', deck=filename, slide=page_number - page_count - 1):
+                        # 각 단계는 추출할 때 만든 Slide 필드(코드 블록, 요소, 자산 참조)를 보고
+                        # 해당하는 것이 있는 슬라이드에만 적용함
+                        # 코드 블록 위치는 번호만 넣은 html 기준이므로 강조를 가장 먼저 함
+                        if highlighter is not None and model.code_blocks:
+                            slide = highlighter.highlight_blocks(slide, model.code_blocks)
+                        has_images = model.has_tag('img')
+                        if has_images:
+                            # 이미지 원본 크기를 넣어 레이아웃이 밀리지 않게 하고, 첫 화면 밖 슬라이드는 지연 로딩
+                            lazy_from = None if page_number <= EAGER_SLIDES else 0
+                            slide = annotate_images(slide, base_dir, image_sizes, lazy_from)
+                        # PDF 에는 변환본/해시 이름으로 바꾸기 전의 원본 이미지를 넣음
+                        pdf_slide = slide
+                        if hoister is not None and model.has_inline_styles():
+                            slide = hoister.rewrite(slide, filename)
+                        if optimizer is not None and has_images:
+                            slide = optimizer.rewrite(slide, f'{BUILD_DIR_NAME}/{IMAGE_DIR_NAME}/')
+                        if fingerprinter is not None and model.assets:
+                            # 조각 파일 이름이 내용 해시이므로 조각을 쓰기 전에 참조를 바꿔 둬야 함
+                            slide = fingerprinter.rewrite(slide, [base_dir], f'{BUILD_DIR_NAME}/{ASSET_DIR_NAME}/', filename)
+                        if subsetter is not None:
+                            subsetter.collect(slide)
+                        if used_selectors is not None:
+                            used_selectors.collect(slide)
+                    if exporter is not None:
+                        with profiler.phase('pdf', deck=filename, slide=page_number - page_count - 1):
+                            exporter.add(pdf_slide)
+                    with profiler.phase('write', deck=filename, slide=page_number - page_count - 1):
+                        f.write(slide)
+                        f.write('\n\n')
+                        if fragment_writer is not None:
+                            # 페이지 번호는 목록에만 적음 (앞 슬라이드가 바뀌어도 조각 이름이 그대로 유지되도록)
+                            fragment_html = slide.replace(page_number_html(page_number), '', 1)
+                            fragment_writer.add(filename, page_number - page_count, page_number, fragment_html)
+                page_count += len(slides)
+                if profiler.enabled:
+                    profiler.add('output', output_start, time.perf_counter_ns(), deck=filename)
+            
+            # 슬라이드 수는 다 쓰고 난 뒤에야 알 수 있으므로 꼬리말에서 채움
+            with profiler.phase('write'):
+                f.write(HTML_FOOTER.replace('{SLIDE_COUNT}', str(page_count)))
+        os.replace(tmp_path, output_path)
+        
+        print(f"\n총 {page_count}개의 슬라이드를 추출했습니다.")
+        
+        # 배포용 단계가 하나라도 켜져 있으면 강의별 페이지도 같은 처리를 거쳐 dist/ 에 씀
+        transforms = []
+        if highlighter is not None:
+            transforms.append(highlighter.highlight_page)
+        if optimizer is not None:
+            transforms.append(partial(optimizer.rewrite, prefix=f'{IMAGE_DIR_NAME}/'))
+        if subsetter is not None:
+            transforms.append(partial(rewrite_font_links, css_href=f'{FONT_DIR_NAME}/{FONT_CSS_NAME}'))
+            transforms.append(subsetter.collect)
+        if purge_css:
+            transforms.append(partial(purge_page_styles, base_dir=base_dir))
+        if virtual_slides:
+            # 스크립트를 바꾸기 전에 CSS 정리가 끝나야 함 (스크립트가 붙이는 'active' 클래스를 봐야 하므로)
+            transforms.append(virtualize_deck_page)
+            (build_dir / VIEWER_SCRIPT).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(base_dir / VIEWER_SCRIPT, build_dir / VIEWER_SCRIPT)
+        deck_pages = bool(transforms) or fingerprinter is not None or hoister is not None
+        if deck_pages:
+            transforms.insert(0, partial(annotate_deck_page, base_dir=base_dir, image_sizes=image_sizes))
+            if offline:
+                # 서비스 워커는 base_dir 맨 위에 있으므로 dist/ 페이지에서도 등록할 수 있음
+                transforms.append(partial(register_service_worker, href=f'../{SERVICE_WORKER_NAME}'))
+            write_deck_pages(base_dir, lecture_files, transforms)
+            if hoister is not None:
+                for filename in lecture_files:
+                    hoister.rewrite_page(build_dir / filename, filename, f'styles/{HOISTED_STYLESHEET_NAME}')
+            print(f"강의별 페이지: {build_dir}")
+        
+        if used_selectors is not None:
+            css = (base_dir / PDF_STYLESHEET).read_text(encoding='utf-8')
+            purged = purge_stylesheet(css, used_selectors)
+            styles_path = build_dir / 'styles' / PDF_STYLESHEET_MIN_NAME
+            styles_path.parent.mkdir(parents=True, exist_ok=True)
+            styles_path.write_text(purged, encoding='utf-8')
+            print(f"\nCSS 정리: {PDF_STYLESHEET} {len(css.encode()) // 1024} KB → {styles_path.name} {len(purged.encode()) // 1024} KB")
+        
+        if hoister is not None:
+            # 지문/최소화 단계가 이 파일도 다루도록 그 전에 씀
+            hoisted_path = build_dir / 'styles' / HOISTED_STYLESHEET_NAME
+            hoisted_bytes = hoister.write(hoisted_path)
+            print("\n인라인 스타일 옮기기")
+            report_hoist(hoister, hoisted_path, hoisted_bytes)
+        
+        if fragment_writer is not None:
+            removed = fragment_writer.finish()
+            manifest_href = f'{BUILD_DIR_NAME}/{FRAGMENT_DIR_NAME}/{FRAGMENT_MANIFEST_NAME}'
+            (base_dir / FRAGMENT_VIEWER_NAME).write_text(viewer_html(html_header, manifest_href), encoding='utf-8')
+            print("\n슬라이드 조각")
+            report_fragments(fragment_writer, removed, fragment_dir)
+        
+        if indexer is not None:
+            search_dir = base_dir / SEARCH_DIR_NAME
+            shard_count, total_bytes = indexer.write(search_dir)
+            print("\n검색 색인")
+            report_search(indexer, shard_count, total_bytes, search_dir)
+        
+        if highlighter is not None:
+            highlighter.save()
+            print("\n코드 강조")
+            report_highlight(highlighter)
+        
+        if optimizer is not None:
+            print("\n이미지 최적화")
+            report_images(optimizer)
+        
+        if subsetter is not None:
+            # 강의별 페이지가 쓰는 공용 스타일시트의 아이콘(content: "\f...")도 포함
+            for css_path in sorted((base_dir / 'styles').glob('*.css')):
+                subsetter.collect(css_path.read_text(encoding='utf-8'))
+            print("\n폰트 서브셋")
+            css_path, results = subsetter.write(build_dir / FONT_DIR_NAME)
+            report_fonts(css_path, results, subsetter)
+        
+        compressor = None
+        if minify:
+            # 지문을 붙이기 전에 최소화해야 파일 이름의 해시가 실제 내용과 맞음 (지문 붙인 파일은 다시 건드리지 않음)
+            compressor = OutputCompressor(cache_dir / COMPRESS_CACHE_NAME, shared_cache)
+            if build_dir.is_dir():
+                compressor.minify_tree(build_dir, exclude=[build_dir / ASSET_DIR_NAME])
+        
+        if fingerprinter is not None:
+            # 스타일시트/폰트 CSS 는 위에서 다 쓴 뒤라야 해시를 낼 수 있으므로 생성된 페이지를 마지막에 한 번 더 훑음
+            # (슬라이드 안의 참조는 추출할 때 이미 바뀌어 있어서 건너뜀)
+            prefix = f'{BUILD_DIR_NAME}/{ASSET_DIR_NAME}/'
+            fingerprinter.rewrite_file(output_path, [base_dir], prefix)
+            if fragment_writer is not None:
+                fingerprinter.rewrite_file(base_dir / FRAGMENT_VIEWER_NAME, [base_dir], prefix)
+            for filename in lecture_files:
+                fingerprinter.rewrite_file(build_dir / filename, [build_dir, base_dir], f'{ASSET_DIR_NAME}/')
+            removed = fingerprinter.prune(keep_suffixes=COMPRESSED_SUFFIXES)
+            print("\n자산 지문")
+            report_assets(fingerprinter, removed)
+        
+        if compressor is not None:
+            # 참조를 모두 바꾼 최종 결과를 압축 (저장소에 있는 LectureForPdf.html 은 .min.html 로 따로 최소화)
+            compressor.add(output_path, output_path.with_suffix('.min.html'))
+            if fragment_writer is not None:
+                compressor.add(base_dir / FRAGMENT_VIEWER_NAME)
+            if build_dir.is_dir():
+                compressor.add_tree(build_dir, minified=True)
+            if indexer is not None:
+                compressor.add_tree(base_dir / SEARCH_DIR_NAME)
+            compressor.save()
+            print("\n최소화/압축")
+            report_compress(compressor)
+        
+        if offline:
+            # 최소화까지 끝난 최종 파일의 해시를 적어야 서비스 워커가 받은 내용과 맞음
+            precache = PrecacheManifest(base_dir)
+            for page_path in [base_dir / 'index.html', *(base_dir / filename for filename in lecture_files)]:
+                precache.add_page(page_path)
+            if deck_pages:
+                for filename in lecture_files:
+                    precache.add_page(build_dir / filename)
+            if indexer is not None:
+                precache.add_tree(base_dir / SEARCH_DIR_NAME, '.json')
+            manifest, changed = precache.write(base_dir / SERVICE_WORKER_TEMPLATE)
+            print("\n오프라인 캐시")
+            report_offline(manifest, changed, precache.missing)
+        
+        if exporter is not None:
+            pdf_path = base_dir / PDF_NAME
+            print("\nPDF")
+            with profiler.phase('pdf'):
+                pdf_pages = exporter.write(pdf_path)
+            report_pdf(exporter, pdf_path, pdf_pages)
+        
+        if profiler.enabled:
+            profiler.write_trace(profile_path)
+            print(f"\n단계별 시간 (trace: {profile_path})")
+            print(profiler.summary())
+        
+        return output_path, page_count
+
+def check_budget(base_dir, lecture_files, output_path, build_options, budget_path):
+    """빌드한 페이지를 예산 파일과 비교해 출력하고 예산을 넘은 항목 수를 돌려줌"""
+    # 배포용 단계가 켜져 있으면 dist/ 의 강의별 페이지를, 아니면 저장소의 강의 파일을 잼
+    deck_dir = base_dir / BUILD_DIR_NAME if any(build_options.get(name) for name in DECK_STAGES) else base_dir
+    print("\n성능 예산")
+    over_count = check_pages([deck_dir / filename for filename in lecture_files] + [output_path], budget_path)
+    report_budget(over_count)
+    return over_count
+
+def write_deck_pages(base_dir, lecture_files, transforms):
+    """강의 페이지마다 transforms 를 차례로 적용해 dist/ 에 쓰고, 페이지가 참조하는 스타일시트도 함께 복사"""
+    build_dir = base_dir / BUILD_DIR_NAME
+    build_dir.mkdir(exist_ok=True)
+    
+    for filename in lecture_files:
+        html = (base_dir / filename).read_text(encoding='utf-8')
+        for transform in transforms:
+            html = transform(html)
+        (build_dir / filename).write_text(html, encoding='utf-8')
+    
+    styles_dir = base_dir / 'styles'
+    if styles_dir.is_dir():
+        shutil.copytree(styles_dir, build_dir / 'styles', dirs_exist_ok=True)
+    
+    return build_dir
+
+def annotate_deck_page(html, base_dir, image_sizes):
+    """강의 페이지 전체에 이미지 크기를 넣고, 첫 슬라이드 뒤의 이미지는 지연 로딩으로 바꿈"""
+    first_slide = next(iter_slide_spans(html), None)
+    lazy_from = first_slide[1] if first_slide is not None else None
+    return annotate_images(html, base_dir, image_sizes, lazy_from)
+
+def virtualize_deck_page(html):
+    """첫 슬라이드만 DOM 에 두고 나머지는 <template> 으로 감싼 뒤, 슬라이드 이동 스크립트를 공용 뷰어로 바꿈
+
+    이동 스크립트를 알아볼 수 없는 페이지는 그대로 둔다.
+    """
+    html, script_count = SLIDE_NAV_SCRIPT_RE.subn('', html)
+    if script_count == 0:
+        return html
+    
+    parts = []
+    last_pos = 0
+    for index, (start_pos, end_pos, missing_closes) in enumerate(iter_slide_spans(html)):
+        if index == 0:
+            continue
+        parts.append(html[last_pos:start_pos])
+        parts.append('<template class="slide-template">')
+        parts.append(html[start_pos:end_pos] + '</div>' * missing_closes)
+        parts.append('</template>')
+        last_pos = end_pos
+    parts.append(html[last_pos:])
+    html = ''.join(parts)
+    
+    viewer = f'<script src="{VIEWER_SCRIPT.as_posix()}" defer></script>\n'
+    pos = html.rfind('</body>')
+    if pos == -1:
+        return html + viewer
+    return html[:pos] + viewer + html[pos:]
+
+class ReloadNotifier:
+    """빌드가 끝날 때마다 버전을 올려서, 대기 중인 브라우저 연결들을 깨움"""
+    
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+    
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+    
+    def wait(self, seen_version, timeout):
+        """버전이 seen_version 과 달라지거나 timeout 이 지나면 현재 버전을 돌려줌"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """정적 파일을 내보내면서 HTML 에 새로고침 스크립트를 끼워 넣는 핸들러"""
+    
+    notifier = None
+    
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == RELOAD_PATH:
+            self.send_reload_events()
+        elif path == f'/{SERVICE_WORKER_NAME}':
+            # 예전 --offline 빌드의 sw.js 가 남아 있어도 등록되지 않게 함 (index.html 은 늘 등록을 시도함)
+            # 캐시에서 바로 돌려주는 서비스 워커가 있으면 다시 빌드한 페이지가 보이지 않음
+            self.send_error(404)
+        elif path.endswith('.html') or path.endswith('/'):
+            self.send_html_with_reload(path)
+        else:
+            super().do_GET()
+    
+    def send_reload_events(self):
+        # Server-Sent Events: 빌드가 끝나면 'reload' 를 보내고, 그 사이엔 연결 유지용 주석을 보냄
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        seen_version = self.notifier.version
+        try:
+            while True:
+                version = self.notifier.wait(seen_version, timeout=15)
+                if version != seen_version:
+                    seen_version = version
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def send_html_with_reload(self, path):
+        file_path = Path(self.translate_path(path))
+        if file_path.is_dir():
+            file_path = file_path / 'index.html'
+        if not file_path.is_file():
+            self.send_error(404)
+            return
+        
+        html = file_path.read_text(encoding='utf-8')
+        pos = html.rfind('</body>')
+        if pos == -1:
+            pos = len(html)
+        body = (html[:pos] + RELOAD_SCRIPT + html[pos:]).encode('utf-8')
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # 새로고침 연결 때문에 로그가 너무 많아지므로 출력하지 않음
+        pass
+
+def collect_watched_files(base_dir, lecture_files):
+    """감시 대상 파일 목록: 강의 파일, styles/ 의 스타일시트, 강의에서 참조하는 로컬 이미지"""
+    watched = [base_dir / filename for filename in lecture_files]
+    watched.extend(sorted((base_dir / 'styles').glob('*.css')))
+    
+    assets = set()
+    for path in watched[:len(lecture_files)]:
+        try:
+            content = path.read_text(encoding='utf-8')
+        except OSError:
+            continue
+        for match in IMAGE_REF_RE.finditer(content):
+            assets.add(match.group(1))
+    watched.extend(base_dir / asset for asset in sorted(assets))
+    return watched
+
+def snapshot_files(paths):
+    """파일별 (수정 시각, 크기). 없는 파일은 None"""
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[path] = None
+    return snapshot
+
+def watch(base_dir, lecture_files, port=8000, interval=0.5, debounce=0.3, budget_path=None, **build_options):
+    """파일이 바뀌면 다시 빌드하고, 로컬 서버로 열어 둔 브라우저 탭을 새로고침
+
+    build_options 는 그대로 build() 에 넘김
+    budget_path 를 주면 빌드할 때마다 예산과 비교해 출력한다 (넘어도 감시는 계속함)
+    offline 은 끔 - 서버가 HTML 에 새로고침 스크립트를 넣어 내보내므로 미리 받을 목록의 해시와 맞지 않음
+    """
+    if build_options.get('offline'):
+        print("  (--watch: 개발 서버는 HTML 을 바꿔 내보내므로 --offline 서비스 워커는 쓰지 않음)")
+        build_options['offline'] = False
+    notifier = ReloadNotifier()
+    handler = partial(LiveReloadHandler, directory=str(base_dir))
+    LiveReloadHandler.notifier = notifier
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    output_path, _ = build(base_dir, lecture_files, **build_options)
+    if budget_path is not None:
+        check_budget(base_dir, lecture_files, output_path, build_options, budget_path)
+    watched = collect_watched_files(base_dir, lecture_files)
+    snapshot = snapshot_files(watched)
+    
+    print(f"\n👀 변경 감시 중 ({len(watched)}개 파일) - 종료: Ctrl+C")
+    print(f"🌐 http://127.0.0.1:{port}/LectureForPdf.html")
+    
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_files(watched)
+            if current == snapshot:
+                continue
+            
+            # 저장이 여러 번에 나눠 일어나는 경우가 있어서, 잠잠해질 때까지 기다린 뒤 빌드
+            while True:
+                time.sleep(debounce)
+                settled = snapshot_files(watched)
+                if settled == current:
+                    break
+                current = settled
+            
+            changed = [path for path in watched if current[path] != snapshot[path]]
+            print(f"\n변경 감지: {', '.join(path.name for path in changed)}")
+            
+            # 감시하는 파일은 모두 결과물에 들어가므로 무엇이 바뀌든 다시 빌드 - 바뀌지 않은 덱은 캐시에서 읽힘
+            # (LectureForPdf.html 은 lecture-pdf.css 를 안에 넣고, --purge-css 페이지도 스타일시트로 만들어지며,
+            #  이미지가 바뀌면 넣어 둔 width/height 와 변환본도 다시 만들어야 함)
+            if changed:
+                try:
+                    build(base_dir, lecture_files, **build_options)
+                except Exception as e:
+                    print(f"❌ 빌드 실패: {e}")
+                    snapshot = current
+                    continue
+                if budget_path is not None:
+                    check_budget(base_dir, lecture_files, output_path, build_options, budget_path)
+                watched = collect_watched_files(base_dir, lecture_files)
+                current = snapshot_files(watched)
+            
+            snapshot = current
+            notifier.notify()
+    except KeyboardInterrupt:
+        print("\n감시를 종료합니다.")
+    finally:
+        server.shutdown()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='강의 HTML 들을 하나로 합쳐 PDF 출력용 HTML 생성')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='슬라이드 추출에 쓸 프로세스 수 (0 이면 CPU 코어 수, 기본값 1)')
+    parser.add_argument('--watch', action='store_true',
+                        help='파일 변경을 감시하며 다시 빌드하고 로컬 서버에서 자동 새로고침')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='--watch/--serve 에서 사용할 로컬 서버 포트 (기본값 8000)')
+    parser.add_argument('--optimize-images', action='store_true',
+                        help='이미지를 표시 크기로 줄이고 WebP/AVIF 변환본을 만들어 <picture> 로 바꿈 (Pillow 필요)')
+    parser.add_argument('--subset-fonts', action='store_true',
+                        help=f'{FONT_DIR_NAME}/ 의 폰트를 쓰인 글자만 남겨 WOFF2 로 만들고 CDN 링크를 대체 (fontTools 필요)')
+    parser.add_argument('--purge-css', action='store_true',
+                        help='슬라이드에 쓰이지 않는 CSS 규칙을 지우고 최소화한 스타일시트로 바꿈')
+    parser.add_argument('--virtual-slides', action='store_true',
+                        help='강의별 페이지에서 현재 슬라이드 주변만 DOM 에 두는 공용 뷰어를 사용')
+    parser.add_argument('--highlight-code', action='store_true',
+                        help='<pre><code> 의 GDScript/C# 코드를 빌드할 때 미리 강조 (블록 해시로 캐시)')
+    parser.add_argument('--search-index', action='store_true',
+                        help=f'모든 강의의 슬라이드 본문/코드로 검색 색인을 만들어 {SEARCH_DIR_NAME}/ 에 씀 (index.html 검색창용)')
+    parser.add_argument('--fragments', action='store_true',
+                        help=f'슬라이드마다 내용 해시 이름의 조각 파일과 목록을 {BUILD_DIR_NAME}/{FRAGMENT_DIR_NAME} 에 쓰고 {FRAGMENT_VIEWER_NAME} 생성')
+    parser.add_argument('--serve', action='store_true',
+                        help='--fragments 로 빌드한 뒤 ETag/immutable 캐시와 미리 받기 힌트를 주는 로컬 서버 실행 (--port)')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help=f'생성된 페이지가 참조하는 로컬 파일을 내용 해시 이름으로 {BUILD_DIR_NAME}/{ASSET_DIR_NAME} 에 복사하고 참조를 바꿈 (없는 파일도 알려 줌)')
+    parser.add_argument('--minify', action='store_true',
+                        help='생성된 HTML/CSS 를 최소화하고 (<pre> 는 그대로) .gz/.br 압축본을 옆에 씀 (내용이 같으면 다시 압축하지 않음)')
+    parser.add_argument('--offline', action='store_true',
+                        help=f'index.html, 강의 페이지, 스타일시트, 이미지를 내용 해시와 함께 목록에 적고 미리 받아 두는 서비스 워커({SERVICE_WORKER_NAME})를 씀 (다시 빌드하면 바뀐 파일만 새로 받음)')
+    parser.add_argument('--hoist-styles', action='store_true',
+                        help=f'슬라이드와 강의 페이지의 인라인 style 속성을 짧은 클래스로 바꾸고 규칙을 dist/styles/{HOISTED_STYLESHEET_NAME} 에 모음 (덱별로 줄어든 바이트와 스타일시트 크기를 친 순변화 출력)')
+    parser.add_argument('--pdf', action='store_true',
+                        help=f'브라우저 인쇄 없이 A4 가로 {PDF_NAME} 를 바로 씀 ({FONT_DIR_NAME}/ 의 폰트를 서브셋으로 넣음, -j 로 슬라이드 배치를 병렬로, reportlab 필요)')
+    parser.add_argument('--mmap', action='store_true',
+                        help='강의 파일을 메모리 매핑해서 바이트 단위로 슬라이드 경계를 찾고 슬라이드 부분만 디코딩')
+    parser.add_argument('--budget', nargs='?', const=BUDGET_FILE_NAME, metavar='PATH',
+                        help=f'빌드한 뒤 강의별 페이지와 LectureForPdf.html 을 예산 파일과 비교해서 넘으면 종료 코드 1 (기본 파일: {BUDGET_FILE_NAME}, 이미지 예산은 --optimize-images 로 줄인 크기 기준)')
+    parser.add_argument('--manifest', type=Path, metavar='PATH',
+                        help='강의 목록 JSON 의 강의들을 한 번에 빌드 (이미지/폰트/압축 결과는 강의끼리 공유, 다른 옵션은 모든 강의의 기본값)')
+    parser.add_argument('--course-jobs', type=int, default=DEFAULT_COURSE_JOBS,
+                        help=f'--manifest 에서 동시에 빌드할 강의 수 (기본값 {DEFAULT_COURSE_JOBS})')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_NAME, metavar='PATH',
+                        help=f'덱/슬라이드별 단계 시간을 Chrome trace JSON 으로 저장하고 요약 표 출력 (기본 파일: {PROFILE_NAME})')
+    args = parser.parse_args()
+    # 여러 강의 빌드는 강의마다 한 번씩 빌드하고 끝나므로 감시/서버 모드와 함께 쓸 수 없음
+    if args.manifest and (args.watch or args.serve):
+        parser.error('--manifest 는 --watch/--serve 와 함께 쓸 수 없습니다')
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def main():
+    args = parse_args()
+    
+    build_options = {
+        'jobs': args.jobs,
+        'optimize_images': args.optimize_images,
+        'subset_fonts': args.subset_fonts,
+        'purge_css': args.purge_css,
+        'virtual_slides': args.virtual_slides,
+        'use_mmap': args.mmap,
+        'highlight_code': args.highlight_code,
+        'search_index': args.search_index,
+        'fragments': args.fragments or args.serve,
+        'fingerprint': args.fingerprint,
+        'minify': args.minify,
+        'pdf': args.pdf,
+        'offline': args.offline,
+        'hoist_styles': args.hoist_styles,
+        'profile_path': BASE_DIR / args.profile if args.profile else None,
+    }
+    
+    if args.manifest:
+        del build_options['profile_path']
+        failed = build_courses(args.manifest, build_options, args.course_jobs, args.profile, args.budget)
+        if failed:
+            sys.exit(1)
+        return
+    
+    if args.watch:
+        watch(BASE_DIR, LECTURE_FILES, args.port, budget_path=BASE_DIR / args.budget if args.budget else None,
+              **build_options)
+        return
+    
+    output_path, page_count = build(BASE_DIR, LECTURE_FILES, **build_options)
+    
+    if args.budget:
+        if check_budget(BASE_DIR, LECTURE_FILES, output_path, build_options, BASE_DIR / args.budget):
+            sys.exit(1)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_header)
-        f.write('\n\n')
-        for slide in all_slides:
-            f.write(slide)
-            f.write('\n\n')
-        f.write(html_footer)
+    if args.serve:
+        serve_fragments(BASE_DIR, BASE_DIR / BUILD_DIR_NAME / FRAGMENT_DIR_NAME, args.port)
+        return
     
     print(f"✅ 파일이 성공적으로 생성되었습니다!")
-    print(f"📄 총 페이지 수: {len(all_slides)}")
+    print(f"📄 총 페이지 수: {page_count}")
     print(f"📂 파일 위치: {output_path}")
+    if args.pdf:
+        print(f"📕 PDF: {BASE_DIR / PDF_NAME}")
+        return
     print(f"\n사용 방법:")
     print(f"1. {output_path} 파일을 브라우저에서 엽니다.")
     print(f"2. Ctrl+P (또는 Cmd+P)로 인쇄 대화상자를 엽니다.")
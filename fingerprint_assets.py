@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import re
+from pathlib import Path
+
+# 지문(내용 해시)을 붙인 파일을 모아 두는 폴더 (dist/assets)
+ASSET_DIR_NAME = 'assets'
+
+# 파일 이름에 넣는 해시 길이
+HASH_LENGTH = 12
+
+# 생성된 HTML 안의 로컬 참조
+REF_ATTR_RE = re.compile(r'''(?P<attr>\b(?:src|href|srcset))\s*=\s*(?P<quote>["'])(?P<value>[^"']*)(?P=quote)''', re.IGNORECASE)
+CSS_URL_RE = re.compile(r'''url\(\s*(?P<quote>["']?)(?P<value>[^"')]+)(?P=quote)\s*\)''')
+
+# 이미 이름에 내용 해시가 들어 있는 빌드 결과 (이미지 변환본, 서브셋 폰트, 지문 붙인 파일)
+FINGERPRINTED_RE = re.compile(r'\.[0-9a-f]{12}\.')
+
+def is_local_ref(value):
+    """다른 서버, 페이지 안 이동, data: 주소, 다른 HTML 페이지 링크가 아닌 로컬 파일 참조인지"""
+    if not value or value.startswith(('#', '//', '/')) or ':' in value:
+        return False
+    path = re.split(r'[?#]', value, maxsplit=1)[0]
+    return bool(path) and not path.lower().endswith(('.html', '/'))
+
+def split_ref(value):
+    """'./a/b.png?v=1#x' -> ('a/b.png', '#x') - 쿼리는 해시가 대신하므로 버림"""
+    path, _, fragment = value.partition('#')
+    path = path.split('?', 1)[0]
+    while path.startswith('./'):
+        path = path[2:]
+    return path, f'#{fragment}' if fragment else ''
+
+class AssetFingerprinter:
+    """생성된 HTML 이 참조하는 로컬 파일을 '<이름>.<내용 해시>.<확장자>' 로 복사하고 참조를 바꾸는 객체
+
+    내용이 같은 파일은 하나만 복사하고, 찾을 수 없는 참조는 페이지별로 모아 report() 에서 알린다.
+    CSS 파일은 안의 url() 참조도 같은 방식으로 바꾼 뒤에 해시를 낸다.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.names = {}  # 원본 경로 -> 지문 붙인 이름
+        self.by_digest = {}  # 내용 해시 -> 지문 붙인 이름 (같은 내용은 한 파일)
+        self.duplicates = 0
+        self.missing = {}  # 참조 -> 그 참조가 있는 페이지 집합
+
+    def fingerprint(self, path):
+        """path 를 out_dir 에 복사하고 지문 붙인 이름을 돌려줌"""
+        path = path.resolve()
+        if path in self.names:
+            return self.names[path]
+
+        if path.suffix.lower() == '.css':
+            data = self.rewrite_css(path.read_text(encoding='utf-8'), path.parent, path.name).encode('utf-8')
+        else:
+            data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+        if digest in self.by_digest:
+            name = self.by_digest[digest]
+            self.duplicates += 1
+        else:
+            name = f'{path.stem}.{digest}{path.suffix}'
+            out_path = self.out_dir / name
+            if not out_path.is_file():
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = out_path.with_name(out_path.name + '.tmp')
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, out_path)
+            self.by_digest[digest] = name
+
+        self.names[path] = name
+        return name
+
+    def resolve(self, ref, search_dirs, page):
+        """참조를 search_dirs 에서 차례로 찾아 파일 경로를 돌려줌 (없으면 기록하고 None)"""
+        path, _ = split_ref(ref)
+        for directory in search_dirs:
+            candidate = directory / path
+            if candidate.is_file():
+                return candidate
+        self.missing.setdefault(ref, set()).add(page)
+        return None
+
+    def rewrite_ref(self, value, search_dirs, prefix, page):
+        if not is_local_ref(value) or value.startswith(prefix) or FINGERPRINTED_RE.search(value):
+            return value
+        path = self.resolve(value, search_dirs, page)
+        if path is None:
+            return value
+        return prefix + self.fingerprint(path) + split_ref(value)[1]
+
+    def rewrite(self, html, search_dirs, prefix, page):
+        """html 의 src/href/srcset 로컬 참조를 prefix + 지문 붙인 이름으로 바꿈
+
+        search_dirs: 참조를 찾을 폴더 목록 (페이지가 있는 폴더 먼저)
+        """
+        def replace(match):
+            value = match.group('value')
+            if match.group('attr').lower() == 'srcset':
+                candidates = []
+                for candidate in value.split(','):
+                    url, _, descriptor = candidate.strip().partition(' ')
+                    url = self.rewrite_ref(url, search_dirs, prefix, page)
+                    candidates.append(f'{url} {descriptor}'.strip())
+                new_value = ', '.join(candidates)
+            else:
+                new_value = self.rewrite_ref(value, search_dirs, prefix, page)
+            if new_value == value:
+                return match.group(0)
+            quote = match.group('quote')
+            return f'{match.group("attr")}={quote}{new_value}{quote}'
+
+        return REF_ATTR_RE.sub(replace, html)
+
+    def rewrite_css(self, css, css_dir, css_name):
+        """CSS 의 url() 참조를 out_dir 기준 경로로 바꿈 (지문 붙인 CSS 는 out_dir 로 옮겨지므로)"""
+        def replace(match):
+            value = match.group('value').strip()
+            if not is_local_ref(value):
+                return match.group(0)
+            path, fragment = split_ref(value)
+            target = css_dir / path
+            if not target.is_file():
+                self.missing.setdefault(value, set()).add(css_name)
+                return match.group(0)
+            if FINGERPRINTED_RE.search(target.name):
+                # 이미 해시가 붙은 빌드 결과는 그대로 두고 경로만 맞춤
+                new_value = Path(os.path.relpath(target, self.out_dir)).as_posix()
+            else:
+                new_value = self.fingerprint(target)
+            return f'url("{new_value}{fragment}")'
+
+        return CSS_URL_RE.sub(replace, css)
+
+    def rewrite_file(self, path, search_dirs, prefix):
+        """이미 생성된 HTML 파일의 참조를 바꿔서 다시 씀"""
+        html = path.read_text(encoding='utf-8')
+        rewritten = self.rewrite(html, search_dirs, prefix, path.name)
+        if rewritten != html:
+            path.write_text(rewritten, encoding='utf-8')
+
+    def prune(self, keep_suffixes=()):
+        """이번 빌드에서 쓰이지 않은 이전 지문 파일을 지우고 지운 수를 돌려줌
+
+        keep_suffixes: 쓰이는 파일 옆의 압축본(.gz/.br)처럼 함께 남길 파일의 확장자
+        """
+        if not self.out_dir.is_dir():
+            return 0
+        used = set(self.by_digest.values())
+        removed = 0
+        for path in self.out_dir.iterdir():
+            if path.suffix in keep_suffixes and path.stem in used:
+                continue
+            if path.is_file() and path.name not in used:
+                path.unlink()
+                removed += 1
+        return removed
+
+def report(fingerprinter, removed):
+    total = sum((fingerprinter.out_dir / name).stat().st_size for name in fingerprinter.by_digest.values())
+    print(f"  파일 {len(fingerprinter.by_digest)}개 ({total // 1024} KB) → {fingerprinter.out_dir}")
+    if fingerprinter.duplicates:
+        print(f"  내용이 같은 파일 {fingerprinter.duplicates}개는 하나로 합침")
+    if removed:
+        print(f"  쓰이지 않는 이전 파일 {removed}개 삭제")
+    for ref, pages in sorted(fingerprinter.missing.items()):
+        print(f"  ⚠️  없는 파일: {ref} ({', '.join(sorted(pages))})")
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import re
+
+# 토큰 규칙이나 출력 형식이 바뀌면 올려서 기존 캐시를 무효화
+HIGHLIGHTER_VERSION = 1
+
+# 캐시 파일 이름 (슬라이드 캐시 폴더 안에 둠)
+HIGHLIGHT_CACHE_NAME = 'highlight.json'
+
+# 강조한 <code> 에 붙이는 클래스와 토큰 색 (lecture.css 의 .kwd/.func/.str/.num/.cls 와 같은 색)
+SYNTAX_CLASS = 'syntax'
+HIGHLIGHT_CSS = '''code.syntax { color: #e6edf3; }
+.syntax .kwd { color: #ff7b72; }
+.syntax .func { color: #d2a8ff; }
+.syntax .str { color: #a5d6ff; }
+.syntax .num { color: #79c0ff; }
+.syntax .cls { color: #f0883e; }
+.syntax .comment { color: #8b949e; }
+'''
+
+# <pre><code>...</code></pre> (속성 없는 <pre>/<code> 외에 class="language-..." 도 허용)
+CODE_BLOCK_RE = re.compile(
+    r'(?P<open><pre\b[^>]*>\s*<code\b(?P<attrs>[^>]*)>)(?P<body>.*?)(?P<close></code>)',
+    re.DOTALL | re.IGNORECASE
+)
+CLASS_ATTR_RE = re.compile(r'''\bclass\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+
+# 손으로 넣어 둔 <span class="comment"> 는 그대로 두고 그 바깥만 토큰으로 나눔
+SPAN_RE = re.compile(r'<span\b(?P<attrs>[^>]*)>.*?</span>', re.DOTALL | re.IGNORECASE)
+KEEP_SPAN_CLASSES = {'comment'}
+
+# 노드 트리 그림은 코드가 아니므로 건너뜀
+TREE_CHARS_RE = re.compile('[├└│┌]')
+
+# GDScript 가 아닌 C# 코드로 보는 단서
+CSHARP_HINT_RE = re.compile(r'\b(?:using\s+[\w.]+\s*;|public|private|protected|namespace)\b|;[ \t]*$', re.MULTILINE)
+
+GDSCRIPT_KEYWORDS = {
+    'if', 'elif', 'else', 'for', 'while', 'match', 'break', 'continue', 'pass', 'return',
+    'class', 'class_name', 'extends', 'is', 'in', 'as', 'self', 'signal', 'func', 'static',
+    'const', 'enum', 'var', 'await', 'super', 'preload', 'true', 'false', 'null', 'and', 'or', 'not',
+    'void', 'def', 'True', 'False', 'None',
+}
+CSHARP_KEYWORDS = {
+    'abstract', 'as', 'async', 'await', 'base', 'bool', 'break', 'case', 'catch', 'char', 'class',
+    'const', 'continue', 'default', 'do', 'double', 'else', 'enum', 'event', 'false', 'finally', 'float',
+    'for', 'foreach', 'get', 'if', 'in', 'int', 'interface', 'internal', 'is', 'long', 'namespace', 'new',
+    'null', 'out', 'override', 'partial', 'private', 'protected', 'public', 'readonly', 'ref', 'return',
+    'sealed', 'set', 'static', 'string', 'struct', 'switch', 'this', 'throw', 'true', 'try', 'typeof',
+    'using', 'var', 'virtual', 'void', 'while',
+}
+
+# 코드 본문은 HTML 이스케이프된 상태 그대로 나눔 (&lt; 같은 엔티티는 한 덩어리로 건너뜀)
+GDSCRIPT_TOKEN_RE = re.compile(
+    r'(?P<entity>&(?:#\d+|#x[0-9a-fA-F]+|\w+);)'
+    r'|(?P<comment>#[^\n]*)'
+    r'|(?P<str>"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+    r'|(?P<annotation>@\w+)'
+    r'|(?P<num>\b\d+(?:\.\d+)?\b)'
+    r'|(?P<word>[A-Za-z_]\w*)(?P<call>(?=\s*\())?'
+)
+CSHARP_TOKEN_RE = re.compile(
+    r'(?P<entity>&(?:#\d+|#x[0-9a-fA-F]+|\w+);)'
+    r'|(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<str>@?"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+    r'|(?P<annotation>\[\w+\])'
+    r'|(?P<num>\b\d+(?:\.\d+)?[fFdDmM]?\b)'
+    r'|(?P<word>[A-Za-z_]\w*)(?P<call>(?=\s*\())?',
+    re.DOTALL
+)
+LANGUAGE_ALIASES = {'gdscript': 'gdscript', 'gd': 'gdscript', 'csharp': 'csharp', 'cs': 'csharp', 'c#': 'csharp'}
+LANGUAGES = {
+    'gdscript': (GDSCRIPT_TOKEN_RE, GDSCRIPT_KEYWORDS),
+    'csharp': (CSHARP_TOKEN_RE, CSHARP_KEYWORDS),
+}
+
+def detect_language(attrs, body):
+    """class="language-..." 가 있으면 그것을, 없으면 내용으로 GDScript/C# 를 고름"""
+    match = CLASS_ATTR_RE.search(attrs)
+    if match:
+        for cls in match.group(1).split():
+            name = LANGUAGE_ALIASES.get(cls.lower().removeprefix('language-'))
+            if name is not None:
+                return name
+    return 'csharp' if CSHARP_HINT_RE.search(body) else 'gdscript'
+
+def tokenize(text, language):
+    """이스케이프된 코드 조각을 토큰별 <span> 으로 감싼 문자열"""
+    token_re, keywords = LANGUAGES[language]
+
+    def replace(match):
+        kind = match.lastgroup if match.lastgroup != 'call' else 'word'
+        token = match.group(kind)
+        if kind == 'entity':
+            return token
+        if kind == 'word':
+            if token in keywords:
+                kind = 'kwd'
+            elif match.group('call') is not None:
+                kind = 'func'
+            elif token[0].isupper():
+                kind = 'cls'
+            else:
+                return token
+        elif kind == 'annotation':
+            kind = 'kwd'
+        return f'<span class="{kind}">{token}</span>'
+
+    return token_re.sub(replace, text)
+
+def highlight_body(body, language):
+    """손으로 넣은 comment span 은 남기고 나머지 부분만 토큰으로 강조"""
+    parts = []
+    last_pos = 0
+    for match in SPAN_RE.finditer(body):
+        parts.append(tokenize(body[last_pos:match.start()], language))
+        parts.append(match.group(0))
+        last_pos = match.end()
+    parts.append(tokenize(body[last_pos:], language))
+    return ''.join(parts)
+
+def is_plain_code(body):
+    """강조할 수 있는 코드 블록인지 (트리 그림이나 다른 span 으로 꾸민 블록은 건드리지 않음)"""
+    if TREE_CHARS_RE.search(body):
+        return False
+    for match in SPAN_RE.finditer(body):
+        class_match = CLASS_ATTR_RE.search(match.group('attrs'))
+        if class_match is None or not set(class_match.group(1).split()) <= KEEP_SPAN_CLASSES:
+            return False
+    return True
+
+class CodeHighlighter:
+    """<pre><code> 블록을 빌드할 때 미리 강조해 두는 객체 (브라우저에서 강조 스크립트가 필요 없음)
+
+    블록 내용 해시로 결과를 캐시해서, 다시 빌드할 때 바뀌지 않은 블록은 토큰으로 다시 나누지 않는다.
+    save() 를 부르면 이번 빌드에서 쓰인 블록만 캐시 파일에 남긴다.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.cache = {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == HIGHLIGHTER_VERSION:
+                self.cache = data['blocks']
+        except (OSError, ValueError):
+            pass
+        self.used = {}
+        self.tokenized = 0
+        self.reused = 0
+
+    def highlight_block(self, attrs, body):
+        language = detect_language(attrs, body)
+        key = hashlib.sha256(f'{language}\0{body}'.encode('utf-8')).hexdigest()[:16]
+        if key in self.used:
+            return self.used[key]
+        if key in self.cache:
+            self.reused += 1
+            result = self.cache[key]
+        else:
+            self.tokenized += 1
+            result = highlight_body(body, language)
+        self.used[key] = result
+        return result
+
+    def replace_block(self, open_tag, attrs, body, close_tag):
+        """코드 블록 하나를 강조한 html (open_tag 는 <code 의 속성 앞까지, 건드리지 않을 블록이면 None)"""
+        if not is_plain_code(body):
+            return None
+        class_match = CLASS_ATTR_RE.search(attrs)
+        if class_match is None:
+            new_attrs = f'{attrs} class="{SYNTAX_CLASS}"'
+        elif SYNTAX_CLASS in class_match.group(1).split():
+            return None  # 이미 강조한 블록
+        else:
+            new_attrs = (attrs[:class_match.start()] + f'class="{class_match.group(1)} {SYNTAX_CLASS}"'
+                         + attrs[class_match.end():])
+        return open_tag + new_attrs + '>' + self.highlight_block(attrs, body) + close_tag
+
+    def highlight(self, html):
+        """html 안의 코드 블록을 강조한 html"""
+        def replace(match):
+            replaced = self.replace_block(match.group('open')[:match.start('attrs') - match.start('open')],
+                                          match.group('attrs'), match.group('body'), match.group('close'))
+            return match.group(0) if replaced is None else replaced
+
+        return CODE_BLOCK_RE.sub(replace, html)
+
+    def highlight_blocks(self, html, blocks):
+        """highlight() 와 같지만 Slide.code_blocks 의 블록 위치를 써서 html 을 다시 훑지 않음"""
+        parts = []
+        last_pos = 0
+        for start, attrs_start, attrs_end, body_end in blocks:
+            end = body_end + len('</code>')
+            # 여는 태그의 속성 뒤에는 '>' 한 글자뿐
+            replaced = self.replace_block(html[start:attrs_start], html[attrs_start:attrs_end],
+                                          html[attrs_end + 1:body_end], html[body_end:end])
+            if replaced is not None:
+                parts.append(html[last_pos:start])
+                parts.append(replaced)
+                last_pos = end
+        if not parts:
+            return html
+        parts.append(html[last_pos:])
+        return ''.join(parts)
+
+    def highlight_page(self, html):
+        """강의별 페이지용: 코드를 강조하고, 강조한 블록이 있으면 토큰 색 스타일을 </head> 앞에 넣음"""
+        highlighted = self.highlight(html)
+        pos = highlighted.find('</head>')
+        if highlighted == html or pos == -1:
+            return highlighted
+        return highlighted[:pos] + f'    <style>\n{HIGHLIGHT_CSS}    </style>\n' + highlighted[pos:]
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': HIGHLIGHTER_VERSION, 'blocks': self.used}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+def report(highlighter):
+    print(f"  코드 블록 {len(highlighter.used)}개 강조 "
+          f"(새로 토큰화 {highlighter.tokenized}개, 캐시 사용 {highlighter.reused}개)")
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import html
+import re
+
+from purge_css import (ATTRIBUTE_RE, PSEUDO_RE, SELECTOR_CLASS_RE, SELECTOR_ID_RE, STYLE_BLOCK_RE,
+                       parse_css)
+
+# 옮긴 인라인 스타일을 모아 쓰는 스타일시트 (dist/styles/ 아래)
+HOISTED_STYLESHEET_NAME = 'inline-styles.css'
+
+# 생성하는 클래스 이름: 접두사 + 선언 해시 앞자리 (빌드마다 같은 이름이 나와야 캐시/지문이 유지됨)
+HOIST_CLASS_PREFIX = 'h'
+HOIST_HASH_LENGTH = 4
+
+# 시작 태그 (속성 값 안의 '>' 도 건너뜀) - 주석과 script/style/textarea 본문은 통째로 건너뜀
+START_TAG_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(?P<raw>script|style|textarea)\b[^>]*>.*?</(?P=raw)\s*>'
+    r'|<(?P<tag>[a-zA-Z][\w-]*)(?P<attrs>(?:\s+[^\s=>/]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+))?)*)\s*/?>',
+    re.DOTALL | re.IGNORECASE
+)
+STYLE_ATTR_RE = re.compile(r'''\s+style\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)')''', re.IGNORECASE)
+CLASS_ATTR_RE = re.compile(r'''(?<![\w-])class\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)')''', re.IGNORECASE)
+
+# 스타일시트로 옮기면 뜻이 바뀌는 값 - url() 은 기준 경로가 달라지고, 괄호/꺾쇠는 규칙을 깰 수 있음
+UNSAFE_VALUE_RE = re.compile(r'url\s*\(|[{}<>]|\\', re.IGNORECASE)
+
+DECLARATION_SPLIT_RE = re.compile(r';(?![^(]*\))')
+IMPORTANT_RE = re.compile(r'\s*!\s*important\s*$', re.IGNORECASE)
+CSS_PROPERTY_RE = re.compile(r'([\w-]+)\s*:')
+SELECTOR_COMBINATOR_RE = re.compile(r'\s*[\s>+~]\s*')
+SELECTOR_TAG_RE = re.compile(r'[a-zA-Z][\w-]*|\*')
+ID_ATTR_RE = re.compile(r'''(?<![\w-])id\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+
+def related(a, b):
+    """같은 속성이거나 한쪽이 다른 쪽의 단축 속성인지 (margin / margin-top, border / border-left-color)"""
+    return a == b or b.startswith(a + '-') or a.startswith(b + '-')
+
+def parse_style(value):
+    """style 속성 값을 (속성, 값) 목록으로 (옮길 수 없는 값이 있으면 None)"""
+    declarations = []
+    for part in DECLARATION_SPLIT_RE.split(html.unescape(value)):
+        if not part.strip():
+            continue
+        name, sep, text = part.partition(':')
+        name = name.strip().lower()
+        text = ' '.join(IMPORTANT_RE.sub('', text).split())
+        if not sep or not CSS_PROPERTY_RE.fullmatch(name + ':') or not text or UNSAFE_VALUE_RE.search(text):
+            return None
+        declarations.append((name, text))
+    return declarations
+
+def selector_target(selector):
+    """선택자의 마지막 단순 선택자가 요구하는 (태그, 클래스, id) - 조상 조건은 보지 않으므로 실제보다 넓게 맞음"""
+    last = SELECTOR_COMBINATOR_RE.split(ATTRIBUTE_RE.sub('', PSEUDO_RE.sub('', selector)).strip())[-1]
+    tag = SELECTOR_TAG_RE.match(last)
+    return (tag.group(0).lower() if tag and tag.group(0) != '*' else None,
+            frozenset(SELECTOR_CLASS_RE.findall(last)), frozenset(SELECTOR_ID_RE.findall(last)))
+
+def protected_properties(css):
+    """스타일시트에서 !important 로 적혔거나 @keyframes 가 움직이는 속성을 (대상, 속성) 집합으로
+
+    인라인 스타일은 !important 규칙에 지고 애니메이션에도 덮이는데, 옮긴 클래스는 !important 라서
+    이 규칙과 겹치는 스타일은 옮기면 결과가 달라진다. 애니메이션 속성은 모든 요소에 걸림(대상 None).
+    """
+    found = set()
+
+    def walk(rules):
+        for kind, prelude, body in rules:
+            if kind == 'group':
+                walk(body)
+            elif body is None:
+                continue
+            elif kind == 'at' and prelude.lower().startswith(('@keyframes', '@-webkit-keyframes')):
+                found.update((None, name.lower()) for name in CSS_PROPERTY_RE.findall(re.sub(r'[^{}]*\{', ';', body)))
+            elif kind == 'rule':
+                names = [part.partition(':')[0].strip().lower()
+                         for part in DECLARATION_SPLIT_RE.split(body) if ':' in part and IMPORTANT_RE.search(part)]
+                if names:
+                    targets = [selector_target(selector) for selector in prelude.split(',')]
+                    found.update((target, name) for target in targets for name in names)
+
+    walk(parse_css(css))
+    return found
+
+def may_match(target, tag, classes, id):
+    if target is None:
+        return True
+    target_tag, target_classes, target_ids = target
+    return ((target_tag is None or target_tag == tag) and target_classes <= classes
+            and (not target_ids or target_ids == {id}))
+
+class StyleHoister:
+    """인라인 style 속성을 생성한 클래스로 바꾸고, 클래스 규칙을 한 스타일시트로 모음
+
+    선언 하나마다 클래스 하나(margin-top:10px → .h1a2b)를 만들어 여러 요소가 나눠 쓴다.
+    인라인 스타일은 일반 규칙보다 우선하므로 생성한 규칙은 모두 !important 로 쓰고,
+    한 style 안에서 서로 겹치는 선언(margin 과 margin-top 등)은 적힌 순서가 중요하므로 통째로 클래스 하나로 만든다.
+    스타일시트의 !important 규칙이나 애니메이션과 겹치는 스타일, url() 을 쓰는 스타일은 그대로 둔다.
+    """
+
+    def __init__(self, stylesheets=()):
+        self.protected = set()
+        for css in stylesheets:
+            self.protected |= protected_properties(css)
+        self.rules = {}  # 선언 -> 클래스 이름
+        self.names = {}  # 클래스 이름 -> 선언
+        self.stats = {}  # (대상, 덱) -> [옮긴 속성 수, 줄어든 바이트]
+        self.kept = 0
+
+    def class_name(self, body):
+        name = self.rules.get(body)
+        if name is not None:
+            return name
+        digest = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        length = HOIST_HASH_LENGTH
+        while HOIST_CLASS_PREFIX + digest[:length] in self.names:
+            length += 1
+        name = HOIST_CLASS_PREFIX + digest[:length]
+        self.rules[body] = name
+        self.names[name] = body
+        return name
+
+    def classes_for(self, value, protected, tag, classes, id):
+        """style 값을 대신할 클래스 이름 목록 (옮기지 않을 스타일이면 None)"""
+        declarations = parse_style(value)
+        if declarations is None:
+            return None
+        for target, other in protected:
+            if (any(related(name, other) for name, _ in declarations)
+                    and may_match(target, tag, classes, id)):
+                return None
+        if not declarations:
+            return []
+        names = [name for name, _ in declarations]
+        if any(related(a, b) for i, a in enumerate(names) for b in names[i + 1:]):
+            return [self.class_name(';'.join(f'{name}:{text}!important' for name, text in declarations))]
+        return list(dict.fromkeys(self.class_name(f'{name}:{text}!important') for name, text in declarations))
+
+    def rewrite(self, page_html, deck, target='slides', protected=None):
+        """page_html 의 인라인 스타일을 클래스로 바꾼 html (target 은 보고서의 열: slides / pages)"""
+        protected = self.protected if protected is None else protected
+        stats = self.stats.setdefault((target, deck), [0, 0])
+
+        def replace(match):
+            attrs = match.group('attrs')
+            if not attrs or 'style' not in attrs.lower():
+                return match.group(0)
+            style_match = STYLE_ATTR_RE.search(attrs)
+            if style_match is None:
+                return match.group(0)
+            value = style_match.group('dq') if style_match.group('dq') is not None else style_match.group('sq')
+            attrs = attrs[:style_match.start()] + attrs[style_match.end():]
+            class_match = CLASS_ATTR_RE.search(attrs)
+            existing = ''
+            if class_match is not None:
+                existing = class_match.group('dq') if class_match.group('dq') is not None else class_match.group('sq')
+            id_match = ID_ATTR_RE.search(attrs)
+            classes = self.classes_for(value, protected, match.group('tag').lower(), set(existing.split()),
+                                       id_match.group(1) if id_match else None)
+            if classes is None:
+                self.kept += 1
+                return match.group(0)
+
+            if not classes:
+                pass  # 빈 style="" 은 지우기만 함
+            elif class_match is None:
+                attrs += f' class="{" ".join(classes)}"'
+            else:
+                quote = '"' if class_match.group('dq') is not None else "'"
+                merged = ' '.join([*existing.split(), *classes])
+                attrs = attrs[:class_match.start()] + f'class={quote}{merged}{quote}' + attrs[class_match.end():]
+            new_tag = match.group(0)[:match.start('attrs') - match.start()] + attrs + match.group(0)[match.end('attrs') - match.start():]
+            stats[0] += 1
+            stats[1] += len(match.group(0).encode('utf-8')) - len(new_tag.encode('utf-8'))
+            return new_tag
+
+        return START_TAG_RE.sub(lambda match: match.group(0) if match.group('tag') is None else replace(match), page_html)
+
+    def rewrite_page(self, path, deck, css_href):
+        """강의 페이지 파일의 인라인 스타일을 옮기고 </head> 앞에 생성한 스타일시트 링크를 넣음"""
+        page_html = path.read_text(encoding='utf-8')
+        protected = set(self.protected)
+        for match in STYLE_BLOCK_RE.finditer(page_html):
+            protected |= protected_properties(match.group(2))
+        hoisted = self.rewrite(page_html, deck, 'pages', protected)
+        if hoisted == page_html:
+            return
+        path.write_text(link_stylesheet(hoisted, css_href), encoding='utf-8')
+
+    def stylesheet(self):
+        return ''.join(f'.{name}{{{body}}}\n' for name, body in sorted(self.names.items()))
+
+    def write(self, path):
+        css = self.stylesheet()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(css, encoding='utf-8')
+        return len(css.encode('utf-8'))
+
+def link_stylesheet(page_html, css_href):
+    """</head> 앞에 스타일시트 링크를 넣음 (</head> 가 없으면 그대로)"""
+    pos = page_html.find('</head>')
+    if pos == -1:
+        return page_html
+    return page_html[:pos] + f'    <link rel="stylesheet" href="{css_href}">\n' + page_html[pos:]
+
+def report(hoister, css_path, css_bytes):
+    """덱별로 옮긴 속성 수와 줄어든 바이트, 생성한 스타일시트를 새로 받는 것까지 친 순변화를 출력"""
+    print(f"  인라인 스타일 → 클래스 {len(hoister.names)}개 ({css_path.name} {css_bytes:,} B)")
+    decks = list(dict.fromkeys(deck for _, deck in hoister.stats))
+    print(f"  {'덱':<20} {'LectureForPdf':>20} {'강의 페이지':>20} {'페이지 순변화':>14}")
+    totals = {'slides': 0, 'pages': 0}
+    for deck in decks:
+        cells = []
+        for target in ('slides', 'pages'):
+            count, saved = hoister.stats.get((target, deck), (0, 0))
+            totals[target] += saved
+            cells.append(f'{count}개 -{saved:,} B' if (target, deck) in hoister.stats else '-')
+        # 강의 페이지 하나만 열면 스타일시트도 처음 받으므로 줄어든 만큼에서 스타일시트 크기를 뺌
+        pages = hoister.stats.get(('pages', deck))
+        net = f'{css_bytes - pages[1]:+,} B' if pages else '-'
+        print(f"  {deck:<20} {cells[0]:>20} {cells[1]:>20} {net:>14}")
+    print(f"  {'합계':<20} {'-' + format(totals['slides'], ',') + ' B':>20} {'-' + format(totals['pages'], ',') + ' B':>20}")
+    # 스타일시트는 한 번 받으면 캐시되므로 전체 순변화에는 한 번만 더함
+    print(f"  순변화 ({css_path.name} 포함): LectureForPdf {css_bytes - totals['slides']:+,} B, "
+          f"강의 페이지 전체 {css_bytes - totals['pages']:+,} B")
+    if hoister.kept:
+        print(f"  그대로 둔 인라인 스타일 {hoister.kept}개 (!important 규칙/애니메이션과 겹치거나 url() 사용)")
@@ -0,0 +1,96 @@
+/* 오프라인 캐시 서비스 워커 (create_pdf_html.py --offline 이 버전을 채워 sw.js 로 씀)
+
+   - precache-manifest.json 의 강의 페이지, 스타일시트, 이미지를 설치할 때 미리 받아 둠
+   - 다시 빌드해서 버전이 바뀌면, 이전 캐시에서 내용 해시가 같은 항목은 옮겨 오고 바뀐 항목만 받음
+   - 캐시에 있는 파일은 네트워크를 기다리지 않고 바로 돌려줌
+   - 폰트/Font Awesome CDN 은 주소에 버전이 들어 있으므로 처음 받을 때 캐시해 두고 계속 씀
+*/
+'use strict';
+
+const VERSION = '__PRECACHE_VERSION__';
+const MANIFEST_URL = '__PRECACHE_MANIFEST__';
+const RUNTIME_HOSTS = __RUNTIME_HOSTS__;
+
+const CACHE_PREFIX = 'lecture-precache-';
+const CACHE_NAME = CACHE_PREFIX + VERSION;
+const RUNTIME_CACHE = 'lecture-runtime';
+const HASH_HEADER = 'X-Precache-Hash';
+
+async function contentHash(buffer) {
+    // precache-manifest.json 의 hash 와 같은 형식 (SHA-256 앞 12자리)
+    const digest = await crypto.subtle.digest('SHA-256', buffer);
+    return [...new Uint8Array(digest)].map((b) => b.toString(16).padStart(2, '0')).join('').slice(0, __HASH_LENGTH__);
+}
+
+async function findUnchanged(oldCaches, url, hash) {
+    for (const cache of oldCaches) {
+        const response = await cache.match(url);
+        if (response && response.headers.get(HASH_HEADER) === hash) return response;
+    }
+    return null;
+}
+
+async function download(url, hash) {
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(url + ': ' + response.status);
+    const body = await response.arrayBuffer();
+    // 배포 도중이라 목록과 내용이 다르면 설치를 실패시켜 이전 버전을 계속 씀 (다음 방문 때 다시 시도)
+    if (await contentHash(body) !== hash) throw new Error(url + ': 내용 해시가 목록과 다름');
+    const headers = new Headers(response.headers);
+    headers.set(HASH_HEADER, hash);
+    return new Response(body, { status: response.status, statusText: response.statusText, headers: headers });
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const manifest = await (await fetch(MANIFEST_URL + '?v=' + VERSION, { cache: 'no-store' })).json();
+        const cache = await caches.open(CACHE_NAME);
+        const oldNames = (await caches.keys()).filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME);
+        const oldCaches = await Promise.all(oldNames.map((name) => caches.open(name)));
+
+        await Promise.all(manifest.entries.map(async (entry) => {
+            const response = await findUnchanged(oldCaches, entry.url, entry.hash) || await download(entry.url, entry.hash);
+            await cache.put(entry.url, response);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        const names = await caches.keys();
+        await Promise.all(names
+            .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+            .map((name) => caches.delete(name)));
+        await self.clients.claim();
+    })());
+});
+
+async function fromPrecache(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const url = new URL(request.url);
+    const key = url.pathname.endsWith('/') ? url.pathname + 'index.html' : request;
+    return await cache.match(key, { ignoreSearch: true }) || fetch(request);
+}
+
+async function fromRuntimeCache(request) {
+    const cache = await caches.open(RUNTIME_CACHE);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok || response.type === 'opaque') await cache.put(request, response.clone());
+    return response;
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    // --watch 의 새로고침 알림(EventSource)은 그대로 네트워크로
+    if (request.method !== 'GET' || request.headers.get('Accept') === 'text/event-stream') return;
+
+    const url = new URL(request.url);
+    if (url.origin === self.location.origin) {
+        event.respondWith(fromPrecache(request));
+    } else if (RUNTIME_HOSTS.includes(url.hostname)) {
+        event.respondWith(fromRuntimeCache(request));
+    }
+});
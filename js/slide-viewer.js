@@ -0,0 +1,138 @@
+/* 강의 페이지 공용 슬라이드 뷰어 (create_pdf_html.py --virtual-slides 로 dist/js 에 복사됨)
+
+   - 현재 슬라이드와 앞뒤 슬라이드만 DOM 에 두고, 나머지는 <template class="slide-template"> 안에 보관
+   - 이동할 때마다 그다음 슬라이드의 이미지를 미리 받아 둠
+   - 기존 강의 스크립트의 changeSlide(direction), showSlide(index), 키보드, postMessage 를 그대로 지원
+   - 주소의 #slide-N 으로 N 번째 슬라이드를 바로 열 수 있음 (index.html 검색 결과 링크)
+*/
+(function () {
+    'use strict';
+
+    const WINDOW = 1;  // 현재 슬라이드 앞뒤로 DOM 에 둘 슬라이드 수
+
+    const slots = [];  // 슬라이드마다 { placeholder: <template>, element: 붙어 있는 .slide 또는 null }
+    const prefetched = new Set();
+    let currentSlideIndex = 0;
+
+    function init() {
+        document.querySelectorAll('.slide, template.slide-template').forEach((node) => {
+            if (node.tagName === 'TEMPLATE') {
+                slots.push({ placeholder: node, element: null });
+            } else if (!node.closest('template')) {
+                // 처음부터 DOM 에 있는 슬라이드는 자리표시용 template 을 바로 뒤에 만들어 둠
+                const placeholder = document.createElement('template');
+                placeholder.className = 'slide-template';
+                node.after(placeholder);
+                slots.push({ placeholder: placeholder, element: node });
+            }
+        });
+
+        if (slots.length === 0) return;
+        currentSlideIndex = slideFromHash();
+        render(currentSlideIndex);
+    }
+
+    // index.html 검색 결과 링크 (Lecture2.html#slide-15) 로 열면 그 슬라이드부터 보여 줌
+    function slideFromHash() {
+        const match = /^#slide-(\d+)$/.exec(location.hash);
+        if (!match) return 0;
+        return Math.min(Math.max(Number(match[1]) - 1, 0), slots.length - 1);
+    }
+
+    function mount(slot) {
+        if (slot.element) return;
+        const element = slot.placeholder.content.firstElementChild;
+        slot.placeholder.before(element);
+        slot.element = element;
+    }
+
+    function unmount(slot) {
+        if (!slot.element) return;
+        slot.element.classList.remove('active');
+        slot.placeholder.content.appendChild(slot.element);
+        slot.element = null;
+    }
+
+    function prefetch(index) {
+        const slot = slots[index];
+        if (!slot || slot.element || prefetched.has(index)) return;
+        prefetched.add(index);
+        slot.placeholder.content.querySelectorAll('img[src]').forEach((img) => {
+            const image = new Image();
+            image.decoding = 'async';
+            image.src = img.getAttribute('src');
+        });
+    }
+
+    function render(index) {
+        slots.forEach((slot, i) => {
+            if (Math.abs(i - index) <= WINDOW) {
+                mount(slot);
+            } else {
+                unmount(slot);
+            }
+        });
+
+        slots.forEach((slot, i) => {
+            if (slot.element && i !== index) slot.element.classList.remove('active');
+        });
+
+        // 방금 붙인 슬라이드도 전환 효과가 보이도록 다음 프레임에 활성화
+        const current = slots[index].element;
+        requestAnimationFrame(() => current.classList.add('active'));
+
+        currentSlideIndex = index;
+        updateNavUI();
+        prefetch(index + WINDOW + 1);
+    }
+
+    function showSlide(index) {
+        if (index < 0) index = 0;
+        if (index >= slots.length) index = slots.length - 1;
+        if (index !== currentSlideIndex) render(index);
+    }
+
+    function changeSlide(direction) {
+        showSlide(currentSlideIndex + direction);
+    }
+
+    function updateNavUI() {
+        const pageIndicator = document.getElementById('current-page');
+        const prevBtn = document.getElementById('prev-btn');
+        const nextBtn = document.getElementById('next-btn');
+        if (pageIndicator) pageIndicator.innerText = currentSlideIndex + 1;
+        if (prevBtn) prevBtn.disabled = (currentSlideIndex === 0);
+        if (nextBtn) nextBtn.disabled = (currentSlideIndex === slots.length - 1);
+    }
+
+    window.addEventListener('hashchange', () => showSlide(slideFromHash()));
+
+    window.showSlide = showSlide;
+    window.changeSlide = changeSlide;
+
+    // 부모 창에서 { type: 'gotoSlide', index: number } 로 이동
+    window.addEventListener('message', (ev) => {
+        try {
+            const msg = (typeof ev.data === 'string') ? JSON.parse(ev.data) : ev.data;
+            if (msg && msg.type === 'gotoSlide' && typeof msg.index === 'number') {
+                showSlide(msg.index);
+            }
+        } catch (err) { /* ignore malformed messages */ }
+    });
+
+    document.addEventListener('keydown', (event) => {
+        // 버튼에 포커스가 있을 때 Enter/Space 는 버튼 클릭으로 처리되므로 건너뜀
+        if (event.target.closest && event.target.closest('button, input, textarea, select')) return;
+        if (event.key === 'ArrowRight' || event.key === ' ' || event.key === 'Enter') {
+            changeSlide(1);
+        } else if (event.key === 'ArrowLeft') {
+            changeSlide(-1);
+        }
+    });
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
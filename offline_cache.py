@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+from fingerprint_assets import CSS_URL_RE, HASH_LENGTH, REF_ATTR_RE, is_local_ref, split_ref
+
+# base_dir 에 쓰는 서비스 워커와 미리 받을 파일 목록 (서비스 워커는 자기 폴더 아래 페이지만 다루므로 맨 위에 둠)
+SERVICE_WORKER_NAME = 'sw.js'
+PRECACHE_MANIFEST_NAME = 'precache-manifest.json'
+
+# 서비스 워커 원본 (버전/목록 주소 자리를 채워서 SERVICE_WORKER_NAME 으로 씀)
+SERVICE_WORKER_TEMPLATE = Path('js') / 'service-worker.js'
+
+# 처음 받을 때 캐시해 두는 외부 호스트 - 강의 페이지의 웹 폰트와 Font Awesome CDN (주소에 버전이 들어 있음)
+RUNTIME_HOSTS = ('fonts.googleapis.com', 'fonts.gstatic.com', 'cdnjs.cloudflare.com')
+
+REGISTER_SCRIPT = ("<script>if ('serviceWorker' in navigator && location.protocol.startsWith('http')) "
+                   "navigator.serviceWorker.register('{href}').catch(function () {{}});</script>\n")
+
+def register_service_worker(page_html, href):
+    """</body> 앞에 서비스 워커 등록 스크립트를 넣음 (이미 있으면 그대로)"""
+    if 'serviceWorker.register' in page_html:
+        return page_html
+    pos = page_html.lower().rfind('</body>')
+    if pos < 0:
+        return page_html
+    return page_html[:pos] + REGISTER_SCRIPT.format(href=href) + page_html[pos:]
+
+def file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+
+class PrecacheManifest:
+    """서비스 워커가 미리 받을 파일 목록 (base_dir 기준 주소 -> 내용 해시)
+
+    add_page() 로 페이지를 넘기면 페이지가 참조하는 로컬 파일과, 스타일시트 안의 url() 참조까지 함께 넣는다.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir.resolve()
+        self.entries = {}  # 주소 -> (해시, 크기)
+        self.missing = set()
+
+    def add_file(self, path):
+        """path 를 목록에 넣고 새로 넣었으면 True (base_dir 밖이거나 없는 파일은 넣지 않음)"""
+        path = path.resolve()
+        try:
+            url = quote(path.relative_to(self.base_dir).as_posix())
+        except ValueError:
+            return False
+        if url in self.entries:
+            return False
+        if not path.is_file():
+            self.missing.add(url)
+            return False
+        self.entries[url] = (file_hash(path), path.stat().st_size)
+        return True
+
+    def add_page(self, path):
+        if not self.add_file(path):
+            return
+        html = path.read_text(encoding='utf-8')
+        for match in REF_ATTR_RE.finditer(html):
+            values = match.group('value').split(',') if match.group('attr').lower() == 'srcset' else [match.group('value')]
+            for value in values:
+                self.add_ref(value.strip().split(' ')[0], path.parent)
+        for match in CSS_URL_RE.finditer(html):
+            self.add_ref(match.group('value'), path.parent)
+
+    def add_ref(self, ref, directory):
+        if not is_local_ref(ref):
+            return
+        path = directory / split_ref(ref)[0]
+        if self.add_file(path) and path.suffix.lower() == '.css':
+            css = path.read_text(encoding='utf-8')
+            for match in CSS_URL_RE.finditer(css):
+                self.add_ref(match.group('value'), path.parent)
+
+    def add_tree(self, directory, suffix):
+        for path in sorted(directory.rglob(f'*{suffix}')):
+            self.add_file(path)
+
+    def manifest(self):
+        entries = [{'url': url, 'hash': digest, 'size': size}
+                   for url, (digest, size) in sorted(self.entries.items())]
+        version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode()).hexdigest()[:HASH_LENGTH]
+        return {'version': version, 'entries': entries}
+
+    def write(self, template_path):
+        """목록과 서비스 워커를 base_dir 에 쓰고 (목록, 이전 목록에서 바뀐 항목 수) 를 돌려줌
+
+        내용이 같으면 파일을 다시 쓰지 않는다 (sw.js 가 그대로면 브라우저도 업데이트하지 않음).
+        """
+        manifest = self.manifest()
+        manifest_path = self.base_dir / PRECACHE_MANIFEST_NAME
+        previous = {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = {entry['url']: entry['hash'] for entry in json.load(f)['entries']}
+        except (OSError, ValueError, KeyError):
+            pass
+        changed = sum(previous.get(entry['url']) != entry['hash'] for entry in manifest['entries'])
+
+        worker = template_path.read_text(encoding='utf-8')
+        worker = (worker.replace('__PRECACHE_VERSION__', manifest['version'])
+                  .replace('__PRECACHE_MANIFEST__', PRECACHE_MANIFEST_NAME)
+                  .replace('__RUNTIME_HOSTS__', json.dumps(list(RUNTIME_HOSTS)))
+                  .replace('__HASH_LENGTH__', str(HASH_LENGTH)))
+        write_if_changed(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1))
+        write_if_changed(self.base_dir / SERVICE_WORKER_NAME, worker)
+        return manifest, changed
+
+def write_if_changed(path, text):
+    data = text.encode('utf-8')
+    if path.is_file() and path.read_bytes() == data:
+        return
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+def report(manifest, changed, missing):
+    total = sum(entry['size'] for entry in manifest['entries'])
+    print(f"  {len(manifest['entries'])}개 파일 ({total // 1024} KB), 버전 {manifest['version']}"
+          f" → {SERVICE_WORKER_NAME}, {PRECACHE_MANIFEST_NAME}")
+    print(f"  지난 빌드와 달라진 파일 {changed}개 (다음 방문 때 이 파일만 새로 받음)")
+    if missing:
+        print(f"  ⚠️  없는 파일 (목록에서 뺌): {', '.join(sorted(missing))}")
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import re
+import struct
+from contextlib import nullcontext
+from functools import partial
+
+# .image-container 는 grid-2 한 칸(약 600px) 안에 들어가므로 그 크기와 고해상도(2배) 화면용 두 가지만 만든다
+DISPLAY_WIDTH = 600
+TARGET_WIDTHS = (DISPLAY_WIDTH, DISPLAY_WIDTH * 2)
+IMAGE_SIZES = f'(max-width: {DISPLAY_WIDTH}px) 100vw, {DISPLAY_WIDTH}px'
+
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+# 변환 결과 캐시는 원본 내용 해시를 파일명에 넣어 관리하므로, 변환 방식이 바뀌면 올린다
+OPTIMIZER_VERSION = 1
+
+# 변환본은 dist/img 에 저장
+IMAGE_DIR_NAME = 'img'
+
+# 로컬 이미지만 대상 (http(s) 외부 이미지는 건드리지 않음)
+LOCAL_IMG_TAG_RE = re.compile(
+    r'''<img\b(?P<before>[^>]*?)\bsrc\s*=\s*(?P<quote>["'])(?:\./)?(?P<src>[^"':?#]+\.(?:png|jpe?g))(?P=quote)(?P<after>[^>]*)>''',
+    re.IGNORECASE
+)
+
+# 모든 <img> 태그 (크기/지연 로딩 속성 주입용)
+IMG_TAG_RE = re.compile(r'<img\b(?P<attrs>[^>]*?)\s*(?P<close>/?)>', re.IGNORECASE)
+IMG_SRC_RE = re.compile(r'''\bsrc\s*=\s*["'](?:\./)?([^"']+)["']''', re.IGNORECASE)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# 크기 정보가 들어 있는 JPEG SOF 마커 (C4/C8/CC 는 SOF 가 아님)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def load_pillow():
+    """Pillow 는 이미지 최적화를 켤 때만 필요하므로 그때 불러옴"""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        raise SystemExit("이미지 최적화에는 Pillow 가 필요합니다: pip install Pillow")
+    return Image, features
+
+class ImageOptimizer:
+    """원본 이미지를 표시 크기로 줄이고 WebP/AVIF 변환본을 만들어 두는 객체
+
+    결과는 out_dir 에 '<이름>.<해시>.<폭>w.<확장자>' 로 저장되고, 같은 해시의 결과가
+    이미 있으면 다시 변환하지 않는다. shared_cache 를 주면 다른 강의에서 변환해 둔 결과도 가져다 쓴다.
+    """
+
+    def __init__(self, base_dir, out_dir, shared_cache=None):
+        self.base_dir = base_dir
+        self.out_dir = out_dir
+        self.shared_cache = shared_cache
+        self.variants = {}  # 원본 경로(문자열) -> 변환 결과 정보, 없는 파일은 None
+        self.converted = 0
+        self.reused = 0
+
+    def optimize(self, src):
+        """src (base_dir 기준 상대 경로) 를 최적화하고 변환 결과 정보를 돌려줌"""
+        if src in self.variants:
+            return self.variants[src]
+
+        src_path = self.base_dir / src
+        if not src_path.is_file():
+            self.variants[src] = None
+            return None
+
+        data = src_path.read_bytes()
+        digest = hashlib.sha256(data + str(OPTIMIZER_VERSION).encode()).hexdigest()[:12]
+        stem = f'{src_path.stem}.{digest}'
+        manifest_path = self.out_dir / f'{stem}.json'
+
+        info = self.load_variants(manifest_path)
+        if info is not None:
+            self.variants[src] = info
+            self.reused += 1
+            return info
+
+        # 같은 이미지를 다른 강의가 동시에 변환하지 않도록 공용 캐시의 키별 잠금 안에서 확인
+        with self.shared_cache.lock(stem) if self.shared_cache is not None else nullcontext():
+            if self.shared_cache is not None and self.shared_cache.fetch(manifest_path.name, manifest_path):
+                info = self.load_manifest(manifest_path)
+                names = list(iter_variant_files(info)) if info is not None else []
+                if info is not None and all(self.shared_cache.fetch(name, self.out_dir / name) for name in names):
+                    self.variants[src] = info
+                    self.reused += 1
+                    return info
+
+            info = self.convert(src_path, stem)
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False, indent=2)
+            if self.shared_cache is not None:
+                for name in iter_variant_files(info):
+                    self.shared_cache.store(self.out_dir / name, name)
+                self.shared_cache.store(manifest_path, manifest_path.name)
+
+        self.variants[src] = info
+        self.converted += 1
+        return info
+
+    def load_manifest(self, manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_variants(self, manifest_path):
+        """이전에 변환한 결과 정보 (변환본이 하나라도 없으면 None)"""
+        info = self.load_manifest(manifest_path)
+        if info is None or not all((self.out_dir / name).is_file() for name in iter_variant_files(info)):
+            return None
+        return info
+
+    def convert(self, src_path, stem):
+        Image, features = load_pillow()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        with Image.open(src_path) as image:
+            image.load()
+            width, height = image.size
+
+            # 원본보다 크게 늘리지는 않음
+            widths = sorted({min(w, width) for w in TARGET_WIDTHS})
+            formats = [('webp', 'WEBP', {'quality': WEBP_QUALITY, 'method': 6})]
+            if features.check('avif'):
+                formats.insert(0, ('avif', 'AVIF', {'quality': AVIF_QUALITY}))
+
+            info = {
+                'width': width,
+                'height': height,
+                'display_width': widths[0],
+                'display_height': round(height * widths[0] / width),
+                'fallback': None,
+                'sources': {ext: [] for ext, _, _ in formats},
+            }
+
+            for w in widths:
+                resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+
+                for ext, fmt, options in formats:
+                    name = f'{stem}.{w}w.{ext}'
+                    resized.save(self.out_dir / name, fmt, **options)
+                    info['sources'][ext].append([name, w])
+
+                # <picture> 를 지원하지 않는 환경용: 표시 크기로 줄인 원본 형식
+                if w == widths[0]:
+                    name = f'{stem}.{w}w{src_path.suffix.lower()}'
+                    if src_path.suffix.lower() == '.png':
+                        resized.save(self.out_dir / name, 'PNG', optimize=True)
+                    else:
+                        resized.convert('RGB').save(self.out_dir / name, 'JPEG', quality=85, optimize=True, progressive=True)
+                    info['fallback'] = name
+
+        return info
+
+    def rewrite(self, html, prefix):
+        """html 안의 로컬 <img> 를 <picture> 로 바꿈. prefix 는 변환본 폴더까지의 상대 경로"""
+        def replace(match):
+            info = self.optimize(match.group('src'))
+            if info is None:
+                return match.group(0)
+            return picture_html(match, info, prefix)
+
+        return LOCAL_IMG_TAG_RE.sub(replace, html)
+
+def read_image_size(path):
+    """PNG/JPEG 헤더만 읽어서 (폭, 높이) 를 돌려줌. 픽셀은 디코딩하지 않으며, 알 수 없는 형식이면 None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(24)
+            if head[:8] == PNG_SIGNATURE and head[12:16] == b'IHDR':
+                return struct.unpack('>II', head[16:24])
+
+            if head[:2] != b'\xff\xd8':
+                return None
+
+            # JPEG: 세그먼트 길이만 보고 건너뛰면서 SOF 세그먼트를 찾음
+            f.seek(2)
+            while True:
+                byte = f.read(1)
+                if not byte:
+                    return None
+                if byte != b'\xff':
+                    continue
+                marker = f.read(1)
+                while marker == b'\xff':
+                    marker = f.read(1)
+                if not marker:
+                    return None
+                code = marker[0]
+                if code == 0xD8 or 0xD0 <= code <= 0xD7 or code == 0x01:
+                    continue  # 길이가 없는 마커
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    return None
+                length = struct.unpack('>H', length_bytes)[0]
+                if code in JPEG_SOF_MARKERS:
+                    sof = f.read(5)
+                    if len(sof) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', sof[1:5])
+                    return width, height
+                f.seek(length - 2, 1)
+    except OSError:
+        return None
+
+def annotate_images(html, base_dir, sizes, lazy_from=None):
+    """<img> 에 원본 크기(width/height)를 넣고, lazy_from 위치 이후의 이미지는 지연 로딩/비동기 디코딩으로 바꿈
+
+    sizes 는 경로 -> 크기 캐시 (같은 빌드에서 같은 이미지를 다시 읽지 않도록)
+    """
+    def replace(match):
+        attrs = match.group('attrs')
+        lower = attrs.lower()
+        extra = ''
+
+        src_match = IMG_SRC_RE.search(attrs)
+        if src_match and ' width=' not in lower and ' height=' not in lower:
+            src = src_match.group(1)
+            if ':' not in src:
+                if src not in sizes:
+                    sizes[src] = read_image_size(base_dir / src)
+                if sizes[src] is not None:
+                    extra += ' width="%d" height="%d"' % sizes[src]
+
+        if lazy_from is not None and match.start() >= lazy_from:
+            if ' loading=' not in lower:
+                extra += ' loading="lazy"'
+            if ' decoding=' not in lower:
+                extra += ' decoding="async"'
+
+        if not extra:
+            return match.group(0)
+        return f'<img{attrs}{extra}{match.group("close")}>'
+
+    return IMG_TAG_RE.sub(replace, html)
+
+def iter_variant_files(info):
+    yield info['fallback']
+    for entries in info['sources'].values():
+        for name, _ in entries:
+            yield name
+
+def picture_html(match, info, prefix):
+    """<img> 태그 하나를 AVIF/WebP 후보를 가진 <picture> 로 바꾼 문자열"""
+    sources = []
+    for ext, entries in info['sources'].items():
+        srcset = ', '.join(f'{prefix}{name} {w}w' for name, w in entries)
+        sources.append(f'<source type="image/{ext}" srcset="{srcset}" sizes="{IMAGE_SIZES}">')
+
+    quote = match.group('quote')
+    img = f'<img{match.group("before")}src={quote}{prefix}{info["fallback"]}{quote}{match.group("after")}>'
+    return '<picture>' + ''.join(sources) + img + '</picture>'
+
+def report(optimizer):
+    """원본 대비 줄어든 크기 출력"""
+    before = after = 0
+    for src, info in sorted(optimizer.variants.items()):
+        if info is None:
+            print(f"  ⚠️  이미지 없음: {src}")
+            continue
+        original = (optimizer.base_dir / src).stat().st_size
+        smallest = min((optimizer.out_dir / name).stat().st_size
+                       for name in iter_variant_files(info) if f'.{info["display_width"]}w.' in name)
+        before += original
+        after += smallest
+        print(f"  - {src}: {original // 1024} KB → {smallest // 1024} KB")
+
+    print(f"  이미지 {optimizer.converted}개 변환, {optimizer.reused}개 캐시 사용"
+          f" (합계 {before // 1024} KB → {after // 1024} KB)")
+
+def main():
+    from create_pdf_html import BASE_DIR, BUILD_DIR_NAME, LECTURE_FILES, write_deck_pages
+
+    optimizer = ImageOptimizer(BASE_DIR, BASE_DIR / BUILD_DIR_NAME / IMAGE_DIR_NAME)
+    build_dir = write_deck_pages(BASE_DIR, LECTURE_FILES, [partial(optimizer.rewrite, prefix=f'{IMAGE_DIR_NAME}/')])
+
+    print(f"이미지 최적화 완료: {build_dir}")
+    report(optimizer)
+
+if __name__ == '__main__':
+    main()
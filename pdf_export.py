@@ -0,0 +1,920 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from purge_css import parse_css
+from subset_fonts import FA_BASE_CSS, FONT_DIR_NAME, FONT_FACES, find_font_file, load_icon_codepoints
+
+# base_dir 에 쓰는 결과 파일
+PDF_NAME = 'LectureForPdf.pdf'
+
+# 브라우저 인쇄와 같은 배치가 되도록 CSS px(96dpi) 단위로 배치하고, 그릴 때 pt(72dpi) 로 바꿈
+PAGE_WIDTH = 297 / 25.4 * 96   # A4 가로
+PAGE_HEIGHT = 210 / 25.4 * 96
+PX_TO_PT = 72 / 96
+ROOT_FONT_SIZE = 16
+
+# Font Awesome 등 폰트 파일에 글자가 없으면 쓰는 대체 폰트
+# 한글은 Adobe-Korea1 CID 폰트 (파일에 넣지 않고 PDF 뷰어의 글꼴을 씀), 나머지는 PDF 기본 폰트
+FALLBACK_CID_FONT = 'HYGothic-Medium'
+FALLBACK_FONTS = {
+    ('sans', False): 'Helvetica', ('sans', True): 'Helvetica-Bold',
+    ('mono', False): 'Courier', ('mono', True): 'Courier-Bold',
+}
+GENERIC_FAMILIES = {'sans-serif': 'Noto Sans KR', 'monospace': 'JetBrains Mono'}
+MONO_FAMILIES = {'JetBrains Mono', 'monospace'}
+
+# 브라우저 기본 스타일 중 슬라이드에 쓰이는 것 (강의 스타일시트가 뒤에서 덮어씀)
+UA_CSS = '''
+h1, h2, h3, h4, h5, h6, strong, b, th { font-weight: 700; }
+pre, code, kbd { font-family: monospace; }
+pre { white-space: pre; }
+ul { list-style: disc; }
+ol { list-style: decimal; }
+a { color: #58a6ff; }
+'''
+
+# 자식에게 물려주는 속성
+INHERITED = ('color', 'font-size', 'font-weight', 'font-family', 'line-height', 'text-align', 'white-space',
+             'list-style', 'opacity')
+
+BLOCK_TAGS = {'div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'pre', 'section', 'header',
+              'footer', 'article', 'aside', 'main', 'blockquote', 'figure', 'figcaption', 'table', 'tr', 'hr',
+              'picture'}
+VOID_TAGS = {'br', 'img', 'hr', 'meta', 'link', 'input', 'source', 'wbr'}
+# 그리지 않는 요소 (버튼/내비게이션은 인쇄 스타일에서도 숨김, SVG 는 그리지 않음)
+SKIPPED_TAGS = {'script', 'style', 'button', 'svg', 'template', 'head', 'title', 'noscript'}
+
+SELECTOR_PART_RE = re.compile(r'^(\*|[a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)(::?before)?$')
+SELECTOR_NAME_RE = re.compile(r'([.#])([\w-]+)')
+LENGTH_RE = re.compile(r'^(-?[\d.]+)(px|rem|em|%|vw|vh)?$')
+COLOR_RE = re.compile(r'#[0-9a-fA-F]{3,8}\b|rgba?\([^)]*\)|\b(?:white|black|transparent)\b')
+CSS_ESCAPE_RE = re.compile(r'\\([0-9a-fA-F]{1,6})\s?')
+WORD_RE = re.compile(r'\S+|\s+')
+
+NAMED_COLORS = {'white': (1, 1, 1, 1), 'black': (0, 0, 0, 1), 'transparent': None}
+
+def load_reportlab():
+    """reportlab 은 PDF 출력을 켤 때만 필요하므로 그때 불러옴"""
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        raise SystemExit("PDF 출력에는 reportlab 이 필요합니다: pip install reportlab pillow")
+
+def parse_color(value):
+    """CSS 색을 (r, g, b, a) 로 (0~1), 투명이거나 알 수 없으면 None"""
+    match = COLOR_RE.search(value or '')
+    if not match:
+        return None
+    text = match.group(0).lower()
+    if text in NAMED_COLORS:
+        return NAMED_COLORS[text]
+    if text.startswith('#'):
+        digits = text[1:]
+        if len(digits) in (3, 4):
+            digits = ''.join(c * 2 for c in digits)
+        channels = [int(digits[i:i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+        return tuple(channels) if len(channels) == 4 else (*channels, 1)
+    parts = [part.strip() for part in text[text.index('(') + 1:-1].split(',')]
+    alpha = float(parts[3]) if len(parts) > 3 else 1
+    return (*(float(part) / 255 for part in parts[:3]), alpha) if alpha > 0 else None
+
+def parse_length(value, font_size=ROOT_FONT_SIZE, percent_of=0):
+    """CSS 길이를 px 로 (auto 나 알 수 없는 값은 None)"""
+    match = LENGTH_RE.match((value or '').strip())
+    if not match:
+        return None
+    number, unit = float(match.group(1)), match.group(2)
+    if unit == 'rem':
+        return number * ROOT_FONT_SIZE
+    if unit == 'em':
+        return number * font_size
+    if unit == '%':
+        return number * percent_of / 100
+    if unit == 'vw':
+        return number * PAGE_WIDTH / 100
+    if unit == 'vh':
+        return number * PAGE_HEIGHT / 100
+    return number
+
+def parse_declarations(text):
+    """'a: b; c: d' 를 [(속성, 값, !important 여부)] 로"""
+    declarations = []
+    for item in text.split(';'):
+        name, _, value = item.partition(':')
+        name, value = name.strip().lower(), value.strip()
+        if not name or not value:
+            continue
+        important = value.endswith('!important')
+        if important:
+            value = value[:-len('!important')].strip()
+        declarations.extend((longhand, part, important) for longhand, part in expand_shorthand(name, value))
+    return declarations
+
+def expand_shorthand(name, value):
+    """margin/padding/border/background 단축 속성을 개별 속성으로"""
+    if name in ('margin', 'padding'):
+        parts = value.split()
+        top, right, bottom, left = (parts * 4)[:4] if len(parts) == 1 else (
+            [parts[0], parts[1], parts[0], parts[1]] if len(parts) == 2 else
+            [parts[0], parts[1], parts[2], parts[1]] if len(parts) == 3 else parts[:4])
+        return [(f'{name}-top', top), (f'{name}-right', right), (f'{name}-bottom', bottom), (f'{name}-left', left)]
+    if name in ('border', 'border-top', 'border-right', 'border-bottom', 'border-left'):
+        sides = ('top', 'right', 'bottom', 'left') if name == 'border' else (name[len('border-'):],)
+        width = next((part for part in value.split() if LENGTH_RE.match(part)), '0')
+        if value.strip() == 'none':
+            width = '0'
+        color = value
+        return [item for side in sides for item in ((f'border-{side}-width', width), (f'border-{side}-color', color))]
+    if name in ('background', 'background-color'):
+        return [('background-color', value)]
+    if name in ('gap', 'grid-gap'):
+        return [('gap', value.split()[-1])]
+    return [(name, value)]
+
+def decode_content(value):
+    """content 속성 값의 문자열 ('\\f054' 같은 이스케이프 포함)"""
+    value = value.strip()
+    if len(value) < 2 or value[0] not in '"\'' or value[-1] != value[0]:
+        return ''
+    return CSS_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), value[1:-1])
+
+class StyleSheet:
+    """단순 선택자(태그/클래스/id 와 자손 결합자, ::before)만 이해하는 작은 CSS 캐스케이드
+
+    강의 스타일시트가 슬라이드 모양의 원본이므로, 색이나 크기를 따로 적어 두지 않고 그대로 읽는다.
+    """
+
+    def __init__(self, css):
+        self.rules = {}  # 마지막 부분의 키('*', 태그, '.클래스', '#id') -> [(우선순위, 선택자 부분, 가상 요소, 선언)]
+        order = 0
+        for prelude, body in self.iter_rules(parse_css(css)):
+            declarations = parse_declarations(body)
+            for selector in prelude.split(','):
+                parsed = self.parse_selector(selector)
+                if parsed is None:
+                    continue
+                parts, pseudo, specificity = parsed
+                order += 1
+                tag, names = parts[-1]
+                key = next((f'{kind}{name}' for kind, name in names), tag or '*')
+                self.rules.setdefault(key, []).append(((specificity, order), parts, pseudo, declarations))
+
+    def iter_rules(self, rules):
+        for kind, prelude, body in rules:
+            if kind == 'rule':
+                yield prelude, body
+            elif kind == 'group' and prelude.lower().startswith('@media') and 'print' in prelude.lower():
+                yield from self.iter_rules(body)
+
+    @staticmethod
+    def parse_selector(selector):
+        """'.a b.c::before' -> ([(태그, ((종류, 이름), ...)), ...], 가상 요소, 명시도) - 모르는 선택자는 None"""
+        parts = []
+        pseudo = None
+        specificity = [0, 0, 0]
+        tokens = selector.replace('>', ' ').split()
+        if not tokens:
+            return None
+        for index, token in enumerate(tokens):
+            match = SELECTOR_PART_RE.match(token)
+            if not match or (match.group(3) and index != len(tokens) - 1):
+                return None
+            tag = match.group(1)
+            tag = None if tag in (None, '*') else tag.lower()
+            names = tuple(SELECTOR_NAME_RE.findall(match.group(2)))
+            if match.group(3):
+                pseudo = 'before'
+            specificity[0] += sum(kind == '#' for kind, _ in names)
+            specificity[1] += sum(kind == '.' for kind, _ in names)
+            specificity[2] += tag is not None
+            parts.append((tag, names))
+        return parts, pseudo, tuple(specificity)
+
+    @staticmethod
+    def part_matches(part, element):
+        tag, names = part
+        if tag is not None and tag != element.tag:
+            return False
+        for kind, name in names:
+            if kind == '.' and name not in element.classes:
+                return False
+            if kind == '#' and name != element.id:
+                return False
+        return True
+
+    def matches(self, parts, element):
+        if not self.part_matches(parts[-1], element):
+            return False
+        ancestor = element.parent
+        for part in reversed(parts[:-1]):
+            while ancestor is not None and not self.part_matches(part, ancestor):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+        return True
+
+    def declarations_for(self, element):
+        """element 에 맞는 (요소 선언, ::before 선언) - 우선순위 순서"""
+        keys = ['*', element.tag, *(f'.{name}' for name in element.classes)]
+        if element.id:
+            keys.append(f'#{element.id}')
+        matched = []
+        for key in keys:
+            for priority, parts, pseudo, declarations in self.rules.get(key, ()):
+                if self.matches(parts, element):
+                    matched.append((priority, pseudo, declarations))
+        matched.sort(key=lambda item: item[0])
+        own, before = [], []
+        for _, pseudo, declarations in matched:
+            (before if pseudo else own).extend(declarations)
+        if element.style_attr:
+            own.extend((name, value, True) for name, value, _ in parse_declarations(element.style_attr))
+        return own, before
+
+    def compute(self, element, parent_style):
+        own, before = self.declarations_for(element)
+        style = self.cascade(own, parent_style)
+        before_style = self.cascade(before, style) if before else None
+        return style, before_style
+
+    @staticmethod
+    def cascade(declarations, parent_style):
+        style = {name: parent_style[name] for name in INHERITED if name in parent_style}
+        for important in (False, True):
+            for name, value, is_important in declarations:
+                if is_important == important:
+                    style[name] = value
+        # em 과 % 는 부모 글자 크기 기준
+        parent_size = parent_style.get('font-size', ROOT_FONT_SIZE)
+        size = style.get('font-size', parent_size)
+        if isinstance(size, str):
+            size = parse_length(size, parent_size, parent_size) or parent_size
+        style['font-size'] = size
+        return style
+
+class Element:
+    __slots__ = ('tag', 'classes', 'id', 'attrs', 'style_attr', 'parent', 'children', 'style', 'before')
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = frozenset((attrs.get('class') or '').split())
+        self.id = attrs.get('id')
+        self.style_attr = attrs.get('style')
+        self.parent = parent
+        self.children = []
+        self.style = None
+        self.before = None
+
+class TreeBuilder(HTMLParser):
+    """슬라이드 HTML 을 Element 트리로 (그리지 않는 요소는 건너뜀)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('body', {}, None)
+        self.current = self.root
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = 1
+            return
+        element = Element(tag, dict(attrs), self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.skip_depth and tag not in SKIPPED_TAGS:
+            self.current.children.append(Element(tag, dict(attrs), self.current))
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        # 닫는 태그가 빠진 요소는 건너뛰고 짝이 맞는 요소까지 올라감
+        element = self.current
+        while element is not self.root and element.tag != tag:
+            element = element.parent
+        if element is not self.root:
+            self.current = element.parent
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.current.tag == 'pre' and not self.current.children and data.startswith('\n'):
+            data = data[1:]  # <pre> 바로 뒤의 줄바꿈은 브라우저도 무시함
+        self.current.children.append(data)
+
+class PdfFonts:
+    """FONT_FACES 중 base_dir/fonts 에 있는 TrueType 폰트를 등록하고 글자마다 그릴 폰트를 골라 줌
+
+    reportlab 은 문서에 쓰인 글자만 남긴 서브셋으로 폰트를 넣는다.
+    """
+
+    def __init__(self, font_dir):
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+        from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+        self.string_width = pdfmetrics.stringWidth
+        self.faces = {}     # family -> {weight: 폰트 이름}
+        self.coverage = {}  # 폰트 이름 -> 글리프가 있는 코드포인트
+        self.missing = []
+        for family, weight, name, _ in FONT_FACES:
+            path = find_font_file(font_dir, name)
+            if path is None or path.suffix not in ('.ttf', '.otf'):
+                self.missing.append(name)
+                continue
+            try:
+                font = TTFont(name, str(path))
+            except TTFError:
+                self.missing.append(name)  # CFF 윤곽선(.otf) 은 reportlab 이 넣지 못함
+                continue
+            pdfmetrics.registerFont(font)
+            self.faces.setdefault(family, {})[weight] = name
+            self.coverage[name] = frozenset(font.face.charToGlyph)
+        pdfmetrics.registerFont(UnicodeCIDFont(FALLBACK_CID_FONT))
+        self.chains = {}
+        self.char_fonts = {}
+
+    def chain(self, families, weight):
+        """font-family 목록과 굵기로 (글자를 찾아볼 폰트 이름 목록)"""
+        key = (families, weight)
+        if key not in self.chains:
+            bold = weight >= 600
+            names = [GENERIC_FAMILIES.get(family, family) for family in families]
+            kind = 'mono' if any(family in MONO_FAMILIES for family in families) else 'sans'
+            chain = []
+            for family in [*names, GENERIC_FAMILIES['sans-serif']]:
+                weights = self.faces.get(family)
+                if weights:
+                    chain.append(weights[min(weights, key=lambda w: (abs(w - weight), -w))])
+            chain += [FALLBACK_FONTS[(kind, bold)], FALLBACK_CID_FONT]
+            self.chains[key] = tuple(dict.fromkeys(chain))
+        return self.chains[key]
+
+    def font_for(self, chain, char):
+        key = (chain, char)
+        font = self.char_fonts.get(key)
+        if font is None:
+            code = ord(char)
+            for name in chain:
+                coverage = self.coverage.get(name)
+                if coverage is not None:
+                    if code in coverage:
+                        font = name
+                        break
+                elif name != FALLBACK_CID_FONT:
+                    if code < 0x100:
+                        font = name
+                        break
+                elif not 0xE000 <= code <= 0xF8FF:
+                    font = name  # 아이콘(사용자 정의 영역) 글자는 대체 폰트에 없으므로 버림
+            self.char_fonts[key] = font = font or ''
+        return font
+
+    def segments(self, chain, text, size):
+        """text 를 [(폰트 이름, 글자들, 너비)] 로 나눔 (그릴 폰트가 없는 글자는 뺌)"""
+        segments = []
+        start = 0
+        current = None
+        for index, char in enumerate(text):
+            font = self.font_for(chain, char)
+            if font != current:
+                if current:
+                    segments.append((current, text[start:index]))
+                current, start = font, index
+        if current:
+            segments.append((current, text[start:]))
+        return [(font, part, self.string_width(part, font, size)) for font, part in segments]
+
+class SlideLayout:
+    """슬라이드 HTML 하나를 A4 가로 페이지 하나의 그리기 명령 목록으로 배치
+
+    그리기 명령은 (종류, x, y, ...) 튜플이라 프로세스 사이로 넘길 수 있다 (좌표는 페이지 왼쪽 위 기준 px).
+      ('rect', x, y, w, h, 둥근 모서리, 채우기 색, 테두리 색, 테두리 두께)
+      ('text', x, 기준선 y, 폰트, 크기, 색, 글자)
+      ('image', x, y, w, h, 파일 경로)
+    """
+
+    def __init__(self, base_dir, css):
+        self.base_dir = base_dir
+        self.stylesheet = StyleSheet(UA_CSS + css)
+        self.fonts = PdfFonts(base_dir / FONT_DIR_NAME)
+        body = Element('body', {}, None)
+        self.body_style, _ = self.stylesheet.compute(body, {})
+        self.background = parse_color(self.body_style.get('background-color')) or (0, 0, 0, 1)
+        self.image_sizes = {}
+        self.skipped_images = []
+
+    def page(self, slide_html):
+        """(그리기 명령, 배경색, 건너뛴 이미지) - 넘치는 슬라이드는 페이지에 맞게 줄여서 배치"""
+        self.skipped_images = []
+        builder = TreeBuilder()
+        builder.feed(slide_html)
+        builder.close()
+        self.apply_styles(builder.root, self.body_style)
+        slide = next((child for child in builder.root.children if isinstance(child, Element)), builder.root)
+
+        style = slide.style
+        pad = [self.length(style, f'padding-{side}', PAGE_WIDTH) or 0 for side in ('top', 'right', 'bottom', 'left')]
+        avail_width = PAGE_WIDTH - pad[1] - pad[3]
+        avail_height = PAGE_HEIGHT - pad[0] - pad[2]
+        flow = [child for child in slide.children if not self.is_absolute(child)]
+        ops, width, height = self.layout_flow(slide, flow, avail_width, center=True)
+
+        # 슬라이드 div 는 화면 가운데 정렬 (flex) - 넘치면 인쇄 때처럼 잘리지 않게 페이지에 맞춰 줄임
+        scale = min(1, avail_height / height) if height else 1
+        dx = pad[3] + (avail_width - width * scale) / 2
+        dy = pad[0] + (avail_height - height * scale) / 2
+        ops = [transform(op, scale, dx, dy) for op in ops]
+        for child in slide.children:
+            if self.is_absolute(child):
+                ops += self.layout_absolute(child)
+        return ops, self.background, self.skipped_images
+
+    def apply_styles(self, element, parent_style):
+        element.style, before_style = self.stylesheet.compute(element, parent_style)
+        if before_style is not None:
+            content = decode_content(before_style.get('content', ''))
+            if content:
+                element.before = (content, before_style)
+        number = 0
+        for child in element.children:
+            if not isinstance(child, Element):
+                continue
+            self.apply_styles(child, element.style)
+            if child.tag == 'li' and child.before is None:
+                # list-style 글머리표/번호는 ::before 처럼 왼쪽 여백에 내어 씀
+                number += 1
+                marker = {'decimal': f'{number}.', 'disc': '•'}.get(child.style.get('list-style', '').split(' ')[0])
+                if marker:
+                    child.before = (marker, {**child.style, 'width': '1.5em', 'margin-left': '-1.5em'})
+
+    def length(self, style, name, percent_of=0):
+        return parse_length(style.get(name), style['font-size'], percent_of)
+
+    def display(self, element):
+        display = element.style.get('display', '')
+        if display in ('none', 'block', 'flex', 'grid', 'inline', 'inline-block', 'list-item'):
+            return display
+        return 'block' if element.tag in BLOCK_TAGS else 'inline'
+
+    def is_absolute(self, node):
+        return isinstance(node, Element) and node.style.get('position') in ('absolute', 'fixed')
+
+    def is_block(self, node):
+        if not isinstance(node, Element):
+            return False
+        return node.tag == 'img' or self.display(node) not in ('inline',)
+
+    # 블록 배치
+
+    def layout_flow(self, parent, children, width, center=False):
+        """블록/인라인이 섞인 자식들을 위에서 아래로 쌓음 - (명령, 쓴 너비, 높이)"""
+        ops = []
+        y = 0
+        used_width = 0
+        inline = []
+        style = parent.style
+        is_grid = self.display(parent) == 'grid'
+        if is_grid:
+            return self.layout_grid(parent, [child for child in children if isinstance(child, Element)], width)
+
+        def flush():
+            nonlocal y, used_width
+            if inline:
+                line_ops, line_width, line_height = self.layout_inline(parent, inline, width)
+                ops.extend(shift(op, 0, y) for op in line_ops)
+                y += line_height
+                used_width = max(used_width, line_width)
+                inline.clear()
+
+        if parent.before is not None:
+            children = [('before', parent), *children]
+
+        centered = center or style.get('text-align') == 'center' or (
+            self.display(parent) == 'flex' and 'center' in (style.get('align-items'), style.get('justify-content'))
+            and style.get('flex-direction') != 'column')
+        for child in children:
+            if isinstance(child, Element) and (self.display(child) == 'none' or self.is_absolute(child)):
+                continue
+            if not self.is_block(child):
+                inline.append(child)
+                continue
+            flush()
+            box_ops, box_width, box_height = self.layout_box(child, width)
+            margin_auto = child.style.get('margin-left') == 'auto' and child.style.get('margin-right') == 'auto'
+            dx = (width - box_width) / 2 if (centered or margin_auto) and box_width < width else 0
+            ops.extend(shift(op, dx, y) for op in box_ops)
+            y += box_height
+            used_width = max(used_width, box_width)
+        flush()
+        return ops, used_width, y
+
+    def layout_grid(self, parent, cells, width):
+        style = parent.style
+        columns = max(1, len([part for part in style.get('grid-template-columns', '1fr').split() if part.endswith('fr')]))
+        gap = self.length(style, 'gap', width) or 0
+        cell_width = (width - gap * (columns - 1)) / columns
+        ops = []
+        y = 0
+        for row_start in range(0, len(cells), columns):
+            laid_out = [self.layout_box(cell, cell_width) for cell in cells[row_start:row_start + columns]]
+            row_height = max(height for _, _, height in laid_out)
+            for column, (cell_ops, _, height) in enumerate(laid_out):
+                dy = (row_height - height) / 2 if style.get('align-items') == 'center' else 0
+                ops.extend(shift(op, column * (cell_width + gap), y + dy) for op in cell_ops)
+            y += row_height + (gap if row_start + columns < len(cells) else 0)
+        return ops, width, y
+
+    def layout_box(self, element, avail_width):
+        """블록 하나 (바깥 여백 포함) - (명령, 쓴 너비, 높이)"""
+        style = element.style
+        margin = [self.length(style, f'margin-{side}', avail_width) or 0 for side in ('top', 'right', 'bottom', 'left')]
+        padding = [self.length(style, f'padding-{side}', avail_width) or 0 for side in ('top', 'right', 'bottom', 'left')]
+        border = [self.length(style, f'border-{side}-width') or 0 for side in ('top', 'right', 'bottom', 'left')]
+        if element.tag == 'img':
+            return self.layout_image(element, avail_width, margin)
+
+        box_width = avail_width - margin[1] - margin[3]
+        explicit = self.length(style, 'width', box_width)
+        if explicit is not None:
+            box_width = min(box_width, explicit)
+        max_width = self.length(style, 'max-width', box_width)
+        if max_width is not None:
+            box_width = min(box_width, max_width)
+        inner_width = box_width - padding[1] - padding[3] - border[1] - border[3]
+
+        content_ops, content_width, content_height = self.layout_flow(element, element.children, inner_width)
+        if (self.display(element) == 'inline-block' or self.is_absolute(element)) and explicit is None:
+            # 내용 너비에 맞춤
+            box_width = min(box_width, content_width + padding[1] + padding[3] + border[1] + border[3])
+        frame_height = padding[0] + padding[2] + border[0] + border[2]
+        box_height = max(content_height + frame_height, self.length(style, 'min-height', PAGE_HEIGHT) or 0)
+        dy = 0
+        if content_height + frame_height < box_height and style.get('align-items') == 'center':
+            dy = (box_height - content_height - frame_height) / 2
+
+        ops = self.frame(style, margin[3], margin[0], box_width, box_height, border)
+        ops.extend(shift(op, margin[3] + border[3] + padding[3], margin[0] + border[0] + padding[0] + dy)
+                   for op in content_ops)
+        return ops, box_width + margin[1] + margin[3], box_height + margin[0] + margin[2]
+
+    def frame(self, style, x, y, width, height, border):
+        """배경과 테두리 (네 변이 같으면 둥근 사각형, 아니면 변마다 막대)"""
+        fill = parse_color(style.get('background-color'))
+        radius = self.length(style, 'border-radius') or 0
+        colors = [parse_color(style.get(f'border-{side}-color')) if border[i] else None
+                  for i, side in enumerate(('top', 'right', 'bottom', 'left'))]
+        if colors[0] and len(set(border)) == 1 and len(set(colors)) == 1:
+            return [('rect', x, y, width, height, radius, fill, colors[0], border[0])]
+        ops = [('rect', x, y, width, height, radius, fill, None, 0)] if fill else []
+        edges = ((x, y, width, border[0]), (x + width - border[1], y, border[1], height),
+                 (x, y + height - border[2], width, border[2]), (x, y, border[3], height))
+        ops.extend(('rect', *edge, 0, color, None, 0) for edge, color in zip(edges, colors) if color)
+        return ops
+
+    def layout_image(self, element, avail_width, margin):
+        src = element.attrs.get('src') or ''
+        path = self.base_dir / src.split('?')[0].split('#')[0].removeprefix('./')
+        if '://' in src or src.startswith('//') or not path.is_file():
+            self.skipped_images.append(src)  # 외부 이미지는 받아 오지 않음
+            return [], 0, 0
+        size = self.image_size(element, path)
+        if size is None:
+            self.skipped_images.append(src)
+            return [], 0, 0
+        width, height = size
+        max_width = avail_width - margin[1] - margin[3]
+        explicit = self.length(element.style, 'width', max_width)
+        if explicit is not None:
+            width, height = explicit, height * explicit / width
+        if width > max_width:
+            width, height = max_width, height * max_width / width
+        return ([('image', margin[3], margin[0], width, height, str(path))],
+                width + margin[1] + margin[3], height + margin[0] + margin[2])
+
+    def image_size(self, element, path):
+        # annotate_images 가 넣어 둔 원본 크기를 먼저 씀
+        width, height = element.attrs.get('width'), element.attrs.get('height')
+        if width and height and width.isdigit() and height.isdigit():
+            return int(width), int(height)
+        key = str(path)
+        if key not in self.image_sizes:
+            from reportlab.lib.utils import ImageReader
+            try:
+                self.image_sizes[key] = ImageReader(key).getSize()
+            except Exception:
+                self.image_sizes[key] = None
+        return self.image_sizes[key]
+
+    def layout_absolute(self, element):
+        """position: absolute 요소 (페이지 번호 등) - 슬라이드(페이지) 모서리 기준"""
+        style = element.style
+        box_ops, width, height = self.layout_box(element, PAGE_WIDTH / 2)
+        left, top = self.length(style, 'left', PAGE_WIDTH), self.length(style, 'top', PAGE_HEIGHT)
+        right, bottom = self.length(style, 'right', PAGE_WIDTH), self.length(style, 'bottom', PAGE_HEIGHT)
+        x = left if left is not None else PAGE_WIDTH - (right or 0) - width
+        y = top if top is not None else PAGE_HEIGHT - (bottom or 0) - height
+        return [shift(op, x, y) for op in box_ops]
+
+    # 인라인 배치
+
+    def layout_inline(self, parent, nodes, width):
+        """글자와 인라인 요소를 줄로 나눠 배치 - (명령, 가장 긴 줄 너비, 높이)"""
+        pieces = []
+        for node in nodes:
+            self.collect_pieces(node, parent.style, pieces)
+
+        lines = [[]]
+        line_width = 0
+        for piece in self.split_long_words(pieces, width):
+            kind = piece[0]
+            if kind == 'break':
+                lines.append([])
+                line_width = 0
+                continue
+            _, text, style, piece_width, fixed = piece
+            if kind == 'space':
+                if not lines[-1] or lines[-1][-1][3] == 0 or line_width + piece_width > width:
+                    continue  # 줄 앞(내어 쓴 글머리표 뒤 포함)의 공백과 줄 끝에서 넘치는 공백은 그리지 않음
+            elif line_width + piece_width > width and lines[-1]:
+                while lines[-1] and lines[-1][-1][0] == 'space':
+                    line_width -= lines[-1].pop()[3]
+                lines.append([])
+                line_width = 0
+            lines[-1].append(piece)
+            line_width += piece_width
+
+        # 닫는 태그 앞의 들여쓰기만 남은 줄 (<pre> 끝) 은 그리지 않음
+        while len(lines) > 1 and all(not piece[1].strip() for piece in lines[-1]):
+            lines.pop()
+
+        ops = []
+        y = 0
+        max_width = 0
+        base_line_height = self.line_height(parent.style)
+        for line in lines:
+            while line and line[-1][0] == 'space':
+                line.pop()
+            if not line:
+                y += base_line_height if len(lines) > 1 else 0
+                continue
+            total = sum(piece[3] for piece in line)
+            line_height = max([base_line_height] + [self.line_height(piece[2]) for piece in line])
+            align = parent.style.get('text-align')
+            x = (width - total) / 2 if align == 'center' else (width - total if align == 'right' else 0)
+            for kind, text, style, piece_width, fixed in line:
+                size = style['font-size']
+                baseline = y + line_height / 2 + size * 0.35
+                background = parse_color(style.get('background-color')) if kind != 'space' else None
+                if background:
+                    ops.append(('rect', x, baseline - size * 0.95, piece_width, size * 1.3,
+                                self.length(style, 'border-radius') or 0, background, None, 0))
+                offset = fixed if fixed is not None else 0
+                for font, part, part_width in self.fonts.segments(self.font_chain(style), text, size):
+                    ops.append(('text', x + offset, baseline, font, size, self.color(style), part))
+                    offset += part_width
+                x += piece_width
+            max_width = max(max_width, total)
+            y += line_height
+        return ops, max_width, y
+
+    def split_long_words(self, pieces, width):
+        """한 줄보다 긴 단어(긴 코드 줄, 주소)는 글자 단위로 나눔"""
+        for piece in pieces:
+            kind, text, style, piece_width, fixed = piece
+            if kind != 'word' or piece_width <= width or fixed is not None or len(text) < 2:
+                yield piece
+                continue
+            start = 0
+            chunk_width = 0
+            for index, char in enumerate(text):
+                char_width = self.text_width(char, style)
+                if chunk_width + char_width > width and index > start:
+                    yield ('word', text[start:index], style, chunk_width, None)
+                    yield ('break', '', style, 0, None)
+                    start, chunk_width = index, 0
+                chunk_width += char_width
+            yield ('word', text[start:], style, chunk_width, None)
+
+    def collect_pieces(self, node, parent_style, pieces):
+        """인라인 내용을 (종류, 글자, 스타일, 너비, 고정 위치) 조각으로 - 단어/공백/줄바꿈 단위"""
+        if isinstance(node, tuple):  # ('before', 요소) - 블록의 ::before (목록 글머리표 등)
+            self.add_marker(node[1], pieces)
+            return
+        if isinstance(node, str):
+            self.add_text(node, parent_style, pieces)
+            return
+        if node.tag == 'br':
+            pieces.append(('break', '', parent_style, 0, None))
+            return
+        if self.display(node) == 'none' or self.is_absolute(node):
+            return
+        if node.before is not None:
+            self.add_marker(node, pieces)
+        for child in node.children:
+            self.collect_pieces(child, node.style, pieces)
+
+    def add_marker(self, element, pieces):
+        """::before 내용 - width 와 음수 margin-left 로 내어쓰기 하는 글머리표도 그대로"""
+        text, style = element.before
+        size = style['font-size']
+        text_width = sum(part_width for *_, part_width in self.fonts.segments(self.font_chain(style), text, size))
+        width = self.length(style, 'width')
+        margin_left = self.length(style, 'margin-left') or 0
+        margin_right = self.length(style, 'margin-right') or 0
+        advance = (width if width is not None else text_width) + margin_left + margin_right
+        pieces.append(('word', text, style, max(advance, 0), margin_left))
+
+    def add_text(self, text, style, pieces):
+        if style.get('white-space', '').startswith('pre'):
+            lines = text.replace('\t', '    ').split('\n')
+            for index, line in enumerate(lines):
+                if index:
+                    pieces.append(('break', '', style, 0, None))
+                if line:
+                    pieces.append(('word', line, style, self.text_width(line, style), None))
+            return
+        for token in WORD_RE.findall(text):
+            if token.isspace():
+                pieces.append(('space', ' ', style, self.text_width(' ', style), None))
+            else:
+                pieces.append(('word', token, style, self.text_width(token, style), None))
+
+    def text_width(self, text, style):
+        return sum(part_width for *_, part_width in self.fonts.segments(self.font_chain(style), text, style['font-size']))
+
+    def font_chain(self, style):
+        families = tuple(family.strip().strip('"\'') for family in
+                         style.get('font-family', GENERIC_FAMILIES['sans-serif']).split(','))
+        weight = style.get('font-weight', '400')
+        weight = {'normal': 400, 'bold': 700, 'bolder': 700, 'lighter': 300}.get(weight) or int(weight)
+        return self.fonts.chain(families, weight)
+
+    def color(self, style):
+        color = parse_color(style.get('color')) or (0, 0, 0, 1)
+        opacity = float(style.get('opacity', 1))
+        return color if opacity >= 1 else (*color[:3], color[3] * opacity)
+
+    def line_height(self, style):
+        size = style['font-size']
+        value = style.get('line-height', 'normal')
+        if value == 'normal':
+            return size * 1.2
+        try:
+            return size * float(value)
+        except ValueError:
+            return parse_length(value, size, size) or size * 1.2
+
+def shift(op, dx, dy):
+    return (op[0], op[1] + dx, op[2] + dy, *op[3:])
+
+def transform(op, scale, dx, dy):
+    """그리기 명령을 scale 배 하고 (dx, dy) 만큼 옮김"""
+    kind = op[0]
+    x, y = op[1] * scale + dx, op[2] * scale + dy
+    if kind == 'rect':
+        _, _, _, w, h, radius, fill, stroke, stroke_width = op
+        return ('rect', x, y, w * scale, h * scale, radius * scale, fill, stroke, stroke_width * scale)
+    if kind == 'text':
+        _, _, _, font, size, color, text = op
+        return ('text', x, y, font, size * scale, color, text)
+    _, _, _, w, h, path = op
+    return ('image', x, y, w * scale, h * scale, path)
+
+# 작업 프로세스마다 하나씩 만드는 배치기 (폰트 등록과 스타일시트 파싱은 한 번만)
+_worker_layout = None
+
+def init_worker(base_dir, css):
+    global _worker_layout
+    _worker_layout = SlideLayout(base_dir, css)
+
+def layout_page(slide_html):
+    return _worker_layout.page(slide_html)
+
+class PdfExporter:
+    """추출한 슬라이드를 브라우저 없이 A4 가로 PDF 로 그리는 객체
+
+    add() 로 넘긴 슬라이드는 jobs 개 프로세스에서 슬라이드마다 따로 배치하고,
+    write() 에서 순서대로 한 문서에 그린다 (폰트 서브셋과 같은 이미지는 문서에 한 번만 들어감).
+    프로세스 풀은 with 문을 벗어나거나 close() 를 부를 때 닫힌다 (빌드가 중간에 실패해도 남지 않도록).
+    """
+
+    def __init__(self, base_dir, stylesheet_path, jobs=1):
+        load_reportlab()
+        font_dir = base_dir / FONT_DIR_NAME
+        # 아이콘은 폰트 서브셋과 같은 방식으로 .fa-이름::before 규칙을 만들어 스타일시트에 붙임
+        css = stylesheet_path.read_text(encoding='utf-8') + FA_BASE_CSS
+        css += ''.join(f'.fa-{name}::before{{content:"\\{codepoint:x}"}}\n'
+                       for name, codepoint in load_icon_codepoints(font_dir).items())
+        self.layout = SlideLayout(base_dir, css)
+        self.executor = None
+        if jobs > 1:
+            self.executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(base_dir, css))
+        self.pages = []
+        self.skipped_images = []
+        self.image_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """배치 프로세스 풀을 닫음 (아직 배치하지 않은 슬라이드는 취소)"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    @property
+    def missing_fonts(self):
+        return self.layout.fonts.missing
+
+    def add(self, slide_html):
+        """번호를 매긴 슬라이드 HTML 하나를 다음 페이지로 (페이지 번호 div 도 그대로 그림)"""
+        if self.executor is not None:
+            self.pages.append(self.executor.submit(layout_page, slide_html))
+        else:
+            self.pages.append(self.layout.page(slide_html))
+
+    def write(self, pdf_path):
+        """모든 페이지를 pdf_path 에 씀 (임시 파일에 쓰고 교체)"""
+        from reportlab.lib.colors import Color
+        from reportlab.pdfgen import canvas
+
+        page_size = (PAGE_WIDTH * PX_TO_PT, PAGE_HEIGHT * PX_TO_PT)
+        tmp_path = pdf_path.with_name(pdf_path.name + '.tmp')
+        pdf = canvas.Canvas(str(tmp_path), pagesize=page_size, pageCompression=1)
+        pdf.setTitle(pdf_path.stem)
+        colors = {}
+
+        def set_color(setter, rgba):
+            if rgba not in colors:
+                colors[rgba] = Color(*rgba)
+            setter(colors[rgba])
+
+        images = set()
+        try:
+            for page in self.pages:
+                ops, background, skipped = page.result() if self.executor is not None else page
+                self.skipped_images.extend(skipped)
+                set_color(pdf.setFillColor, background)
+                pdf.rect(0, 0, *page_size, stroke=0, fill=1)
+                for op in ops:
+                    kind, x, y = op[0], op[1] * PX_TO_PT, page_size[1] - op[2] * PX_TO_PT
+                    if kind == 'text':
+                        _, _, _, font, size, color, text = op
+                        set_color(pdf.setFillColor, color)
+                        pdf.setFont(font, size * PX_TO_PT)
+                        pdf.drawString(x, y, text)
+                    elif kind == 'rect':
+                        _, _, _, w, h, radius, fill, stroke, stroke_width = op
+                        w, h = w * PX_TO_PT, h * PX_TO_PT
+                        if fill:
+                            set_color(pdf.setFillColor, fill)
+                        if stroke:
+                            set_color(pdf.setStrokeColor, stroke)
+                            pdf.setLineWidth(stroke_width * PX_TO_PT)
+                            # 테두리는 상자 안쪽에 그림 (CSS border-box)
+                            inset = stroke_width * PX_TO_PT / 2
+                            pdf.roundRect(x + inset, y - h + inset, w - inset * 2, h - inset * 2,
+                                          max(radius * PX_TO_PT - inset, 0), stroke=1, fill=1 if fill else 0)
+                        elif radius:
+                            pdf.roundRect(x, y - h, w, h, radius * PX_TO_PT, stroke=0, fill=1)
+                        else:
+                            pdf.rect(x, y - h, w, h, stroke=0, fill=1)
+                    else:
+                        _, _, _, w, h, path = op
+                        w, h = w * PX_TO_PT, h * PX_TO_PT
+                        pdf.setFillAlpha(1)  # 앞에서 칠한 반투명 배경의 투명도가 이미지에 남지 않게
+                        pdf.drawImage(path, x, y - h, w, h, mask='auto')
+                        images.add(path)
+                pdf.showPage()
+            pdf.save()
+        finally:
+            self.close()
+        os.replace(tmp_path, pdf_path)
+        self.image_count = len(images)
+        return len(self.pages)
+
+def report(exporter, pdf_path, page_count):
+    print(f"  {page_count}쪽, 이미지 {exporter.image_count}개 → {pdf_path} ({pdf_path.stat().st_size // 1024} KB)")
+    if exporter.missing_fonts:
+        print(f"  ⚠️  폰트 파일 없음 (같은 글꼴의 가까운 굵기나 PDF 기본 폰트로 대체): {', '.join(exporter.missing_fonts)}")
+    if not exporter.layout.fonts.faces.get(GENERIC_FAMILIES['sans-serif']):
+        print(f"  ⚠️  한글은 {FALLBACK_CID_FONT} 로 그림 (파일에 넣지 않으므로 PDF 뷰어에 따라 다르게 보일 수 있음)")
+    skipped = sorted(set(exporter.skipped_images))
+    if skipped:
+        print(f"  ⚠️  그리지 않은 이미지 {len(skipped)}개 (외부 주소이거나 파일 없음): {', '.join(skipped[:5])}"
+              + (' ...' if len(skipped) > 5 else ''))
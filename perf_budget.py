@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from highlight_code import SYNTAX_CLASS
+
+# 예산 파일 (base_dir 기준) - 없으면 DEFAULT_BUDGETS 만 씀
+BUDGET_FILE_NAME = 'budgets.json'
+
+# 항목별 기본 예산 (0 이하면 검사하지 않음)
+#   total_bytes          페이지 HTML 과 페이지가 불러오는 로컬 파일(이미지, CSS, JS) 합계
+#   image_bytes          <img src> 로 불러오는 로컬 이미지 합계
+#   external_requests    다른 서버에서 받아 오는 리소스 수 (폰트 CSS, CDN 스크립트, 외부 이미지)
+#   dom_nodes            요소 수 (--highlight-code 가 강조한 <code> 안의 토큰 span 은 빼고 셈)
+#   largest_slide_bytes  가장 큰 슬라이드 하나의 HTML 크기
+METRICS = ('total_bytes', 'image_bytes', 'external_requests', 'dom_nodes', 'largest_slide_bytes')
+DEFAULT_BUDGETS = {
+    'total_bytes': 1024 * 1024,
+    'image_bytes': 768 * 1024,
+    'external_requests': 4,
+    'dom_nodes': 1500,
+    'largest_slide_bytes': 16 * 1024,
+}
+
+# 요청을 일으키는 <link rel>, 연결만 미리 여는 preconnect/dns-prefetch 는 세지 않음
+REQUEST_LINK_RELS = {'stylesheet', 'preload', 'modulepreload', 'icon', 'prefetch', 'manifest'}
+MEDIA_TAGS = {'img', 'source', 'video', 'audio', 'iframe', 'embed', 'track', 'input'}
+CSS_URL_RE = re.compile(r'''(?:@import\s+|url\(\s*)["']?([^"')\s;]+)''')
+
+class PageScanner(HTMLParser):
+    """요소 수와 페이지가 불러오는 리소스 주소를 모음"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.dom_nodes = 0
+        self.resources = {}  # 주소 -> 종류 ('image', 'style', 'script', 'media')
+        self.in_style = False
+        self.in_syntax = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        # 빌드할 때 넣은 강조 span 은 페이지 구조가 아니므로 요소 수에 넣지 않음
+        if not (self.in_syntax and tag == 'span'):
+            self.dom_nodes += 1
+        if tag == 'code' and SYNTAX_CLASS in (attrs.get('class') or '').split():
+            self.in_syntax = True
+        if tag == 'link':
+            rels = set((attrs.get('rel') or '').lower().split())
+            if rels & REQUEST_LINK_RELS and attrs.get('href'):
+                self.add(attrs['href'], 'style' if 'stylesheet' in rels else 'media')
+        elif tag == 'script' and attrs.get('src'):
+            self.add(attrs['src'], 'script')
+        elif tag in MEDIA_TAGS:
+            if attrs.get('src'):
+                self.add(attrs['src'], 'image' if tag == 'img' else 'media')
+            # <picture> 후보는 브라우저가 하나만 받으므로 외부 요청만 셈 (크기는 <img src> 로)
+            for candidate in (attrs.get('srcset') or '').split(','):
+                url = candidate.strip().split(' ')[0]
+                if url and is_external(url):
+                    self.add(url, 'media')
+        elif tag == 'style':
+            self.in_style = True
+        for value in CSS_URL_RE.findall(attrs.get('style') or ''):
+            self.add(value, 'image')
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == 'style':
+            self.in_style = False
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self.in_style = False
+        elif tag == 'code':
+            self.in_syntax = False
+
+    def handle_data(self, data):
+        if self.in_style:
+            for value in CSS_URL_RE.findall(data):
+                self.add(value, 'style' if value.endswith('.css') or 'css' in value else 'image')
+
+    def add(self, url, kind):
+        if url.startswith(('#', 'data:')):
+            return
+        self.resources.setdefault(url, kind)
+
+def is_external(url):
+    return url.startswith('//') or urlsplit(url).scheme in ('http', 'https')
+
+def measure_page(path):
+    """페이지 하나의 항목별 값과 외부 호스트별 요청 수, 가장 큰 슬라이드 번호"""
+    from create_pdf_html import iter_slide_spans
+
+    html = path.read_text(encoding='utf-8')
+    scanner = PageScanner()
+    scanner.feed(html)
+    scanner.close()
+
+    total_bytes = len(html.encode('utf-8'))
+    image_bytes = 0
+    hosts = {}
+    for url, kind in scanner.resources.items():
+        if is_external(url):
+            host = urlsplit(url if not url.startswith('//') else 'https:' + url).hostname
+            hosts[host] = hosts.get(host, 0) + 1
+            continue
+        local_path = path.parent / re.split(r'[?#]', url, maxsplit=1)[0]
+        if not local_path.is_file():
+            continue
+        size = local_path.stat().st_size
+        total_bytes += size
+        if kind == 'image':
+            image_bytes += size
+
+    largest_slide = (0, 0)  # (바이트, 슬라이드 번호)
+    for number, (start_pos, end_pos, _) in enumerate(iter_slide_spans(html), 1):
+        size = len(html[start_pos:end_pos].encode('utf-8'))
+        largest_slide = max(largest_slide, (size, -number))
+
+    metrics = {
+        'total_bytes': total_bytes,
+        'image_bytes': image_bytes,
+        'external_requests': sum(hosts.values()),
+        'dom_nodes': scanner.dom_nodes,
+        'largest_slide_bytes': largest_slide[0],
+    }
+    return metrics, hosts, -largest_slide[1]
+
+def load_budgets(budget_path):
+    """{'*': {...}, '<페이지 이름>': {...}} 형식의 예산 파일을 읽음 (페이지 항목이 '*' 보다 우선)"""
+    if budget_path is None or not budget_path.is_file():
+        return {'*': dict(DEFAULT_BUDGETS)}
+    with open(budget_path, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+    budgets['*'] = {**DEFAULT_BUDGETS, **budgets.get('*', {})}
+    return budgets
+
+def budget_for(budgets, page_name):
+    return {**budgets['*'], **budgets.get(page_name, {})}
+
+def format_value(metric, value):
+    return f'{value / 1024:.1f} KB' if metric.endswith('_bytes') else str(value)
+
+def check_pages(pages, budget_path):
+    """pages 의 각 페이지를 재고 예산을 넘은 항목 수를 돌려줌"""
+    budgets = load_budgets(budget_path)
+    over_count = 0
+    for path in pages:
+        if not path.is_file():
+            print(f"  ⚠️  {path.name}: 파일이 없습니다")
+            continue
+        metrics, hosts, largest_number = measure_page(path)
+        budget = budget_for(budgets, path.name)
+        print(f"\n{path.name}")
+        for metric in METRICS:
+            value, limit = metrics[metric], budget.get(metric, 0)
+            over = 0 < limit < value
+            over_count += over
+            mark = '❌' if over else '  '
+            extra = f'  (슬라이드 {largest_number})' if metric == 'largest_slide_bytes' and value else ''
+            limit_text = format_value(metric, limit) if limit > 0 else '-'
+            print(f"  {mark} {metric:<20} {format_value(metric, value):>10} / {limit_text:>10}{extra}")
+        if hosts:
+            print('     외부: ' + ', '.join(f'{host} {count}' for host, count in sorted(hosts.items())))
+    return over_count
+
+def report(over_count):
+    if over_count:
+        print(f"\n❌ 예산을 넘은 항목 {over_count}개")
+    else:
+        print("\n✅ 모든 페이지가 예산 안에 있습니다")
+
+def main():
+    from create_pdf_html import BASE_DIR, BUILD_DIR_NAME, LECTURE_FILES
+
+    parser = argparse.ArgumentParser(description='강의 페이지별 크기/요청 수/요소 수를 재서 예산과 비교 (넘으면 종료 코드 1)')
+    parser.add_argument('--budgets', type=Path, default=BASE_DIR / BUDGET_FILE_NAME, metavar='PATH',
+                        help=f'예산 파일 (기본: {BUDGET_FILE_NAME})')
+    parser.add_argument('--dist', action='store_true',
+                        help=f'저장소의 강의 파일 대신 {BUILD_DIR_NAME}/ 의 강의별 페이지를 잼')
+    args = parser.parse_args()
+
+    deck_dir = BASE_DIR / BUILD_DIR_NAME if args.dist else BASE_DIR
+    pages = [deck_dir / filename for filename in LECTURE_FILES] + [BASE_DIR / 'LectureForPdf.html']
+    over_count = check_pages(pages, args.budgets)
+    report(over_count)
+    if over_count:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
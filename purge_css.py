@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+
+# 안쪽에 다시 규칙 목록을 가지는 at-rule (나머지 @page, @font-face, @keyframes 등은 통째로 유지)
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+
+# 선택자에서 사용 여부를 판단할 때 무시하는 부분: 가상 클래스/요소, 속성 선택자
+PSEUDO_RE = re.compile(r'::?[\w-]+(?:\([^)]*\))?')
+ATTRIBUTE_RE = re.compile(r'\[[^\]]*\]')
+SELECTOR_CLASS_RE = re.compile(r'\.([\w-]+)')
+SELECTOR_ID_RE = re.compile(r'#([\w-]+)')
+SELECTOR_TAG_RE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)')
+
+# html 에서 쓰인 태그/클래스/id 수집
+HTML_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+HTML_CLASS_RE = re.compile(r'''\bclass\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+HTML_ID_RE = re.compile(r'''\bid\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+SCRIPT_RE = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+SCRIPT_WORD_RE = re.compile(r'[\w-]+')
+
+STYLE_BLOCK_RE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.DOTALL | re.IGNORECASE)
+LOCAL_STYLESHEET_RE = re.compile(
+    r'''<link\b[^>]*\bhref\s*=\s*["'](?:\./)?(?P<href>[^"':?#]+\.css)["'][^>]*>''',
+    re.IGNORECASE
+)
+
+class UsedSelectors:
+    """html 에 실제로 쓰인 태그, 클래스, id 모음"""
+
+    def __init__(self):
+        self.tags = {'html', 'body'}
+        self.classes = set()
+        self.ids = set()
+
+    def collect(self, html):
+        """html 을 훑어 쓰인 이름을 모으고 html 은 그대로 돌려줌"""
+        self.tags.update(tag.lower() for tag in HTML_TAG_RE.findall(html))
+        for value in HTML_CLASS_RE.findall(html):
+            self.classes.update(value.split())
+        for value in HTML_ID_RE.findall(html):
+            self.ids.update(value.split())
+
+        # 스크립트가 나중에 붙이는 클래스 (classList.add('active') 등) 도 쓰인 것으로 봄
+        for script in SCRIPT_RE.findall(html):
+            for literal in CSS_STRING_RE.findall(script):
+                words = SCRIPT_WORD_RE.findall(literal)
+                self.classes.update(words)
+                self.ids.update(words)
+        return html
+
+    def matches(self, selector):
+        """선택자에 나오는 태그/클래스/id 가 모두 쓰였으면 True (구조까지는 보지 않는 보수적인 판단)"""
+        simple = ATTRIBUTE_RE.sub('', PSEUDO_RE.sub('', selector))
+        if any(name not in self.classes for name in SELECTOR_CLASS_RE.findall(simple)):
+            return False
+        if any(name not in self.ids for name in SELECTOR_ID_RE.findall(simple)):
+            return False
+        simple = SELECTOR_CLASS_RE.sub('', SELECTOR_ID_RE.sub('', simple))
+        return all(tag.lower() in self.tags for tag in SELECTOR_TAG_RE.findall(simple))
+
+def find_block_end(css, pos):
+    """pos 의 '{' 와 짝이 되는 '}' 위치 (문자열 안의 괄호는 무시)"""
+    depth = 0
+    while pos < len(css):
+        char = css[pos]
+        if char in '"\'':
+            pos = CSS_STRING_RE.match(css, pos).end()
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return pos
+        pos += 1
+    return len(css)
+
+@lru_cache(maxsize=64)
+def parse_css(css):
+    """CSS 를 ('rule', 선택자, 선언) / ('group', at-rule, [자식]) / ('at', at-rule, 본문 또는 None) 목록으로 파싱
+
+    여러 강의를 함께 빌드할 때 공용 스타일시트는 한 번만 파싱함 (돌려준 목록은 고치지 말 것)
+    """
+    rules, _ = parse_rules(CSS_COMMENT_RE.sub('', css), 0)
+    return rules
+
+def parse_rules(css, pos):
+    rules = []
+    while True:
+        while pos < len(css) and css[pos].isspace():
+            pos += 1
+        if pos >= len(css):
+            return rules, pos
+        if css[pos] == '}':
+            return rules, pos + 1
+
+        start = pos
+        while pos < len(css) and css[pos] not in '{;}':
+            if css[pos] in '"\'':
+                pos = CSS_STRING_RE.match(css, pos).end()
+            else:
+                pos += 1
+        prelude = css[start:pos].strip()
+
+        if pos >= len(css) or css[pos] != '{':
+            # @import 처럼 본문이 없는 at-rule
+            if prelude:
+                rules.append(('at', prelude, None))
+            if pos < len(css) and css[pos] == ';':
+                pos += 1
+            continue
+
+        if prelude.lower().startswith(GROUP_AT_RULES):
+            children, pos = parse_rules(css, pos + 1)
+            rules.append(('group', prelude, children))
+        else:
+            end = find_block_end(css, pos)
+            kind = 'at' if prelude.startswith('@') else 'rule'
+            rules.append((kind, prelude, css[pos + 1:end]))
+            pos = end + 1
+
+def purge_rules(rules, used):
+    """쓰이지 않는 선택자를 지우고, 남은 선택자가 없는 규칙과 빈 그룹은 버림"""
+    kept = []
+    for kind, prelude, body in rules:
+        if kind == 'rule':
+            selectors = [sel.strip() for sel in prelude.split(',') if used.matches(sel)]
+            if selectors:
+                kept.append((kind, ', '.join(selectors), body))
+        elif kind == 'group':
+            children = purge_rules(body, used)
+            if children:
+                kept.append((kind, prelude, children))
+        else:
+            kept.append((kind, prelude, body))
+    return kept
+
+def minify_text(text):
+    """문자열은 그대로 두고 공백만 줄임"""
+    parts = CSS_STRING_RE.split(text)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r'\s+', ' ', parts[i])
+        parts[i] = re.sub(r'\s*([{};,>]|!important)\s*', r'\1', part)
+    return ''.join(parts).strip()
+
+def minify_declarations(body):
+    parts = CSS_STRING_RE.split(body)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s*:\s*', ':', re.sub(r'\s+', ' ', parts[i]))
+    return minify_text(''.join(parts)).rstrip(';')
+
+def serialize(rules):
+    """파싱한 규칙 목록을 최소화한 CSS 문자열로"""
+    out = []
+    for kind, prelude, body in rules:
+        if kind == 'rule':
+            out.append(f'{minify_text(prelude)}{{{minify_declarations(body)}}}')
+        elif kind == 'group':
+            out.append(f'{minify_text(prelude)}{{{serialize(body)}}}')
+        elif body is None:
+            out.append(f'{minify_text(prelude)};')
+        elif '{' in body:
+            out.append(f'{minify_text(prelude)}{{{minify_text(body)}}}')  # @keyframes 등
+        else:
+            out.append(f'{minify_text(prelude)}{{{minify_declarations(body)}}}')
+    return ''.join(out)
+
+def purge_stylesheet(css, used):
+    """used 에 쓰인 것과 맞는 규칙만 남겨 최소화한 CSS"""
+    return serialize(purge_rules(parse_css(css), used))
+
+def purge_page_styles(html, base_dir):
+    """페이지의 <style> 과 로컬 스타일시트 링크를, 그 페이지에 쓰인 규칙만 남긴 <style> 로 바꿈"""
+    used = UsedSelectors()
+    used.collect(html)
+
+    def replace_style(match):
+        return f'{match.group(1)}{purge_stylesheet(match.group(2), used)}{match.group(3)}'
+
+    def replace_link(match):
+        if 'stylesheet' not in match.group(0):
+            return match.group(0)
+        css_path = base_dir / match.group('href')
+        if not css_path.is_file():
+            return match.group(0)
+        return f'<style>{purge_stylesheet(css_path.read_text(encoding="utf-8"), used)}</style>'
+
+    html = STYLE_BLOCK_RE.sub(replace_style, html)
+    return LOCAL_STYLESHEET_RE.sub(replace_link, html)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+
+# 색인 폴더 (base_dir/search, index.html 이 여기서 읽음)
+SEARCH_DIR_NAME = 'search'
+SEARCH_MANIFEST_NAME = 'index.json'
+
+# 색인 형식이 바뀌면 올림 (index.html 의 검색 스크립트도 같이 확인)
+INDEX_VERSION = 1
+
+# 단어의 첫 글자 코드포인트 % SHARD_COUNT 로 샤드를 나눔
+# 같은 첫 글자로 시작하는 단어는 같은 샤드에 있으므로 접두어 검색도 샤드 하나로 끝난다
+SHARD_COUNT = 32
+
+# 영문/숫자 식별자와 한글 덩어리 (index.html 의 TERM_RE 와 같아야 함)
+TERM_RE = re.compile(r'[0-9A-Za-z_]+|[가-힣]+')
+
+TITLE_LENGTH = 60
+
+def iter_terms(text):
+    """검색 단어 목록
+
+    - 한글: 띄어쓰기/조사와 상관없이 찾을 수 있도록 두 글자씩(bigram) 자름 (한 글자 덩어리는 그대로)
+    - 영문/숫자: 소문자 단어 하나, 밑줄로 이은 식별자(get_vector)는 조각(get, vector)도 함께
+    """
+    for match in TERM_RE.finditer(text):
+        word = match.group(0)
+        if '가' <= word[0] <= '힣':
+            if len(word) == 1:
+                yield word
+            for i in range(len(word) - 1):
+                yield word[i:i + 2]
+        else:
+            word = word.lower()
+            yield word
+            if '_' in word:
+                yield from (part for part in word.split('_') if part)
+
+def shard_of(term):
+    return ord(term[0]) % SHARD_COUNT
+
+class SearchIndexer:
+    """모든 강의의 슬라이드 본문과 코드로 역색인을 만들어 샤드 파일로 쓰는 객체
+
+    index.html 의 검색창은 manifest(index.json) 를 읽은 뒤, 검색어 단어가 속한 샤드만 받아 온다.
+    """
+
+    def __init__(self):
+        self.decks = []
+        self.slides = []  # [덱 번호, 덱 안의 슬라이드 번호(1부터), 제목]
+        self.postings = {}  # 단어 -> 슬라이드 id 목록 (오름차순)
+
+    def add_deck(self, filename, slides):
+        """slides: Slide 목록 (본문 텍스트와 제목은 추출할 때 만들어 둔 것을 씀)"""
+        deck_index = len(self.decks)
+        self.decks.append(filename)
+        for number, slide in enumerate(slides, 1):
+            slide_id = len(self.slides)
+            self.slides.append([deck_index, number, (slide.title or slide.text)[:TITLE_LENGTH]])
+
+            for term in set(iter_terms(slide.text)):
+                self.postings.setdefault(term, []).append(slide_id)
+
+    def write(self, out_dir):
+        """샤드 파일과 manifest 를 out_dir 에 쓰고 (샤드 수, 전체 바이트) 를 돌려줌"""
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        shards = {}
+        for term in sorted(self.postings):
+            # 슬라이드 id 는 앞 id 와의 차이로 저장해서 크기를 줄임
+            ids = self.postings[term]
+            shards.setdefault(shard_of(term), {})[term] = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+
+        total = 0
+        written = set()
+        for shard, terms in shards.items():
+            path = out_dir / f'shard-{shard:02d}.json'
+            data = json.dumps(terms, ensure_ascii=False, separators=(',', ':'))
+            path.write_text(data, encoding='utf-8')
+            written.add(path.name)
+            total += len(data.encode('utf-8'))
+
+        # 이번에 비게 된 샤드의 이전 파일은 지움
+        for path in out_dir.glob('shard-*.json'):
+            if path.name not in written:
+                path.unlink()
+
+        manifest = json.dumps({
+            'version': INDEX_VERSION,
+            'shards': SHARD_COUNT,
+            'present': sorted(shards),
+            'decks': self.decks,
+            'slides': self.slides,
+        }, ensure_ascii=False, separators=(',', ':'))
+        (out_dir / SEARCH_MANIFEST_NAME).write_text(manifest, encoding='utf-8')
+        total += len(manifest.encode('utf-8'))
+        return len(shards), total
+
+def report(indexer, shard_count, total_bytes, out_dir):
+    print(f"  슬라이드 {len(indexer.slides)}개, 단어 {len(indexer.postings)}개, "
+          f"샤드 {shard_count}개 ({total_bytes // 1024} KB) → {out_dir}")
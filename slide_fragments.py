@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from fingerprint_assets import FINGERPRINTED_RE
+
+# 슬라이드 조각 폴더 (dist/fragments) 와 목록 파일, 조각을 보여 주는 페이지 (LectureForPdf.html 옆)
+FRAGMENT_DIR_NAME = 'fragments'
+FRAGMENT_MANIFEST_NAME = 'manifest.json'
+FRAGMENT_VIEWER_NAME = 'LectureSlides.html'
+
+# 조각 파일 형식이 바뀌면 올림 (파일 이름 해시에 들어가므로 모든 조각이 새로 만들어짐)
+FRAGMENT_VERSION = 1
+
+# 현재 슬라이드 다음으로 미리 받아 둘 조각 수
+PREFETCH_AHEAD = 2
+
+# 이름에 내용 해시가 들어 있는 조각 파일 - 내용이 바뀌면 이름도 바뀌므로 영구 캐시해도 됨
+FRAGMENT_NAME_RE = re.compile(r'^[0-9a-f]{16}\.html$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+VIEWER_BODY = '''<div id="slide-root"></div>
+<div style="position: fixed; bottom: 16px; left: 50%; transform: translateX(-50%); z-index: 200; color: #8b949e; font-family: 'JetBrains Mono', monospace;">
+    <button id="prev-btn" type="button">&larr;</button>
+    <span id="current-page">-</span> / <span id="total-pages">-</span>
+    <button id="next-btn" type="button">&rarr;</button>
+</div>
+
+<script>
+// 슬라이드 조각을 볼 때마다 하나씩 받아 오고, 다음 조각 {PREFETCH_AHEAD}개는 미리 받아 둠
+(function () {
+    const manifestUrl = new URL('{MANIFEST_HREF}', location.href);
+    const root = document.getElementById('slide-root');
+    const fragments = new Map();
+    let slides = [];
+    let current = 0;
+
+    function load(index) {
+        const url = new URL(slides[index].file, manifestUrl).href;
+        if (!fragments.has(url)) {
+            fragments.set(url, fetch(url).then((res) => res.text()));
+        }
+        return fragments.get(url);
+    }
+
+    async function show(index) {
+        index = Math.min(Math.max(index, 0), slides.length - 1);
+        current = index;
+        const html = await load(index);
+        if (index !== current) return;  // 받는 사이 다른 슬라이드로 이동함
+
+        root.innerHTML = html;
+        const pageNumber = document.createElement('div');
+        pageNumber.className = 'page-number';
+        pageNumber.textContent = slides[index].page;
+        root.firstElementChild.appendChild(pageNumber);
+
+        document.getElementById('current-page').textContent = index + 1;
+        document.getElementById('prev-btn').disabled = index === 0;
+        document.getElementById('next-btn').disabled = index === slides.length - 1;
+        history.replaceState(null, '', '#slide-' + (index + 1));
+
+        for (let ahead = 1; ahead <= {PREFETCH_AHEAD} && index + ahead < slides.length; ahead++) {
+            load(index + ahead);
+        }
+    }
+
+    document.getElementById('prev-btn').addEventListener('click', () => show(current - 1));
+    document.getElementById('next-btn').addEventListener('click', () => show(current + 1));
+    document.addEventListener('keydown', (event) => {
+        if (event.target.closest && event.target.closest('button')) return;
+        if (event.key === 'ArrowRight' || event.key === ' ' || event.key === 'Enter') {
+            show(current + 1);
+        } else if (event.key === 'ArrowLeft') {
+            show(current - 1);
+        }
+    });
+
+    // 목록은 빌드할 때마다 바뀌므로 항상 서버에 확인 (바뀌지 않았으면 304)
+    fetch(manifestUrl, { cache: 'no-cache' })
+        .then((res) => res.json())
+        .then((manifest) => {
+            slides = manifest.slides;
+            document.getElementById('total-pages').textContent = slides.length;
+            const match = /^#slide-(\\d+)$/.exec(location.hash);
+            show(match ? Number(match[1]) - 1 : 0);
+        });
+})();
+</script>
+
+</body>
+</html>
+'''
+
+class FragmentWriter:
+    """슬라이드마다 내용 해시를 이름으로 한 조각 파일을 쓰고, 순서/덱/페이지 목록을 manifest 로 남기는 객체
+
+    페이지 번호는 조각에 넣지 않고 목록에만 적으므로, 앞에 슬라이드가 추가되어도
+    내용이 바뀐 슬라이드의 조각만 새 파일이 된다.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.entries = []
+        self.written = 0
+        self.reused = 0
+
+    def add(self, deck, slide_number, page, slide_html):
+        data = slide_html.encode('utf-8')
+        digest = hashlib.sha256(data + f'\0{FRAGMENT_VERSION}'.encode()).hexdigest()[:16]
+        name = f'{digest}.html'
+        path = self.out_dir / name
+        if path.is_file():
+            self.reused += 1
+        else:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self.written += 1
+        self.entries.append({'file': name, 'deck': deck, 'slide': slide_number, 'page': page})
+        return name
+
+    def finish(self):
+        """manifest 를 쓰고 더 이상 쓰이지 않는 조각을 지운 뒤, 지운 조각 수를 돌려줌"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.out_dir / FRAGMENT_MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': FRAGMENT_VERSION, 'slides': self.entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, manifest_path)
+
+        used = {entry['file'] for entry in self.entries}
+        removed = 0
+        for path in self.out_dir.iterdir():
+            if FRAGMENT_NAME_RE.match(path.name) and path.name not in used:
+                path.unlink()
+                removed += 1
+        return removed
+
+def viewer_html(html_header, manifest_href):
+    """조각을 하나씩 받아 보여 주는 페이지 (스타일은 PDF 출력용 머리말을 그대로 씀)"""
+    header = html_header.replace('PDF 출력용', '슬라이드 보기')
+    body = VIEWER_BODY.replace('{MANIFEST_HREF}', manifest_href).replace('{PREFETCH_AHEAD}', str(PREFETCH_AHEAD))
+    return header + body
+
+def report(writer, removed, out_dir):
+    print(f"  슬라이드 조각 {len(writer.entries)}개 (새로 씀 {writer.written}개, 그대로 {writer.reused}개, "
+          f"지움 {removed}개) → {out_dir}")
+
+class FragmentHandler(SimpleHTTPRequestHandler):
+    """슬라이드 조각용 정적 파일 서버
+
+    - 조각 파일: 이름이 곧 내용 해시이므로 ETag 로 쓰고 Cache-Control: immutable
+    - 이름에 내용 해시가 들어 있는 자산(지문 붙인 파일, 이미지 변환본, 서브셋 폰트): 역시 immutable
+    - 그 밖의 파일(목록, 페이지, 이미지): 내용 해시 ETag 로 매번 재검증 (바뀌지 않았으면 304)
+    - 페이지와 조각 응답에는 다음에 볼 조각을 Link: rel=prefetch 로 알려 줌
+    """
+
+    fragment_dir = None
+    _manifest = (None, [])  # (manifest 수정 시각, 조각 이름 순서)
+
+    def do_GET(self):
+        self.send_file(head_only=False)
+
+    def do_HEAD(self):
+        self.send_file(head_only=True)
+
+    def send_file(self, head_only):
+        path = unquote(urlsplit(self.path).path)
+        file_path = Path(self.translate_path(path)).resolve()
+        if file_path.is_dir():
+            file_path = file_path / 'index.html'
+        if not file_path.is_file():
+            self.send_error(404)
+            return
+
+        data = file_path.read_bytes()
+        is_fragment = file_path.parent == self.fragment_dir and FRAGMENT_NAME_RE.match(file_path.name)
+        if is_fragment:
+            etag = f'"{file_path.stem}"'
+            cache_control = IMMUTABLE_CACHE
+        elif FINGERPRINTED_RE.search(file_path.name):
+            etag = f'"{FINGERPRINTED_RE.search(file_path.name).group(0).strip(".")}"'
+            cache_control = IMMUTABLE_CACHE
+        else:
+            etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+            cache_control = 'no-cache'
+
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/json':
+            content_type += '; charset=utf-8'
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        for url in self.prefetch_urls(file_path, is_fragment):
+            self.send_header('Link', f'<{url}>; rel=prefetch')
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(data)
+
+    def prefetch_urls(self, file_path, is_fragment):
+        order = self.fragment_order()
+        base = '/' + self.fragment_dir.relative_to(Path(self.directory).resolve()).as_posix() + '/'
+        if is_fragment:
+            # 같은 조각이 여러 번 나오면 첫 위치 기준
+            if file_path.name not in order:
+                return []
+            start = order.index(file_path.name) + 1
+        elif file_path.name == FRAGMENT_VIEWER_NAME:
+            start = 0
+        else:
+            return []
+        return [base + name for name in order[start:start + PREFETCH_AHEAD]]
+
+    def fragment_order(self):
+        """manifest 가 바뀌었을 때만 다시 읽어서 조각 순서를 돌려줌"""
+        manifest_path = self.fragment_dir / FRAGMENT_MANIFEST_NAME
+        try:
+            mtime = manifest_path.stat().st_mtime_ns
+        except OSError:
+            return []
+        if FragmentHandler._manifest[0] != mtime:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                names = [entry['file'] for entry in json.load(f)['slides']]
+            FragmentHandler._manifest = (mtime, names)
+        return FragmentHandler._manifest[1]
+
+def serve(base_dir, fragment_dir, port=8000):
+    """base_dir 를 조각 캐시 규칙으로 내보내는 로컬 서버 (Ctrl+C 로 종료)"""
+    FragmentHandler.fragment_dir = fragment_dir.resolve()
+    handler = partial(FragmentHandler, directory=str(base_dir))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    print(f"\n🌐 http://127.0.0.1:{port}/{FRAGMENT_VIEWER_NAME} - 종료: Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버를 종료합니다.")
+    finally:
+        server.server_close()
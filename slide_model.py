@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import html
+import marshal
+import re
+import sys
+
+from fingerprint_assets import REF_ATTR_RE, is_local_ref
+from highlight_code import CODE_BLOCK_RE
+
+# Slide 의 필드나 저장 형식이 바뀌면 올림 (create_pdf_html 의 슬라이드 캐시도 같이 무효화됨)
+SLIDE_FORMAT_VERSION = 3
+
+# 원본 강의에 적혀 있는 페이지 번호 (번호는 빌드할 때 전체 순서대로 다시 매김)
+PAGE_NUMBER_RE = re.compile(r'<div class="page-number">\d+</div>')
+
+# 요소 목록용 토큰: 주석은 건너뛰고, script/style 은 태그만 요소로 세고 본문은 건너뜀
+# (따옴표 안의 '>' 는 태그 끝으로 보지 않음 - 인라인 스타일 옮기기와 같은 태그를 봐야 하므로)
+NODE_TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(?P<tag>(?!(?:script|style)\b)[a-zA-Z][\w-]*)(?P<attrs>(?:"[^"]*"|\'[^\']*\'|[^"\'>])*)>'
+    r'|<(?P<raw>script|style)\b(?P<raw_attrs>[^>]*)>.*?</(?P=raw)\s*>',
+    re.DOTALL | re.IGNORECASE
+)
+CLASS_ATTR_RE = re.compile(r'''(?<![\w-])class\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+ID_ATTR_RE = re.compile(r'''(?<![\w-])id\s*=\s*["']([^"']*)["']''', re.IGNORECASE)
+STYLE_ATTR_RE = re.compile(r'''(?<![\w-])style\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+
+# 본문 텍스트 (검색 색인용)
+SKIPPED_BLOCK_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+HEADING_RE = re.compile(r'<h[1-3]\b[^>]*>(.*?)</h[1-3]\s*>', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+def page_number_html(page_number):
+    return f'<div class="page-number">{page_number}</div>'
+
+def html_to_text(fragment):
+    """태그를 지운 본문 텍스트 (코드 블록 내용 포함)"""
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', fragment))).strip()
+
+class Node:
+    """슬라이드 안의 요소 하나 (태그/클래스/id 이름은 intern 된 문자열, style 은 인라인 스타일 값 또는 None)"""
+    __slots__ = ('tag', 'classes', 'id', 'style')
+
+    def __init__(self, tag, classes=(), id=None, style=None):
+        self.tag = tag
+        self.classes = classes
+        self.id = id
+        self.style = style
+
+    def __repr__(self):
+        return f'<Node {self.tag} {".".join(self.classes)}>'
+
+class StringTable:
+    """태그/클래스/id 이름 표 - 같은 이름은 intern 해서 한 객체만 씀"""
+    __slots__ = ('names',)
+
+    def __init__(self):
+        self.names = {}
+
+    def name(self, text):
+        try:
+            return self.names[text]
+        except KeyError:
+            name = self.names[text] = sys.intern(text)
+            return name
+
+def parse_nodes(slide_html, strings):
+    """슬라이드 HTML 의 요소 목록 (이름은 strings 로 intern)"""
+    name = strings.name
+    nodes = []
+    for tag, attrs, raw, raw_attrs in NODE_TOKEN_RE.findall(slide_html):
+        if not tag:
+            if not raw:
+                continue  # 주석
+            tag, attrs = raw, raw_attrs
+        classes = ()
+        id = style = None
+        if attrs:
+            lower = attrs.lower()
+            if 'class' in lower:
+                class_match = CLASS_ATTR_RE.search(attrs)
+                if class_match:
+                    classes = tuple(map(name, class_match.group(1).split()))
+            if 'id' in lower:
+                id_match = ID_ATTR_RE.search(attrs)
+                if id_match:
+                    id = name(id_match.group(1))
+            if 'style' in lower:
+                style_match = STYLE_ATTR_RE.search(attrs)
+                if style_match:
+                    style = style_match.group(1) if style_match.group(1) is not None else style_match.group(2)
+        nodes.append(Node(name(tag.lower()), classes, id, style))
+    return tuple(nodes)
+
+class Slide:
+    """추출한 슬라이드 하나
+
+    html 은 원본의 페이지 번호를 뺀 슬라이드 HTML 이고, 번호는 numbered() 로 number_at 위치에 넣는다.
+    text/title/code_blocks/assets/nodes 는 추출할 때 한 번만 만들어 캐시에 함께 저장하므로
+    뒤 단계는 HTML 을 다시 훑지 않고 이 필드를 보고 할 일을 정한다.
+    code_blocks 는 <pre><code> 블록마다 (시작, code 속성 시작, code 속성 끝, 내용 끝) 위치이고,
+    페이지 번호는 모든 블록 뒤에 들어가므로 numbered() 결과에서도 그대로 맞다.
+    """
+    __slots__ = ('deck', 'index', 'html', 'number_at', 'text', 'title', 'code_blocks', 'assets', 'nodes')
+
+    def __init__(self, deck, index, html, number_at, text, title, code_blocks, assets, nodes):
+        self.deck = deck
+        self.index = index
+        self.html = html
+        self.number_at = number_at
+        self.text = text
+        self.title = title
+        self.code_blocks = code_blocks
+        self.assets = assets
+        self.nodes = nodes
+
+    @classmethod
+    def parse(cls, deck, index, slide_html, strings=None):
+        """잘라낸 슬라이드 HTML 로 Slide 를 만듦 (strings: 같은 덱의 슬라이드끼리 나눠 쓰는 이름 표)"""
+        if strings is None:
+            strings = StringTable()
+        slide_html = PAGE_NUMBER_RE.sub('', slide_html)
+        # 마지막 </div> 바로 앞 (슬라이드 div 를 닫는 태그)
+        number_at = len(slide_html) - len('</div>') if slide_html.endswith('</div>') else -1
+
+        visible = SKIPPED_BLOCK_RE.sub('', slide_html)
+        heading = HEADING_RE.search(visible)
+        assets = []
+        for match in REF_ATTR_RE.finditer(slide_html):
+            for candidate in match.group('value').split(','):
+                url = candidate.strip().partition(' ')[0]
+                if is_local_ref(url) and url not in assets:
+                    assets.append(url)
+
+        return cls(
+            deck, index, slide_html, number_at,
+            html_to_text(visible),
+            html_to_text(heading.group(1)) if heading else '',
+            tuple((match.start(), match.start('attrs'), match.end('attrs'), match.end('body'))
+                  for match in CODE_BLOCK_RE.finditer(slide_html)),
+            tuple(assets),
+            parse_nodes(slide_html, strings),
+        )
+
+    def has_tag(self, tag):
+        """tag 요소가 있는지 (tag 는 소문자)"""
+        return any(node.tag == tag for node in self.nodes)
+
+    def has_inline_styles(self):
+        return any(node.style is not None for node in self.nodes)
+
+    def numbered(self, page_number):
+        """마지막 </div> 앞에 페이지 번호를 넣은 HTML"""
+        if self.number_at < 0:
+            return self.html
+        pos = self.number_at
+        return f'{self.html[:pos]}    {page_number_html(page_number)}\n{self.html[pos:]}'
+
+    def __repr__(self):
+        return f'<Slide {self.deck}#{self.index + 1} {self.title[:30]!r}>'
+
+def dump_slides(slides):
+    """Slide 목록을 바이트로 (marshal - 같은 파이썬 버전에서 읽는 캐시용)"""
+    records = [
+        (slide.html, slide.number_at, slide.text, slide.title, slide.code_blocks, slide.assets,
+         tuple((node.tag, node.classes, node.id, node.style) for node in slide.nodes))
+        for slide in slides
+    ]
+    return marshal.dumps((SLIDE_FORMAT_VERSION, slides[0].deck if slides else '', records))
+
+def load_slides(data):
+    """dump_slides() 결과를 Slide 목록으로 (형식 버전이 다르면 ValueError)"""
+    version, deck, records = marshal.loads(data)
+    if version != SLIDE_FORMAT_VERSION:
+        raise ValueError(f'슬라이드 형식 버전이 다릅니다: {version}')
+    deck = sys.intern(deck)
+    # 이름은 dump 할 때 intern 된 문자열이므로 marshal 이 intern 된 채로, 같은 이름은 한 객체로 풀어 줌
+    slides = []
+    for index, (*fields, nodes) in enumerate(records):
+        slides.append(Slide(deck, index, *fields, tuple([Node(*node) for node in nodes])))
+    return slides
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import html
+import io
+import re
+
+# 로컬에 받아 둔 원본 폰트 폴더 (base_dir/fonts) 와 결과 폴더 (dist/fonts)
+FONT_DIR_NAME = 'fonts'
+FONT_CSS_NAME = 'fonts.css'
+
+# 서브셋 방식이 바뀌면 올려서 기존 결과를 무효화
+SUBSETTER_VERSION = 1
+
+# (font-family, font-weight, 파일 이름(확장자 제외), 글리프 종류)
+# 'text' 는 슬라이드에 쓰인 글자, 'icon' 은 슬라이드에 쓰인 Font Awesome 아이콘만 남김
+FONT_FACES = [
+    ('Noto Sans KR', 400, 'NotoSansKR-Regular', 'text'),
+    ('Noto Sans KR', 500, 'NotoSansKR-Medium', 'text'),
+    ('Noto Sans KR', 700, 'NotoSansKR-Bold', 'text'),
+    ('JetBrains Mono', 400, 'JetBrainsMono-Regular', 'text'),
+    ('JetBrains Mono', 700, 'JetBrainsMono-Bold', 'text'),
+    ('Font Awesome 6 Free', 900, 'fa-solid-900', 'icon'),
+    ('Font Awesome 6 Free', 400, 'fa-regular-400', 'icon'),
+    ('Font Awesome 6 Brands', 400, 'fa-brands-400', 'icon'),
+]
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff2', '.woff')
+
+# 아이콘 이름 -> 코드포인트 대응표는 Font Awesome 배포본의 css/all.min.css 에서 읽음
+FA_CSS_NAMES = ('all.min.css', 'all.css')
+
+# 페이지 번호처럼 스크립트가 나중에 채우는 글자도 있으므로 ASCII 는 항상 포함
+ALWAYS_INCLUDED = set(range(0x20, 0x7F))
+
+# Google Fonts / cdnjs 링크
+FONT_LINK_RE = re.compile(
+    r'''[ \t]*<link\b[^>]*\bhref\s*=\s*["']https://(?:fonts\.googleapis\.com|fonts\.gstatic\.com|cdnjs\.cloudflare\.com/ajax/libs/font-awesome)[^"']*["'][^>]*>[ \t]*\n?''',
+    re.IGNORECASE
+)
+FA_CLASS_RE = re.compile(r'''\bclass\s*=\s*["']([^"']*\bfa-[^"']*)["']''', re.IGNORECASE)
+CSS_ESCAPE_RE = re.compile(r'''content\s*:\s*["']\\+([0-9a-fA-F]{4,6})["']''')
+FA_ICON_RULE_RE = re.compile(r'''([^{}]+)\{[^{}]*?(?:content|--fa)\s*:\s*["']\\([0-9a-fA-F]{4,6})["'][^{}]*\}''')
+FA_SELECTOR_RE = re.compile(r'^\.fa-([a-z0-9-]+)(?::+before)?$')
+
+# 아이콘 폰트를 쓰는 기본 클래스 (Font Awesome 6 규칙을 필요한 만큼만 옮겨 옴)
+FA_BASE_CSS = '''.fa-solid,.fa-regular,.fa-brands,.fas,.far,.fab{-webkit-font-smoothing:antialiased;display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}
+.fa-solid,.fas{font-family:"Font Awesome 6 Free";font-weight:900}
+.fa-regular,.far{font-family:"Font Awesome 6 Free";font-weight:400}
+.fa-brands,.fab{font-family:"Font Awesome 6 Brands";font-weight:400}
+'''
+
+def load_fonttools():
+    """fontTools 는 폰트 서브셋을 켤 때만 필요하므로 그때 불러옴"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        raise SystemExit("폰트 서브셋에는 fontTools 가 필요합니다: pip install fonttools brotli")
+    return subset
+
+def has_brotli():
+    """WOFF2 저장에는 brotli 가 필요함 - 없으면 WOFF 로 저장"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def rewrite_font_links(page_html, css_href):
+    """Google Fonts / Font Awesome CDN 링크를 로컬 서브셋 폰트 CSS 링크 하나로 바꿈"""
+    replaced = False
+
+    def replace(match):
+        nonlocal replaced
+        if replaced or 'stylesheet' not in match.group(0):
+            return ''  # preconnect 와 두 번째 이후 링크는 지움
+        replaced = True
+        indent = match.group(0)[:len(match.group(0)) - len(match.group(0).lstrip())]
+        return f'{indent}<link rel="stylesheet" href="{css_href}">\n'
+
+    return FONT_LINK_RE.sub(replace, page_html)
+
+def find_font_file(font_dir, name):
+    for ext in FONT_EXTENSIONS:
+        path = font_dir / f'{name}{ext}'
+        if path.is_file():
+            return path
+    return None
+
+def load_icon_codepoints(font_dir):
+    """Font Awesome CSS 에서 아이콘 이름 -> 코드포인트 대응표를 만듦"""
+    for name in FA_CSS_NAMES:
+        for css_path in (font_dir / name, font_dir / 'css' / name):
+            if css_path.is_file():
+                break
+        else:
+            continue
+
+        icons = {}
+        css = css_path.read_text(encoding='utf-8')
+        for match in FA_ICON_RULE_RE.finditer(css):
+            codepoint = int(match.group(2), 16)
+            for selector in match.group(1).split(','):
+                selector_match = FA_SELECTOR_RE.match(selector.strip())
+                if selector_match:
+                    icons[selector_match.group(1)] = codepoint
+        return icons
+    return {}
+
+class FontSubsetter:
+    """슬라이드에 실제로 쓰인 글자와 아이콘만 남긴 WOFF2 폰트와 @font-face CSS 를 만드는 객체
+
+    collect() 로 페이지/슬라이드 html 을 넘겨 글자를 모은 뒤, 마지막에 write() 로 한 번에 만든다.
+    shared_cache 를 주면 다른 강의에서 같은 글자 목록으로 만든 서브셋을 가져다 쓴다.
+    """
+
+    def __init__(self, font_dir, shared_cache=None):
+        self.subset = load_fonttools()
+        self.font_dir = font_dir
+        self.shared_cache = shared_cache
+        self.fonts = [(family, weight, name, kind, find_font_file(font_dir, name))
+                      for family, weight, name, kind in FONT_FACES]
+        if not any(path for *_, path in self.fonts):
+            raise SystemExit(f"폰트 파일이 없습니다: {font_dir} 에 "
+                             f"{', '.join(name for _, _, name, _ in FONT_FACES)} (.ttf/.otf/.woff2) 를 넣어 주세요.")
+
+        self.icon_codepoints = load_icon_codepoints(font_dir)
+        self.chars = set(ALWAYS_INCLUDED)
+        self.icons = set()
+        self.css_codepoints = set()
+        self.flavor = 'woff2' if has_brotli() else 'woff'
+
+    def collect(self, page_html):
+        """html 에 쓰인 글자와 아이콘 클래스를 모으고 html 은 그대로 돌려줌"""
+        self.chars.update(map(ord, html.unescape(page_html)))
+        for match in FA_CLASS_RE.finditer(page_html):
+            self.icons.update(cls[3:] for cls in match.group(1).split() if cls.startswith('fa-'))
+        for match in CSS_ESCAPE_RE.finditer(page_html):
+            self.css_codepoints.add(int(match.group(1), 16))
+        return page_html
+
+    def used_icons(self):
+        """아이콘 이름 -> 코드포인트 (Font Awesome 대응표에 있는 것만)"""
+        return {name: self.icon_codepoints[name] for name in sorted(self.icons) if name in self.icon_codepoints}
+
+    def write(self, out_dir):
+        """서브셋 폰트와 CSS 를 out_dir 에 쓰고 (CSS 경로, [(원본, 결과 파일, 원본 크기, 결과 크기)]) 를 돌려줌"""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        icons = self.used_icons()
+        icon_codepoints = set(icons.values()) | self.css_codepoints
+
+        faces = []
+        results = []
+        for family, weight, name, kind, path in self.fonts:
+            if path is None:
+                continue
+            unicodes = sorted(self.chars if kind == 'text' else icon_codepoints)
+            out_name = self.subset_font(path, name, unicodes, out_dir)
+            faces.append(f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+                         f'font-display:swap;src:url({out_name}) format("{self.flavor}")}}')
+            results.append((path.name, out_name, path.stat().st_size, (out_dir / out_name).stat().st_size))
+
+        css = '\n'.join(faces) + '\n' + FA_BASE_CSS
+        css += ''.join(f'.fa-{name}:before{{content:"\\{codepoint:x}"}}\n' for name, codepoint in icons.items())
+
+        css_path = out_dir / FONT_CSS_NAME
+        css_path.write_text(css, encoding='utf-8')
+        return css_path, results
+
+    def subset_font(self, path, name, unicodes, out_dir):
+        """원본 폰트 내용과 글자 목록이 같으면 이전 결과를 그대로 씀"""
+        key = hashlib.sha256(path.read_bytes())
+        key.update(f'{SUBSETTER_VERSION}:{self.flavor}:'.encode())
+        key.update(','.join(map(str, unicodes)).encode())
+        out_name = f'{name}.{key.hexdigest()[:12]}.{self.flavor}'
+        out_path = out_dir / out_name
+        if out_path.is_file():
+            return out_name
+        if self.shared_cache is None:
+            self.make_subset(path, unicodes, out_path)
+            return out_name
+
+        # 다른 강의가 같은 폰트/글자 목록으로 만들어 둔 서브셋은 그대로 가져옴
+        with self.shared_cache.lock(out_name):
+            if not self.shared_cache.fetch(out_name, out_path):
+                self.make_subset(path, unicodes, out_path)
+                self.shared_cache.store(out_path, out_name)
+        return out_name
+
+    def make_subset(self, path, unicodes, out_path):
+        options = self.subset.Options()
+        options.flavor = self.flavor
+        options.layout_features = ['*']
+        options.notdef_outline = True
+        font = self.subset.load_font(str(path), options)
+        subsetter = self.subset.Subsetter(options)
+        subsetter.populate(unicodes=unicodes)
+        subsetter.subset(font)
+
+        buffer = io.BytesIO()
+        self.subset.save_font(font, buffer, options)
+        out_path.write_bytes(buffer.getvalue())
+
+def report(css_path, results, subsetter):
+    print(f"  글자 {len(subsetter.chars)}개, 아이콘 {len(subsetter.used_icons())}개 → {css_path}")
+    for source, out_name, before, after in results:
+        print(f"  - {source}: {before // 1024} KB → {after // 1024} KB")
+    missing = [name for _, _, name, _, path in subsetter.fonts if path is None]
+    if missing:
+        print(f"  ⚠️  폰트 파일 없음 (시스템 폰트로 대체): {', '.join(missing)}")